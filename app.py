@@ -6,7 +6,7 @@ import streamlit as st
 import io
 import zipfile
 import pandas as pd
-from sqlalchemy import text, inspect
+from sqlalchemy import text
 import os
 import sys
 
@@ -14,7 +14,13 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
 # Importar desde la nueva estructura src/
-from src.database.conexion import get_engine
+from src.database.conexion import get_engine, get_pool_stats
+from src.database.fallback import breaker
+from src.database.query_builder import get_query_stats
+from src.database.schema import get_table_names
+from src.utils.chart_cache import get_chart_cache_stats
+from src.utils.figures import get_figure_stats
+from src.utils.prerender import get_prerender_status, start_prerender
 from dashboard_config import COLOMBO_LABEL, COMFENALCO_LABEL
 
 # Configuración de la página
@@ -25,6 +31,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Precalentar en segundo plano las cachés de todos los dashboards (una vez por proceso)
+start_prerender()
+
 
 # Estilos personalizados
 st.markdown("""
@@ -87,8 +96,7 @@ st.markdown(
 
 def export_all_tables_to_zip(engine):
     """Exporta todas las tablas de la base de datos a un ZIP con CSVs."""
-    inspector = inspect(engine)
-    tables = inspector.get_table_names()
+    tables = get_table_names(engine)
 
 
     mem_zip = io.BytesIO()
@@ -304,6 +312,45 @@ st.sidebar.markdown("""
     una educación inclusiva y de calidad.
 """)
 
+pool_stats = get_pool_stats()
+breaker_status = breaker.status()
+if pool_stats:
+    with st.sidebar.expander("🔌 Conexiones a la base de datos"):
+        st.caption(f"En uso: {pool_stats['checked_out']} / {pool_stats['pool_size']} (+{pool_stats['overflow']} overflow)")
+        st.caption(f"En reposo: {pool_stats['checked_in']}")
+        st.caption(f"Esperas por conexión: {pool_stats['waits']} ({pool_stats['wait_seconds']:.2f} s)")
+        st.caption(f"Circuito: {breaker_status['state']} ({breaker_status['failures']} fallos seguidos)")
+if breaker_status['state'] != "cerrado":
+    # Con el circuito abierto las páginas muestran la última copia guardada de los datos
+    st.sidebar.warning(f"Base de datos no disponible (circuito {breaker_status['state']}): "
+                       f"se muestran los últimos datos guardados. Último error: {breaker_status['last_error']}")
+
+query_stats = get_query_stats()
+if query_stats:
+    with st.sidebar.expander("🧮 Consultas de los dashboards"):
+        st.caption(f"{len(query_stats)} consultas distintas, "
+                   f"{sum(entry['calls'] for entry in query_stats)} llamadas, "
+                   f"{sum(entry['seconds'] for entry in query_stats):.2f} s en total")
+        # Las más costosas primero
+        for entry in query_stats[:10]:
+            st.caption(f"{entry['query']} · {entry['calls']} llamadas, {entry['seconds']:.3f} s, "
+                       f"{entry['rows']} filas ({', '.join(entry['sources'])})")
+
+figure_stats = get_figure_stats()
+chart_stats = get_chart_cache_stats()
+with st.sidebar.expander("🖼️ Gráficos en memoria"):
+    st.caption(f"Figuras abiertas: {figure_stats['live']} (~{figure_stats['bytes'] / 1024 / 1024:.1f} MB)")
+    st.caption(f"Figuras creadas / cerradas: {figure_stats['created']} / {figure_stats['closed']}")
+    st.caption(f"Figuras en pyplot: {figure_stats['pyplot_open']}")
+    st.caption(f"Caché de gráficos: {chart_stats['entries']} ({chart_stats['bytes'] / 1024 / 1024:.1f} MB), "
+               f"{chart_stats['hits']} aciertos / {chart_stats['misses']} fallos")
+    prerender_status = get_prerender_status()
+    if prerender_status['running']:
+        st.caption("Precalentamiento de los dashboards en curso…")
+    elif prerender_status['finished_at']:
+        st.caption(f"Precalentados: {prerender_status['views']} vistas de {prerender_status['pages']} páginas "
+                   f"({prerender_status['seconds']} s, {prerender_status['finished_at']})")
+
 def add_interest_links():
     st.markdown("---")
     st.markdown("### 🔗 Oportunidades laborales")
@@ -2,6 +2,8 @@
 # Este archivo define las constantes y funciones utilizadas en toda la aplicación
 import streamlit as st
 
+from src.utils.prerender import start_prerender
+
 COMFENALCO_LABEL = "Comfenalco Antioquia"
 COLOMBO_LABEL = "Centro Colombo Americano Medellín"
 
@@ -78,6 +80,9 @@ def update_filter_by_page(current_page_file):
     pass
 
 def create_nav_buttons(selected_pop):
+    # Las páginas pueden abrirse sin pasar por app.py: también arrancan el precalentamiento
+    start_prerender()
+
     # Inicializar estados de sesión si no existen
     if 'comfenalco_subcategory' not in st.session_state:
         st.session_state.comfenalco_subcategory = "Años 2016 al 2019"
@@ -1,83 +1,237 @@
 """
-Script principal para ejecutar todos los scripts de importación de datos en un orden específico.
+Script principal para ejecutar todos los scripts de importación de datos.
 Este script actúa como un orquestador para poblar o actualizar la base de datos completa.
+
+Los importadores se descubren solos: cada data/imports/insertar_*.py declara la
+tabla que carga (TABLA), las tablas que deben cargarse antes (DEPENDE_DE) y una
+función importar(engine). Todos se ejecutan en este mismo proceso con el motor
+compartido: las tablas independientes se cargan a la vez en IMPORT_WORKERS hilos
+(por defecto 4, nunca más que DB_POOL_SIZE) y cada tabla espera a las de su
+DEPENDE_DE. La salida de cada importador se muestra completa al terminar, y al
+final un resumen con el tiempo y las filas de cada tabla.
+
+Hoy cada CSV se carga por sí solo, sin leer otras tablas, así que todos los
+importadores declaran DEPENDE_DE = () y se cargan en paralelo. Un importador
+que derive sus filas de otra tabla debe declararla en DEPENDE_DE: se cargará
+después de ella, se omitirá si esa carga falla y se recargará cuando cambie.
+
+Solo se recargan las tablas cuyo CSV cambió desde la última carga anotada en
+registro_importaciones (ver src/database/import_ledger.py) y las que dependen
+de ellas; --todas recarga todo.
+
+Uso:
+    python data/imports/ejecutar_todas_las_importaciones.py
+    python data/imports/ejecutar_todas_las_importaciones.py Docentes Escuela_nueva
+    python data/imports/ejecutar_todas_las_importaciones.py --todas
 """
 
+import argparse
+import glob
+import importlib
+import io
 import os
 import sys
-import subprocess
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.database.conexion import POOL_DEFAULTS, dispose_engine, get_engine, get_setting
+from src.database.import_ledger import reload_reason
+from src.config.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_WORKERS = 4
+IMPORTER_PATTERN = "insertar_*.py"
+ESTADOS = ("ok", "sin cambios", "error", "omitida")
+# Ancho de la columna Estado del resumen: el estado más largo y un espacio
+ANCHO_ESTADO = max(len(estado) for estado in ESTADOS) + 1
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout que guarda lo que imprime cada importador en su propio búfer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def descubrir_importadores():
+    """Devuelve {tabla: módulo} con los importadores de data/imports."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    importadores = {}
+    for path in sorted(glob.glob(os.path.join(script_dir, IMPORTER_PATTERN))):
+        nombre = os.path.splitext(os.path.basename(path))[0]
+        modulo = importlib.import_module(f"data.imports.{nombre}")
+        if not hasattr(modulo, "importar") or not hasattr(modulo, "TABLA"):
+            logger.warning(f"'{nombre}' no declara TABLA e importar(); se omite")
+            continue
+        if modulo.TABLA in importadores:
+            raise ValueError(f"Dos importadores cargan la tabla {modulo.TABLA}: "
+                             f"{importadores[modulo.TABLA].__name__} y {modulo.__name__}")
+        importadores[modulo.TABLA] = modulo
+    return importadores
+
+
+def _orden_valido(importadores):
+    """Lanza ValueError si las dependencias de los importadores forman un ciclo."""
+    pendientes = {tabla: set(modulo.DEPENDE_DE) & set(importadores) for tabla, modulo in importadores.items()}
+    while pendientes:
+        listas = [tabla for tabla, deps in pendientes.items() if not deps & set(pendientes)]
+        if not listas:
+            raise ValueError(f"Dependencias circulares entre: {', '.join(sorted(pendientes))}")
+        for tabla in listas:
+            del pendientes[tabla]
+
 
-def ejecutar_importaciones():
+def _motivos_de_recarga(importadores, engine, forzar):
     """
-    Encuentra y ejecuta todos los scripts de importación en el directorio actual.
+    {tabla: motivo} de las tablas que hay que recargar: las de CSV nuevo o
+    modificado y, en cascada, las que dependen de alguna de ellas.
     """
-    # El directorio donde se encuentra este script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Definir el orden de ejecución de los scripts.
-    # Esto es útil si hay dependencias, y asegura un proceso predecible.
-    scripts_a_ejecutar = [
-      
-        "insertar_datos_docentes.py",
-        "insertar_datos_estudiantes_2016_2019.py",
-        "insertar_datos_escuela_nueva.py",
-        "insertar_datos_colombo.py",
-        "insertar_datos_2021_2025.py",
-        "insertar_grados_2021_2025.py",
-        "insertar_instituciones_2021_2025.py",
-        "insertar_datos_intensificacion.py",
-        "insertar_intensificacion_grados.py",
-        "insertar_intensificacion_frances.py",
-        "insertar_intensificacion_frances_grados.py",
-        "insertar_intensificacion_horas_frances.py",
-    ]
+    if forzar:
+        return {tabla: "--todas" for tabla in importadores}
+    motivos = {}
+    for tabla, modulo in importadores.items():
+        motivo = reload_reason(engine, tabla, modulo.ruta_archivo)
+        if motivo:
+            motivos[tabla] = motivo
+    cambio = True
+    while cambio:
+        cambio = False
+        for tabla, modulo in importadores.items():
+            recargadas = [dep for dep in modulo.DEPENDE_DE if dep in motivos]
+            if tabla not in motivos and recargadas:
+                motivos[tabla] = f"depende de {', '.join(recargadas)}"
+                cambio = True
+    return motivos
+
+
+def _num_workers():
+    workers = int(get_setting("IMPORT_WORKERS", DEFAULT_WORKERS))
+    pool_size = int(get_setting("DB_POOL_SIZE", POOL_DEFAULTS["DB_POOL_SIZE"]))
+    return max(min(workers, pool_size), 1)
+
+
+def _ejecutar(modulo, engine):
+    """Ejecuta un importador capturando su salida. Devuelve el resultado de la tabla."""
+    buffer = io.StringIO()
+    sys.stdout.local.buffer = buffer
+    start = time.perf_counter()
+    try:
+        resultado = {"estado": "ok", **modulo.importar(engine)}
+    except Exception as e:
+        resultado = {"estado": "error", "table": modulo.TABLA, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        sys.stdout.local.buffer = None
+    resultado["seconds"] = time.perf_counter() - start
+    resultado["salida"] = buffer.getvalue()
+    return resultado
+
+
+def ejecutar_importaciones(tablas=None, forzar=False):
+    """
+    Ejecuta los importadores de `tablas` (por defecto, todos) respetando sus
+    dependencias; con forzar=False omite las tablas cuyo CSV no cambió.
+    Devuelve la lista de resultados por tabla.
+    """
+    importadores = descubrir_importadores()
+    if tablas:
+        desconocidas = set(tablas) - set(importadores)
+        if desconocidas:
+            raise ValueError(f"No hay importador para: {', '.join(sorted(desconocidas))}")
+        importadores = {tabla: importadores[tabla] for tabla in tablas}
+    _orden_valido(importadores)
+
+    workers = _num_workers()
+    engine = get_engine()
+    start_time = time.time()
+    motivos = _motivos_de_recarga(importadores, engine, forzar)
 
     print("="*80)
     print("🚀 INICIANDO PROCESO DE IMPORTACIÓN DE TODOS LOS DATOS")
+    print(f"   - Tablas a recargar: {len(motivos)} de {len(importadores)} · Hilos: {workers}")
+    for tabla in importadores:
+        print(f"   • {tabla}: {motivos.get(tabla, 'sin cambios, se omite')}")
     print("="*80)
-    
-    start_time = time.time()
-    scripts_exitosos = 0
-    scripts_fallidos = 0
-
-    for script_name in scripts_a_ejecutar:
-        script_path = os.path.join(script_dir, script_name)
-        
-        if not os.path.exists(script_path):
-            print(f"\n🟡 ADVERTENCIA: El script '{script_name}' no fue encontrado. Omitiendo.")
-            continue
 
-        print(f"\n▶️ Ejecutando script: {script_name}")
-        print("-" * (20 + len(script_name)))
-        
-        # Usamos sys.executable para asegurarnos de usar el mismo intérprete de Python
-        # que está ejecutando este script.
-        # El argumento '-m' es necesario para que las importaciones relativas dentro
-        # de los scripts hijos funcionen correctamente.
-        module_path = f"data.imports.{script_name.replace('.py', '')}"
-        result = subprocess.run([sys.executable, "-m", module_path], capture_output=True, text=True, encoding='utf-8')
-        
-        print(result.stdout) # Imprimir la salida estándar del script hijo
-        
-        if result.returncode == 0:
-            print(f"✅ Script '{script_name}' finalizado con éxito.")
-            scripts_exitosos += 1
-        else:
-            print(f"❌ ERROR: El script '{script_name}' falló.")
-            print("Salida de error:")
-            print(result.stderr) # Imprimir la salida de error
-            scripts_fallidos += 1
+    stdout = sys.stdout
+    sys.stdout = _ThreadOutput(stdout)
+    pendientes = {tabla: modulo for tabla, modulo in importadores.items() if tabla in motivos}
+    terminadas = {tabla: {"estado": "sin cambios", "table": tabla, "seconds": 0.0, "salida": ""}
+                  for tabla in importadores if tabla not in motivos}
+    en_curso = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="importacion") as pool:
+            while pendientes or en_curso:
+                for tabla, modulo in list(pendientes.items()):
+                    deps = [dep for dep in modulo.DEPENDE_DE if dep in importadores]
+                    fallidas = [dep for dep in deps if dep in terminadas and not _exitosa(terminadas[dep])]
+                    if fallidas:
+                        del pendientes[tabla]
+                        terminadas[tabla] = {"estado": "omitida", "table": tabla, "seconds": 0.0, "salida": "",
+                                             "error": f"falló {', '.join(fallidas)}"}
+                        print(f"\n⏭️ {tabla} omitida: falló {', '.join(fallidas)}")
+                    elif all(dep in terminadas for dep in deps):
+                        del pendientes[tabla]
+                        en_curso[pool.submit(_ejecutar, modulo, engine)] = tabla
+                if not en_curso:
+                    continue
+                listos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    tabla = en_curso.pop(futuro)
+                    resultado = futuro.result()
+                    terminadas[tabla] = resultado
+                    print(f"\n▶️ {importadores[tabla].__name__.rsplit('.', 1)[-1]} ({tabla})")
+                    print(resultado["salida"])
+                    if resultado["estado"] == "ok":
+                        print(f"✅ {tabla} cargada en {resultado['seconds']:.2f} s")
+                    else:
+                        print(f"❌ ERROR en {tabla}: {resultado['error']}")
+    finally:
+        sys.stdout = stdout
+        dispose_engine()
+
+    _imprimir_resumen(list(terminadas.values()), time.time() - start_time)
+    return list(terminadas.values())
 
-    end_time = time.time()
-    duracion_total = end_time - start_time
 
+def _exitosa(resultado):
+    return resultado["estado"] in ("ok", "sin cambios")
+
+
+def _imprimir_resumen(resultados, duracion_total):
+    exitosas = [r for r in resultados if _exitosa(r)]
     print("\n" + "="*80)
     print("🏁 PROCESO DE IMPORTACIÓN FINALIZADO")
-    print(f"   - Duración total: {duracion_total:.2f} segundos")
-    print(f"   - Scripts exitosos: {scripts_exitosos}")
-    print(f"   - Scripts fallidos: {scripts_fallidos}")
+    print(f"\n   {'Tabla':<34}{'Estado':<{ANCHO_ESTADO}}{'Filas':>9}{'Rechazadas':>12}{'Segundos':>10}{'Filas/s':>10}")
+    for r in sorted(resultados, key=lambda r: r["table"]):
+        if r["estado"] == "ok":
+            print(f"   {r['table']:<34}{r['estado']:<{ANCHO_ESTADO}}{r['rows']:>9,}{r['rejected']:>12,}"
+                  f"{r['seconds']:>10.2f}{r['load']['rows_per_second']:>10,.0f}")
+        else:
+            print(f"   {r['table']:<34}{r['estado']:<{ANCHO_ESTADO}}{'-':>9}{'-':>12}{r['seconds']:>10.2f}{'-':>10}")
+    print(f"\n   - Duración total: {duracion_total:.2f} segundos")
+    sin_cambios = sum(r["estado"] == "sin cambios" for r in resultados)
+    print(f"   - Tablas cargadas: {len(exitosas) - sin_cambios}")
+    print(f"   - Tablas sin cambios: {sin_cambios}")
+    print(f"   - Tablas fallidas u omitidas: {len(resultados) - len(exitosas)}")
     print("="*80)
 
+
 if __name__ == "__main__":
-    ejecutar_importaciones()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Carga en paralelo las tablas cuyo CSV cambió")
+    parser.add_argument("tablas", nargs="*", help="tablas a considerar (por defecto, todas)")
+    parser.add_argument("--todas", action="store_true", help="recarga aunque el CSV no haya cambiado")
+    args = parser.parse_args()
+    resultados = ejecutar_importaciones(args.tablas, forzar=args.todas)
+    sys.exit(0 if all(_exitosa(r) for r in resultados) else 1)
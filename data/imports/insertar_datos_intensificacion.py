@@ -13,227 +13,183 @@ from sqlalchemy import text
 # Se suben dos niveles desde 'data/imports' para llegar a la raíz.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from src.database.conexion import engine
+from src.database.conexion import get_engine
+from src.database.bulk_loader import format_load_stats, replace_table
+from src.database.csv_validator import to_records, validate_csv
 from src.config.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Tabla que carga este script y tablas que deben cargarse antes (ver ejecutar_todas_las_importaciones.py)
+TABLA = "Estudiantes_intensificacion"
+DEPENDE_DE = ()
+
 # Definir la ruta del archivo CSV de forma robusta desde la raíz del proyecto
 # El script está en 'data/imports', así que subimos dos niveles para llegar a 'Observatorio'
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 ruta_archivo = os.path.join(project_root, "data", "csv", "Tabla_intensificacion.csv")
 
-print("\n" + "="*70)
-print("INSERCIÓN DE DATOS - TABLA ESTUDIANTES_INTENSIFICACION")
-print("="*70)
-
-try:
-    # Leer el CSV
-    print(f"\n📂 Leyendo archivo: {ruta_archivo}")
-    df = pd.read_csv(ruta_archivo, sep=';', encoding='utf-8-sig')
-    
-    print(f"✓ Archivo cargado exitosamente")
-    print(f"   • Total de filas (antes de limpieza): {len(df)}")
-    print(f"   • Total de columnas: {len(df.columns)}")
-    print(f"   • Columnas: {list(df.columns)}")
-    
-    # Limpiar filas completamente vacías
-    df = df.dropna(how='all')
-    print(f"   • Total de filas (después de eliminar filas vacías): {len(df)}")
-    
-    # Validar que el CSV no tenga valores vacíos ni nulos
-    print(f"\n🔍 Validando datos...")
-    
-    # Verificar valores nulos
-    nulls_por_columna = df.isnull().sum()
-    if nulls_por_columna.sum() > 0:
-        print("  ⚠️ Advertencia: Se encontraron valores nulos:")
-        for col, count in nulls_por_columna[nulls_por_columna > 0].items():
-            print(f"     • {col}: {count} valores")
-    else:
-        print("  ✓ No hay valores nulos")
-    
-    # Verificar valores vacíos (ahora sin usar .astype(str).str que causaba error)
-    vacios_por_columna = df.isnull().sum()
-    if vacios_por_columna.sum() > 0:
-        print("  ⚠️ Advertencia: Se encontraron valores vacíos:")
-        for col, count in vacios_por_columna[vacios_por_columna > 0].items():
-            print(f"     • {col}: {count} valores")
-    else:
-        print("  ✓ No hay valores vacíos")
-    
-    # Mostrar sample de datos
-    print(f"\n📋 Primeras 5 filas del CSV:")
-    print(df.head().to_string())
-    
-    print(f"\n🔄 Preparando datos para inserción...")
-    
-    # Crear lista de registros para inserción
-    registros = []
-    errores = []
-    
-    for idx, row in df.iterrows():
-        try:
-            # Extraer y convertir valores según la estructura de la tabla
-            fecha = int(row['Año']) if pd.notna(row['Año']) else None
-            sede_nodal = str(row['Sede Nodal']).strip() if pd.notna(row['Sede Nodal']) else None
-            poblacion = str(row['Población']).strip() if pd.notna(row['Población']) else None
-            nivel = str(row['Nivel']).strip() if pd.notna(row['Nivel']) else None
-            dia = str(row['Día']).strip() if pd.notna(row['Día']) else None
-            jornada = str(row['Jornada']).strip() if pd.notna(row['Jornada']) else None
-            matriculados = int(row['Matriculados']) if pd.notna(row['Matriculados']) else None
-            etapa = int(row['Etapa']) if pd.notna(row['Etapa']) else None
-            
-            registros.append({
-                'FECHA': fecha,
-                'SEDE_NODAL': sede_nodal,
-                'POBLACION': poblacion,
-                'NIVEL': nivel,
-                'DIA': dia,
-                'JORNADA': jornada,
-                'MATRICULADOS': matriculados,
-                'ETAPA': etapa
-            })
-        
-        except Exception as e:
-            errores.append({
-                'fila': idx + 2,
-                'razon': str(e),
-                'valores': row.to_dict()
-            })
-            continue
-    
-    print(f"✓ Datos preparados")
-    print(f"   • Registros válidos: {len(registros)}")
-    print(f"   • Registros con error: {len(errores)}")
-    
-    if errores:
-        print(f"\n⚠️ Errores encontrados:")
-        for error in errores[:5]:
-            print(f"   Fila {error['fila']}: {error['razon']}")
-        if len(errores) > 5:
-            print(f"   ... y {len(errores) - 5} errores más")
-    
-    # Insertar en la base de datos
-    print(f"\n💾 Insertando {len(registros)} registros en la base de datos...")
-    
-    # --- INICIO: Eliminar datos existentes ---
-    with engine.connect() as connection:
-        transaction = connection.begin()
-        try:
-            print(f"   • Limpiando datos antiguos de la tabla 'Estudiantes_intensificacion'...")
-            connection.execute(text("DELETE FROM Estudiantes_intensificacion"))
-            transaction.commit()
-            print(f"   ✓ Datos antiguos eliminados.")
-        except Exception as e:
-            transaction.rollback()
-            raise e  # Re-lanzar la excepción para detener el script si la limpieza falla
-    # --- FIN: Eliminar datos existentes ---
-
-    with engine.connect() as connection:
-        inseridos = 0
-        
-        for reg in registros:
-            try:
-                # Insertar registro sin verificar duplicados
-                # Se permiten valores duplicados tal como vienen en el Excel
-                connection.execute(text(
-                    """INSERT INTO Estudiantes_intensificacion
-                       (FECHA, SEDE_NODAL, POBLACION, NIVEL, DIA, JORNADA, MATRICULADOS, ETAPA)
-                       VALUES (:fecha, :sede_nodal, :poblacion, :nivel, :dia, :jornada, :matriculados, :etapa)"""
-                ), {
-                    'fecha': reg['FECHA'],
-                    'sede_nodal': reg['SEDE_NODAL'],
-                    'poblacion': reg['POBLACION'],
-                    'nivel': reg['NIVEL'],
-                    'dia': reg['DIA'],
-                    'jornada': reg['JORNADA'],
-                    'matriculados': reg['MATRICULADOS'],
-                    'etapa': reg['ETAPA']
-                })
-                
-                inseridos += 1
-                
-                # Commit cada 100 registros
-                if inseridos % 100 == 0:
-                    connection.commit()
-                    print(f"   ✓ {inseridos} registros procesados...")
-            
-            except Exception as e:
-                print(f"   ✗ Error al insertar: {str(e)[:100]}")
-                connection.rollback()
-                logger.error(f"Error inserting record: {e}", exc_info=True)
-        
-        # Commit final
-        connection.commit()
+# Columnas del CSV -> columnas de la tabla (ver src/database/csv_validator.py)
+ESQUEMA = {
+    "Año": {"column": "FECHA", "type": "int", "required": False},
+    "Sede Nodal": {"column": "SEDE_NODAL", "required": False},
+    "Población": {"column": "POBLACION", "required": False},
+    "Nivel": {"column": "NIVEL", "required": False},
+    "Día": {"column": "DIA", "required": False},
+    "Jornada": {"column": "JORNADA", "required": False},
+    "Matriculados": {"column": "MATRICULADOS", "type": "int", "required": False},
+    "Etapa": {"column": "ETAPA", "type": "int", "required": False},
+}
+
+
+def importar(engine):
+    """
+    Carga Tabla_intensificacion.csv en Estudiantes_intensificacion con `engine`.
+
+    Devuelve un diccionario con table, rows (filas insertadas), rejected (filas
+    rechazadas por el esquema) y load (resumen de replace_table). Los errores se
+    muestran y se vuelven a lanzar.
+    """
+    print("\n" + "="*70)
+    print("INSERCIÓN DE DATOS - TABLA ESTUDIANTES_INTENSIFICACION")
+    print("="*70)
+
+    try:
+        # Leer el CSV
+        print(f"\n📂 Leyendo archivo: {ruta_archivo}")
+        df = pd.read_csv(ruta_archivo, sep=';', encoding='utf-8-sig')
+    
+        print(f"✓ Archivo cargado exitosamente")
+        print(f"   • Total de filas (antes de limpieza): {len(df)}")
+        print(f"   • Total de columnas: {len(df.columns)}")
+        print(f"   • Columnas: {list(df.columns)}")
+    
+        # Limpiar filas completamente vacías
+        df = df.dropna(how='all')
+        print(f"   • Total de filas (después de eliminar filas vacías): {len(df)}")
+
+        # Validar que el CSV no tenga valores vacíos ni nulos
+        print(f"\n🔍 Validando datos...")
+    
+        nulls_por_columna = df.isnull().sum()
+        if nulls_por_columna.sum() > 0:
+            print("  ⚠️ Advertencia: Se encontraron valores nulos:")
+            for col, count in nulls_por_columna[nulls_por_columna > 0].items():
+                print(f"     • {col}: {count} valores")
+        else:
+            print("  ✓ No hay valores nulos")
+    
+        # Mostrar sample de datos
+        print(f"\n📋 Primeras 5 filas del CSV:")
+        print(df.head().to_string())
+    
+        print(f"\n🔄 Preparando datos para inserción...")
+    
+        # Convertir las columnas según el esquema y separar las filas que no lo cumplen
+        validos, rechazados = validate_csv(df, ESQUEMA)
+        registros = to_records(validos)
+    
+        print(f"✓ Datos preparados")
+        print(f"   • Registros válidos: {len(registros)}")
+        print(f"   • Registros con error: {len(rechazados)}")
+    
+        if len(rechazados):
+            print(f"\n⚠️ Errores encontrados:")
+            for fila, razon in rechazados[['fila', 'razon']].head(5).itertuples(index=False):
+                print(f"   Fila {fila}: {razon}")
+            if len(rechazados) > 5:
+                print(f"   ... y {len(rechazados) - 5} errores más")
+    
+        # Insertar en la base de datos
+        print(f"\n💾 Insertando {len(registros)} registros en la base de datos...")
+    
+        # Se carga en una copia de staging y se publica con RENAME TABLE si cuadran filas y sumas;
+        # al publicar se recalculan los resúmenes, la versión de datos y el registro de importaciones
+        carga = replace_table(engine, TABLA, registros, ruta_archivo)
+        inseridos = carga["rows"]
+        for error in carga["errors"][:5]:
+            print(f"   ✗ Error al insertar: {error['razon'][:100]}")
         print(f"\n✓ Inserción completada en la base de datos")
-    
-    # Verificar resultados
-    print(f"\n📊 Estadísticas de inserción:")
-    print(f"   • Registros insertados: {inseridos}")
-    print(f"   • Registros con error: {len(errores)}")
-    
-    # Mostrar estadísticas de los datos insertados
-    with engine.connect() as connection:
-        # Total de registros
-        total_query = connection.execute(text("SELECT COUNT(*) FROM Estudiantes_intensificacion"))
-        total = total_query.scalar()
+        print(f"   • {format_load_stats(carga)}")
+    
+        # Verificar resultados
+        print(f"\n📊 Estadísticas de inserción:")
+        print(f"   • Registros insertados: {inseridos}")
+        print(f"   • Registros con error: {len(rechazados)}")
+    
+        # Mostrar estadísticas de los datos insertados
+        with engine.connect() as connection:
+            # Total de registros
+            total_query = connection.execute(text("SELECT COUNT(*) FROM Estudiantes_intensificacion"))
+            total = total_query.scalar()
         
-        # Distribución por año
-        print(f"\n📈 Distribución de datos en Estudiantes_intensificacion:")
-        print(f"   • Total de registros: {total}")
+            # Distribución por año
+            print(f"\n📈 Distribución de datos en Estudiantes_intensificacion:")
+            print(f"   • Total de registros: {total}")
         
-        # Verificar año
-        año_query = connection.execute(text(
-            "SELECT DISTINCT FECHA, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY FECHA"
-        ))
-        for row in año_query:
-            print(f"   • Año {row[0]}: {row[1]} registros")
+            # Verificar año
+            año_query = connection.execute(text(
+                "SELECT DISTINCT FECHA, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY FECHA"
+            ))
+            for row in año_query:
+                print(f"   • Año {row[0]}: {row[1]} registros")
         
-        # Distribución por población
-        pob_query = connection.execute(text(
-            "SELECT POBLACION, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY POBLACION ORDER BY cantidad DESC LIMIT 5"
-        ))
-        print(f"\n   Población (top 5):")
-        for i, row in enumerate(pob_query):
-            print(f"      • {row[0]}: {row[1]}")
+            # Distribución por población
+            pob_query = connection.execute(text(
+                "SELECT POBLACION, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY POBLACION ORDER BY cantidad DESC LIMIT 5"
+            ))
+            print(f"\n   Población (top 5):")
+            for i, row in enumerate(pob_query):
+                print(f"      • {row[0]}: {row[1]}")
         
-        # Distribución por nivel
-        nivel_query = connection.execute(text(
-            "SELECT NIVEL, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY NIVEL ORDER BY NIVEL"
-        ))
-        print(f"\n   Niveles:")
-        for row in nivel_query:
-            print(f"      • Nivel {row[0]}: {row[1]} registros")
+            # Distribución por nivel
+            nivel_query = connection.execute(text(
+                "SELECT NIVEL, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY NIVEL ORDER BY NIVEL"
+            ))
+            print(f"\n   Niveles:")
+            for row in nivel_query:
+                print(f"      • Nivel {row[0]}: {row[1]} registros")
         
-        # Distribución por jornada
-        jornada_query = connection.execute(text(
-            "SELECT JORNADA, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY JORNADA ORDER BY cantidad DESC"
-        ))
-        print(f"\n   Jornadas:")
-        for row in jornada_query:
-            print(f"      • {row[0]}: {row[1]}")
+            # Distribución por jornada
+            jornada_query = connection.execute(text(
+                "SELECT JORNADA, COUNT(*) as cantidad FROM Estudiantes_intensificacion GROUP BY JORNADA ORDER BY cantidad DESC"
+            ))
+            print(f"\n   Jornadas:")
+            for row in jornada_query:
+                print(f"      • {row[0]}: {row[1]}")
     
-    print("\n" + "="*70)
-    print("✅ PROCESO COMPLETADO EXITOSAMENTE")
-    print("="*70)
+        print("\n" + "="*70)
+        print("✅ PROCESO COMPLETADO EXITOSAMENTE")
+        print("="*70)
     
-    logger.info(f"Successfully inserted {inseridos} records into Estudiantes_intensificacion")
-
-except FileNotFoundError:
-    print(f"\n❌ Error: Archivo no encontrado")
-    print(f"   Ruta esperada: {ruta_archivo}")
-    logger.error(f"File not found: {ruta_archivo}", exc_info=True)
-    
-except pd.errors.EmptyDataError:
-    print(f"\n❌ Error: El archivo CSV está vacío")
-    logger.error("Empty CSV file", exc_info=True)
+        logger.info(f"Successfully inserted {inseridos} records into Estudiantes_intensificacion")
     
-except Exception as e:
-    print(f"\n❌ Error inesperado: {str(e)}")
-    print(f"   Tipo: {type(e).__name__}")
-    logger.error(f"Unexpected error: {e}", exc_info=True)
+        return {"table": TABLA, "rows": inseridos, "rejected": len(rechazados), "load": carga}
+
+    except FileNotFoundError:
+        print(f"\n❌ Error: Archivo no encontrado")
+        print(f"   Ruta esperada: {ruta_archivo}")
+        logger.error(f"File not found: {ruta_archivo}", exc_info=True)
+        raise
+    
+    except pd.errors.EmptyDataError:
+        print(f"\n❌ Error: El archivo CSV está vacío")
+        logger.error("Empty CSV file", exc_info=True)
+        raise
+    
+    except Exception as e:
+        print(f"\n❌ Error inesperado: {str(e)}")
+        print(f"   Tipo: {type(e).__name__}")
+        logger.error(f"Unexpected error: {e}", exc_info=True)
+        raise
+
 
-finally:
-    engine.dispose()
-    logger.info("Database connection closed")
+if __name__ == "__main__":
+    engine = get_engine()
+    try:
+        importar(engine)
+    except Exception:
+        sys.exit(1)
+    finally:
+        engine.dispose()
+        logger.info("Database connection closed")
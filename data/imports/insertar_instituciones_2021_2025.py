@@ -10,180 +10,153 @@ from sqlalchemy import text
 # Añadir el directorio raíz del proyecto ('Observatorio') al path de Python
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from src.database.conexion import engine
+from src.database.conexion import get_engine
+from src.database.bulk_loader import format_load_stats, replace_table
+from src.database.csv_validator import to_records, validate_csv
 from src.config.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Tabla que carga este script y tablas que deben cargarse antes (ver ejecutar_todas_las_importaciones.py)
+TABLA = "Instituciones_2021_2025"
+DEPENDE_DE = ()
+
 # Definir la ruta del archivo CSV
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 ruta_archivo = os.path.join(project_root, "data", "csv", "Tabla_instituciones_2021_2025.csv")
 
-print("\n" + "="*70)
-print("INSERCIÓN DE DATOS - TABLA INSTITUCIONES_2021_2025")
-print("="*70)
+# Columnas del CSV -> columnas de la tabla (ver src/database/csv_validator.py)
+ESQUEMA = {
+    "Año": {"column": "FECHA", "type": "int", "required": False},
+    "Etapa": {"column": "ETAPA", "type": "int", "required": False},
+    "Institución Educativa": {"column": "INSTITUCION_EDUCATIVA", "required": False},
+    "Matriculados": {"column": "MATRICULADOS", "type": "int", "required": False},
+}
 
-try:
-    # Leer el CSV
-    print(f"\n📂 Leyendo archivo: {ruta_archivo}")
-    df = pd.read_csv(ruta_archivo, sep=';', encoding='utf-8-sig')
-    
-    print(f"✓ Archivo cargado exitosamente")
-    print(f"   • Total de filas (antes de limpieza): {len(df)}")
-    print(f"   • Total de columnas: {len(df.columns)}")
-    print(f"   • Columnas: {list(df.columns)}")
-    
-    # Limpiar filas completamente vacías
-    df = df.dropna(how='all')
-    print(f"   • Total de filas (después de eliminar filas vacías): {len(df)}")
-    
-    # Validar que el CSV no tenga valores vacíos ni nulos
-    print(f"\n🔍 Validando datos...")
-    
-    nulls_por_columna = df.isnull().sum()
-    if nulls_por_columna.sum() > 0:
-        print("  ⚠️ Advertencia: Se encontraron valores nulos:")
-        for col, count in nulls_por_columna[nulls_por_columna > 0].items():
-            print(f"     • {col}: {count} valores")
-    else:
-        print("  ✓ No hay valores nulos")
-    
-    # Mostrar sample de datos
-    print(f"\n📋 Primeras 5 filas del CSV:")
-    print(df.head().to_string())
-    
-    print(f"\n🔄 Preparando datos para inserción...")
-    
-    # Crear lista de registros para inserción
-    registros = []
-    errores = []
-    
-    for idx, row in df.iterrows():
-        try:
-            # Extraer y convertir valores según la estructura de la tabla
-            fecha = int(row['Año']) if pd.notna(row['Año']) else None
-            etapa = int(row['Etapa']) if pd.notna(row['Etapa']) else None
-            institucion = str(row['Institución Educativa']).strip() if pd.notna(row['Institución Educativa']) else None
-            matriculados = int(row['Matriculados']) if pd.notna(row['Matriculados']) else None
-            
-            registros.append({
-                'FECHA': fecha,
-                'ETAPA': etapa,
-                'INSTITUCION_EDUCATIVA': institucion,
-                'MATRICULADOS': matriculados
-            })
-        
-        except Exception as e:
-            errores.append({
-                'fila': idx + 2,
-                'razon': str(e),
-                'valores': row.to_dict()
-            })
-            continue
-    
-    print(f"✓ Datos preparados")
-    print(f"   • Registros válidos: {len(registros)}")
-    print(f"   • Registros con error: {len(errores)}")
-    
-    if errores:
-        print(f"\n⚠️ Errores encontrados:")
-        for error in errores[:5]:
-            print(f"   Fila {error['fila']}: {error['razon']}")
-        if len(errores) > 5:
-            print(f"   ... y {len(errores) - 5} errores más")
-    
-    # Insertar en la base de datos
-    print(f"\n💾 Insertando {len(registros)} registros en la base de datos...")
-    
-    # --- INICIO: Eliminar datos existentes ---
-    with engine.connect() as connection:
-        transaction = connection.begin()
-        try:
-            print(f"   • Limpiando datos antiguos de la tabla 'Instituciones_2021_2025'...")
-            connection.execute(text("DELETE FROM Instituciones_2021_2025"))
-            transaction.commit()
-            print(f"   ✓ Datos antiguos eliminados.")
-        except Exception as e:
-            transaction.rollback()
-            print(f"   ✗ Error al limpiar la tabla: {e}")
-            raise
-    # --- FIN: Eliminar datos existentes ---
 
-    with engine.connect() as connection:
-        inseridos = 0
-        
-        for reg in registros:
-            try:
-                # Insertar registro
-                connection.execute(text(
-                    """INSERT INTO Instituciones_2021_2025 
-                       (FECHA, ETAPA, INSTITUCION_EDUCATIVA, MATRICULADOS)
-                       VALUES (:fecha, :etapa, :institucion, :matriculados)"""
-                ), {
-                    'fecha': reg['FECHA'],
-                    'etapa': reg['ETAPA'],
-                    'institucion': reg['INSTITUCION_EDUCATIVA'],
-                    'matriculados': reg['MATRICULADOS']
-                })
-                
-                inseridos += 1
-                
-                # Commit cada 100 registros
-                if inseridos % 100 == 0:
-                    connection.commit()
-                    print(f"   ✓ {inseridos} registros procesados...")
-            
-            except Exception as e:
-                print(f"   ✗ Error al insertar: {str(e)[:100]}")
-                connection.rollback()
-                logger.error(f"Error inserting record: {e}", exc_info=True)
-        
-        # Commit final
-        connection.commit()
+def importar(engine):
+    """
+    Carga Tabla_instituciones_2021_2025.csv en Instituciones_2021_2025 con `engine`.
+
+    Devuelve un diccionario con table, rows (filas insertadas), rejected (filas
+    rechazadas por el esquema) y load (resumen de replace_table). Los errores se
+    muestran y se vuelven a lanzar.
+    """
+    print("\n" + "="*70)
+    print("INSERCIÓN DE DATOS - TABLA INSTITUCIONES_2021_2025")
+    print("="*70)
+
+    try:
+        # Leer el CSV
+        print(f"\n📂 Leyendo archivo: {ruta_archivo}")
+        df = pd.read_csv(ruta_archivo, sep=';', encoding='utf-8-sig')
+    
+        print(f"✓ Archivo cargado exitosamente")
+        print(f"   • Total de filas (antes de limpieza): {len(df)}")
+        print(f"   • Total de columnas: {len(df.columns)}")
+        print(f"   • Columnas: {list(df.columns)}")
+    
+        # Limpiar filas completamente vacías
+        df = df.dropna(how='all')
+        print(f"   • Total de filas (después de eliminar filas vacías): {len(df)}")
+
+        # Validar que el CSV no tenga valores vacíos ni nulos
+        print(f"\n🔍 Validando datos...")
+    
+        nulls_por_columna = df.isnull().sum()
+        if nulls_por_columna.sum() > 0:
+            print("  ⚠️ Advertencia: Se encontraron valores nulos:")
+            for col, count in nulls_por_columna[nulls_por_columna > 0].items():
+                print(f"     • {col}: {count} valores")
+        else:
+            print("  ✓ No hay valores nulos")
+    
+        # Mostrar sample de datos
+        print(f"\n📋 Primeras 5 filas del CSV:")
+        print(df.head().to_string())
+    
+        print(f"\n🔄 Preparando datos para inserción...")
+    
+        # Convertir las columnas según el esquema y separar las filas que no lo cumplen
+        validos, rechazados = validate_csv(df, ESQUEMA)
+        registros = to_records(validos)
+    
+        print(f"✓ Datos preparados")
+        print(f"   • Registros válidos: {len(registros)}")
+        print(f"   • Registros con error: {len(rechazados)}")
+    
+        if len(rechazados):
+            print(f"\n⚠️ Errores encontrados:")
+            for fila, razon in rechazados[['fila', 'razon']].head(5).itertuples(index=False):
+                print(f"   Fila {fila}: {razon}")
+            if len(rechazados) > 5:
+                print(f"   ... y {len(rechazados) - 5} errores más")
+    
+        # Insertar en la base de datos
+        print(f"\n💾 Insertando {len(registros)} registros en la base de datos...")
+    
+        # Se carga en una copia de staging y se publica con RENAME TABLE si cuadran filas y sumas;
+        # al publicar se recalculan los resúmenes, la versión de datos y el registro de importaciones
+        carga = replace_table(engine, TABLA, registros, ruta_archivo)
+        inseridos = carga["rows"]
+        for error in carga["errors"][:5]:
+            print(f"   ✗ Error al insertar: {error['razon'][:100]}")
         print(f"\n✓ Inserción completada en la base de datos")
+        print(f"   • {format_load_stats(carga)}")
     
-    # Verificar resultados
-    print(f"\n📊 Estadísticas de inserción:")
-    print(f"   • Registros insertados: {inseridos}")
-    print(f"   • Registros con error: {len(errores)}")
+        # Verificar resultados
+        print(f"\n📊 Estadísticas de inserción:")
+        print(f"   • Registros insertados: {inseridos}")
+        print(f"   • Registros con error: {len(rechazados)}")
     
-    # Mostrar estadísticas de los datos insertados
-    with engine.connect() as connection:
-        total_query = connection.execute(text("SELECT COUNT(*) FROM Instituciones_2021_2025"))
-        total = total_query.scalar()
+        # Mostrar estadísticas de los datos insertados
+        with engine.connect() as connection:
+            total_query = connection.execute(text("SELECT COUNT(*) FROM Instituciones_2021_2025"))
+            total = total_query.scalar()
         
-        print(f"\n📈 Distribución de datos en Instituciones_2021_2025:")
-        print(f"   • Total de registros: {total}")
+            print(f"\n📈 Distribución de datos en Instituciones_2021_2025:")
+            print(f"   • Total de registros: {total}")
         
-        año_query = connection.execute(text(
-            "SELECT FECHA, SUM(MATRICULADOS) as total_matriculados FROM Instituciones_2021_2025 GROUP BY FECHA"
-        ))
-        for row in año_query:
-            print(f"   • Año {row[0]}: {row[1]:,} matriculados")
+            año_query = connection.execute(text(
+                "SELECT FECHA, SUM(MATRICULADOS) as total_matriculados FROM Instituciones_2021_2025 GROUP BY FECHA"
+            ))
+            for row in año_query:
+                print(f"   • Año {row[0]}: {row[1]:,} matriculados")
         
-        institucion_query = connection.execute(text(
-            "SELECT INSTITUCION_EDUCATIVA, SUM(MATRICULADOS) as total_matriculados FROM Instituciones_2021_2025 GROUP BY INSTITUCION_EDUCATIVA ORDER BY total_matriculados DESC LIMIT 5"
-        ))
-        print(f"\n   Instituciones con más matriculados (top 5):")
-        for row in institucion_query:
-            print(f"      • {row[0]}: {row[1]:,} matriculados")
+            institucion_query = connection.execute(text(
+                "SELECT INSTITUCION_EDUCATIVA, SUM(MATRICULADOS) as total_matriculados FROM Instituciones_2021_2025 GROUP BY INSTITUCION_EDUCATIVA ORDER BY total_matriculados DESC LIMIT 5"
+            ))
+            print(f"\n   Instituciones con más matriculados (top 5):")
+            for row in institucion_query:
+                print(f"      • {row[0]}: {row[1]:,} matriculados")
     
-    print("\n" + "="*70)
-    print("✅ PROCESO COMPLETADO EXITOSAMENTE")
-    print("="*70)
+        print("\n" + "="*70)
+        print("✅ PROCESO COMPLETADO EXITOSAMENTE")
+        print("="*70)
+    
+        logger.info(f"Successfully inserted {inseridos} records into Instituciones_2021_2025")
     
-    logger.info(f"Successfully inserted {inseridos} records into Instituciones_2021_2025")
+        return {"table": TABLA, "rows": inseridos, "rejected": len(rechazados), "load": carga}
+
+    except FileNotFoundError:
+        print(f"\n❌ Error: Archivo no encontrado")
+        print(f"   Ruta esperada: {ruta_archivo}")
+        logger.error(f"File not found: {ruta_archivo}", exc_info=True)
+        raise
+    
+    except Exception as e:
+        print(f"\n❌ Error inesperado: {str(e)}")
+        print(f"   Tipo: {type(e).__name__}")
+        logger.error(f"Unexpected error: {e}", exc_info=True)
+        raise
 
-except FileNotFoundError:
-    print(f"\n❌ Error: Archivo no encontrado")
-    print(f"   Ruta esperada: {ruta_archivo}")
-    logger.error(f"File not found: {ruta_archivo}", exc_info=True)
-    
-except Exception as e:
-    print(f"\n❌ Error inesperado: {str(e)}")
-    print(f"   Tipo: {type(e).__name__}")
-    logger.error(f"Unexpected error: {e}", exc_info=True)
 
-finally:
-    engine.dispose()
-    logger.info("Database connection closed")
\ No newline at end of file
+if __name__ == "__main__":
+    engine = get_engine()
+    try:
+        importar(engine)
+    except Exception:
+        sys.exit(1)
+    finally:
+        engine.dispose()
+        logger.info("Database connection closed")
@@ -1,198 +1,32 @@
-import streamlit as st
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
-from sqlalchemy import create_engine, text
-import sys 
+import sys
 import os
-from dashboard_config import create_nav_buttons
 from dashboard_config import COMFENALCO_LABEL
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-# Configurar streamlit
-st.set_page_config(layout="wide", page_title="Estudiantes Escuela Nueva")
-st.title("📊 Estudiantes Escuela Nueva")
-
-# --- State and Navigation ---
-if 'population_filter' not in st.session_state:
-    st.session_state.population_filter = COMFENALCO_LABEL
-
-create_nav_buttons(st.session_state.population_filter)
-st.markdown("---")
-st.markdown("""
-<style>
-    /* Style for page links with flexible height and text wrapping */
-    a[data-testid="stPageLink"] {
-        border: 1px solid #ddd;
-        border-radius: 5px;
-        padding: 15px 10px;
-        text-align: center;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        text-decoration: none;
-        min-height: 5.5em;
-        line-height: 1.4;
-        word-wrap: break-word;
-        white-space: normal;
-        font-size: 0.85em;
-        overflow-wrap: break-word;
-        word-break: break-word;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-@st.cache_resource
-def get_engine():
-    # Lee desde st.secrets
-    db_user = st.secrets["DB_USER"]
-    db_pass = st.secrets["DB_PASS"]
-    db_host = st.secrets["DB_HOST"]
-    db_port = st.secrets["DB_PORT"]
-    db_name = st.secrets["DB_NAME"]
-    connection_string = f"mysql+mysqlconnector://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
-    return create_engine(connection_string, pool_pre_ping=True)
-
-# Inicializar conexión
-try:
-    engine = get_engine()
-except Exception as e:
-    st.error("❌ No se pudo conectar a la base de datos")
-    st.exception(e)
-    st.stop()
-
-@st.cache_data
-def get_available_years(_engine):
-    table_name = "Escuela_nueva"
-    with _engine.connect() as connection:
-        if not _engine.dialect.has_table(connection, table_name):
-            st.warning(f"La tabla '{table_name}' no existe. No se pueden cargar los años.")
-            return []
-        query_years = text(f"SELECT DISTINCT FECHA FROM {table_name} ORDER BY FECHA DESC")
-        years = [row[0] for row in connection.execute(query_years).fetchall()]
-        if years:
-            return years
-    st.warning(f"No se encontraron años en la tabla '{table_name}'.")
-    return []
-
-
-# --- Función de Visualización ---
-def create_bar_chart_and_table(df_data, total_grupo, title):
-    st.header(title)
-    
-    if df_data.empty:
-        st.warning("No hay datos para este grupo.")
-        return
-
-    df_data['cantidad'] = pd.to_numeric(df_data['cantidad'])
-    df_data = df_data[df_data['cantidad'] > 0]
-
-    if df_data.empty:
-        st.info("No hay instituciones con matriculados para este grupo.")
-        return
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(df_data)))
-    bars = ax.bar(df_data['institucion'], df_data['cantidad'], color=colors, edgecolor='black', linewidth=1.2)
-
-    for bar in bars:
-        height = bar.get_height()
-        ax.annotate(f'{int(height):,}',
-                    xy=(bar.get_x() + bar.get_width() / 2, height),
-                    xytext=(0, 3), textcoords="offset points",
-                    ha='center', va='bottom', fontsize=9, fontweight='bold')
-
-    ax.set_xlabel('Institución Educativa', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Cantidad de Matriculados', fontsize=12, fontweight='bold')
-    ax.set_title('Matriculados por Institución', fontsize=14, fontweight='bold', pad=20)
-    plt.xticks(rotation=45, ha="right")
-    max_val = df_data['cantidad'].max() if not df_data.empty else 1
-    ax.set_ylim(0, float(max_val) * 1.2)
-    ax.grid(axis='y', alpha=0.3, linestyle='--')
-    plt.tight_layout()
-    st.pyplot(fig)
-
-    st.subheader("📋 Resumen")
-    df_data['porcentaje'] = (df_data['cantidad'] / float(total_grupo) * 100) if total_grupo > 0 else 0
-    df_display = df_data.copy()
-    df_display['#'] = range(1, len(df_display) + 1)
-    df_display['cantidad'] = df_display['cantidad'].apply(lambda x: f"{int(x):,}")
-    df_display['porcentaje'] = df_display['porcentaje'].apply(lambda x: f"{x:.2f}%")
-    df_display = df_display[['#', 'institucion', 'cantidad', 'porcentaje']]
-    df_display.columns = ['#', 'Institución', 'Matriculados', 'Porcentaje']
-    st.dataframe(df_display, width='stretch', hide_index=True)
-
-@st.cache_data
-def load_data(_engine, year):
-    table_name = "Escuela_nueva"
-    with _engine.connect() as connection:
-        if not _engine.dialect.has_table(connection, table_name):
-            return pd.DataFrame(), 0
 
-        params = {'year': year}
-        # Métricas
-        total_matriculados = connection.execute(text(f"SELECT SUM(MATRICULADOS) FROM {table_name} WHERE FECHA = :year"), params).scalar() or 0
-        
-        # Datos por institución
-        query_total_data = text(f"SELECT INSTITUCION_EDUCATIVA as institucion, COALESCE(SUM(MATRICULADOS), 0) as cantidad FROM {table_name} WHERE FECHA = :year AND INSTITUCION_EDUCATIVA IS NOT NULL AND INSTITUCION_EDUCATIVA != '' AND INSTITUCION_EDUCATIVA != 'SIN INFORMACION' GROUP BY institucion ORDER BY cantidad DESC")
-        df_total = pd.DataFrame(connection.execute(query_total_data, params).fetchall(), columns=["institucion", "cantidad"])
-
-        return df_total, total_matriculados
-
-# --- Consultas y Visualización Principal ---
-try:
-    st.sidebar.header("Filtros")
-    selected_pop = st.session_state.population_filter
-
-    available_years = get_available_years(engine)
-
-    if not available_years:
-        st.warning(f"⚠️ No se encontraron años disponibles para {COMFENALCO_LABEL}.")
-        st.stop()
-
-    if 'selected_year' not in st.session_state or st.session_state.selected_year not in available_years:
-        st.session_state.selected_year = available_years[0]
-
-    selected_year = st.session_state.selected_year
-
-    df_total, total_matriculados = load_data(engine, selected_year)
-
-    st.sidebar.info(f"**Año:** {selected_year}")
-    st.sidebar.divider()
-
-    st.sidebar.header("📈 Estadísticas Generales")
-    st.sidebar.metric(f"Total Matriculados ({selected_year})", f"{int(total_matriculados):,}")
-    st.sidebar.divider()
-    # Añadir el logo al final del sidebar
-    if os.path.exists("assets/Logo_rionegro.png"):
-        st.sidebar.image("assets/Logo_rionegro.png")
-
-    # Layout en dos columnas: Gráfico y tabla a la izquierda, filtro de año a la derecha
-    col1, col2 = st.columns([3, 1])
-
-    with col1:
-        create_bar_chart_and_table(df_total, total_matriculados, f"Total Matriculados por Institución - Año {selected_year}")
-
-    with col2:
-        st.write("📅 **Seleccionar Año**")
-        def set_year(year):
-            st.session_state.selected_year = year
-
-        for year in available_years:
-            button_type = "primary" if year == selected_year else "secondary"
-            st.button(str(year), key=f"year_{year}", on_click=set_year, args=(year,), type=button_type, width='stretch')
-
-except Exception as e:
-    st.error("❌ Error al cargar los datos")
-    st.exception(e)
-
-def add_interest_links():
-    st.markdown("---")
-    st.markdown("### 🔗 Oportunidades laborales")
-    st.markdown("""
-    - [Agencia pública de empleo – Comfenalco Antioquia](https://www.comfenalcoantioquia.com.co/personas/sedes/oficina-de-empleo-oriente)
-    - [Agencia Pública de Empleo Municipio de Rionegro](https://www.comfenalcoantioquia.com.co/personas/servicios/agencia-de-empleo/ofertas)
-    - [Agencia Pública de Empleo SENA](https://ape.sena.edu.co/Paginas/Inicio.aspx) 
-    """)
-add_interest_links()
\ No newline at end of file
+# Añadir el directorio raíz del proyecto a sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.page_renderer import render_page
+
+PAGE = {
+    "page_title": "Estudiantes Escuela Nueva",
+    "title": "📊 Estudiantes Escuela Nueva",
+    "population": COMFENALCO_LABEL,
+    "data": {
+        "table": "Escuela_nueva",
+        "dimensions": ("INSTITUCION_EDUCATIVA",),
+        "order_by": ("-cantidad",),
+    },
+    "year_selector": "side",
+    "metrics": ("Total Matriculados ({year})",),
+    "header": "Total Matriculados por Institución - Año {year}",
+    "empty_message": "No hay instituciones con matriculados para este año.",
+    "positive_only": True,
+    "chart": {
+        "kind": "bar",
+        "title": "Matriculados por Institución",
+        "xlabel": "Institución Educativa",
+        "ylabel": "Cantidad de Matriculados",
+    },
+    "table": {"kind": "ranking", "labels": ("Institución", "Matriculados"), "decimals": 2},
+}
+
+render_page(PAGE)
@@ -0,0 +1,154 @@
+"""
+Tablas de resumen precalculadas para los dashboards.
+
+Las importaciones llaman a refresh_aggregates() después de cargar una tabla; los
+agregados quedan en Resumen_agregados con la clave
+(PROGRAMA, DIMENSION, FECHA, ETAPA, VALOR), de modo que, con DATA_SOURCE="sql",
+las páginas por etapas obtienen su desglose con una búsqueda por prefijo de la
+clave primaria en lugar de agrupar las filas originales. Con "snapshot" se
+agrupa la instantánea en memoria, como en el resto de páginas.
+
+Uso para reconstruir todos los resúmenes:
+    python -m src.database.aggregates
+"""
+import json
+import threading
+
+import pandas as pd
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import ProgrammingError
+
+from src.config.logger_config import get_logger
+from src.database.conexion import get_engine, is_missing_table
+from src.database.models import Base, Resumen_agregados
+
+logger = get_logger(__name__)
+
+SUMMARY_TABLE = Resumen_agregados.__tablename__
+
+# Las importaciones en paralelo comparten Resumen_agregados: se recalcula una tabla a la vez
+_refresh_lock = threading.Lock()
+
+# Combinaciones de dimensiones de las páginas por etapas (load_stage_breakdown),
+# las únicas que leen Resumen_agregados, por tabla de origen
+AGGREGATE_DIMENSIONS = {
+    "Estudiantes_2016_2019": [("SEDE_NODAL",), ("POBLACION",), ("DIA", "JORNADA")],
+    "Estudiantes_2021_2025": [("SEDE_NODAL",), ("POBLACION",), ("DIA", "JORNADA")],
+    "Estudiantes_intensificacion": [("SEDE_NODAL",), ("POBLACION",), ("DIA", "JORNADA")],
+    "Grados_2021_2025": [("GRADO",)],
+    "Instituciones_2021_2025": [("INSTITUCION_EDUCATIVA",)],
+}
+
+
+def dimension_key(dimensions):
+    """Nombre con el que se guarda una combinación de dimensiones en la columna DIMENSION."""
+    return ",".join(dimensions)
+
+
+def is_registered(table_name, dimensions):
+    """Indica si la combinación `dimensions` de `table_name` tiene agregados precalculados."""
+    return tuple(dimensions) in AGGREGATE_DIMENSIONS.get(table_name, [])
+
+
+def refresh_aggregates(engine, table_name):
+    """
+    Recalcula en el servidor todos los agregados registrados de `table_name`.
+
+    Cada combinación se resuelve con un INSERT ... SELECT ... GROUP BY, así que
+    las filas de origen no salen de la base de datos. El borrado y la inserción
+    van en la misma transacción. La tabla de resumen se crea si aún no existe.
+    Las tablas sin combinaciones registradas no tienen agregados y se omiten.
+
+    Devuelve True si se recalculó algún agregado.
+    """
+    if table_name not in AGGREGATE_DIMENSIONS:
+        return False
+    with _refresh_lock:
+        _refresh_aggregates(engine, table_name)
+    return True
+
+
+def _refresh_aggregates(engine, table_name):
+    Resumen_agregados.__table__.create(engine, checkfirst=True)
+    table = Base.metadata.tables[table_name]
+    has_stage = 'ETAPA' in table.columns
+    has_students = 'MATRICULADOS' in table.columns
+    stage_sql = "COALESCE(ETAPA, 0)" if has_stage else "0"
+    # Un literal en GROUP BY se interpreta como posición de columna: solo se agrupa por ETAPA si existe
+    group_sql = "COALESCE(FECHA, 0), COALESCE(ETAPA, 0)" if has_stage else "COALESCE(FECHA, 0)"
+    students_sql = "COALESCE(SUM(MATRICULADOS), 0)" if has_students else "0"
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {SUMMARY_TABLE} WHERE PROGRAMA = :programa"),
+                           {'programa': table_name})
+        for dimensions in AGGREGATE_DIMENSIONS.get(table_name, []):
+            dims_sql = ", ".join(dimensions)
+            connection.execute(text(f"""
+                INSERT INTO {SUMMARY_TABLE} (PROGRAMA, DIMENSION, FECHA, ETAPA, VALOR, MATRICULADOS, REGISTROS)
+                SELECT
+                    :programa, :dimension, COALESCE(FECHA, 0), {stage_sql},
+                    JSON_ARRAY({dims_sql}), {students_sql}, COUNT(ID)
+                FROM {table_name}
+                GROUP BY {group_sql}, {dims_sql}
+            """), {'programa': table_name, 'dimension': dimension_key(dimensions)})
+    logger.info(f"Agregados de '{table_name}' actualizados")
+
+
+def load_aggregate_groups(engine, table_name, year, dimensions, measure="MATRICULADOS"):
+    """
+    Lee de Resumen_agregados los grupos de un año para una combinación registrada.
+
+    Devuelve un DataFrame con columnas ETAPA + `dimensions` + 'cantidad', o None si
+    no hay agregados para ese año (tabla de resumen vacía o sin construir), para
+    que quien llama recurra a la tabla original.
+    """
+    query = text(f"""
+        SELECT ETAPA, VALOR, {measure}
+        FROM {SUMMARY_TABLE}
+        WHERE PROGRAMA = :programa AND DIMENSION = :dimension AND FECHA = :year
+    """)
+    params = {'programa': table_name, 'dimension': dimension_key(dimensions), 'year': year}
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(query, params).fetchall()
+    except ProgrammingError as e:
+        if not is_missing_table(e):
+            raise
+        return None
+    if not rows:
+        return None
+
+    values = [json.loads(row[1]) for row in rows]
+    df = pd.DataFrame(values, columns=list(dimensions)).astype(object)
+    df = df.where(df.notna(), None)
+    df.insert(0, 'ETAPA', [row[0] for row in rows])
+    df['cantidad'] = pd.to_numeric([row[2] for row in rows])
+    return df
+
+
+def refresh_all(engine):
+    """
+    Recalcula los agregados de todas las tablas registradas que existan en la base
+    de datos y borra los de tablas que ya no tienen combinaciones registradas.
+    """
+    Resumen_agregados.__table__.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {SUMMARY_TABLE} WHERE PROGRAMA NOT IN :programas")
+                           .bindparams(bindparam('programas', expanding=True)),
+                           {'programas': list(AGGREGATE_DIMENSIONS)})
+    for table_name in AGGREGATE_DIMENSIONS:
+        try:
+            refresh_aggregates(engine, table_name)
+        except ProgrammingError as e:
+            if not is_missing_table(e):
+                raise
+            logger.warning(f"La tabla '{table_name}' no existe; se omiten sus agregados")
+
+
+if __name__ == "__main__":
+    engine = get_engine()
+    try:
+        refresh_all(engine)
+        print("Tablas de resumen actualizadas")
+    finally:
+        engine.dispose()
@@ -0,0 +1,346 @@
+"""
+Carga masiva de filas para los scripts de importación (data/imports).
+
+bulk_insert() envía las filas en lotes de IMPORT_BATCH_SIZE (por defecto 1000)
+con un executemany por lote, que mysql-connector reescribe como un único
+INSERT ... VALUES (...), (...), y confirma cada lote. Con IMPORT_LOAD_METHOD=infile,
+o con el valor por defecto "auto" si el servidor tiene activado local_infile, las
+filas se escriben en un archivo temporal y se cargan con un solo
+LOAD DATA LOCAL INFILE.
+
+Si un lote falla, sus filas se reintentan una a una para aislar las que el
+servidor rechaza, igual que hacían los scripts fila a fila. Cada carga devuelve
+y registra en el log sus filas por segundo, para dimensionar las ventanas de
+importación.
+
+replace_table() reemplaza el contenido completo de una tabla sin que los
+dashboards la vean a medio cargar: las filas van a una copia <tabla>__staging,
+se comprueban su número de filas y las sumas de sus columnas numéricas, y la
+copia se publica con un único RENAME TABLE, que tarda milisegundos sea cual sea
+el tamaño de la tabla. Si la comprobación falla, la tabla publicada no se toca.
+Tras publicar, replace_table() incrementa la versión de datos de la tabla,
+recalcula sus resúmenes (y vuelve a incrementarla si cambiaron) y anota la carga en registro_importaciones, de modo que
+ningún importador tiene que repetir (ni puede olvidar) esos pasos.
+"""
+import os
+import tempfile
+import time
+
+from sqlalchemy import column, create_engine, table, text
+from sqlalchemy.pool import NullPool
+
+from src.config.logger_config import get_logger
+from .aggregates import refresh_aggregates
+from .conexion import get_setting, is_connection_error
+from .data_version import bump_data_version
+from .import_ledger import record_import
+from .schema import invalidate_schema
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+LOAD_METHODS = ("auto", "executemany", "infile")
+
+STAGING_SUFFIX = "__staging"
+RETIRED_SUFFIX = "__old"
+
+
+class StagingCheckError(Exception):
+    """La copia de staging no tiene las filas o sumas esperadas; la tabla publicada no se tocó."""
+
+
+def _batch_size(batch_size):
+    return max(int(batch_size or get_setting("IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE)), 1)
+
+
+def _load_method(method):
+    method = str(method or get_setting("IMPORT_LOAD_METHOD", "auto")).lower()
+    if method not in LOAD_METHODS:
+        raise ValueError(f"IMPORT_LOAD_METHOD debe ser uno de {LOAD_METHODS}, no {method!r}")
+    return method
+
+
+def server_allows_local_infile(engine):
+    """Indica si el servidor MySQL de `engine` acepta LOAD DATA LOCAL INFILE."""
+    if engine.dialect.name != "mysql":
+        return False
+    try:
+        with engine.connect() as connection:
+            row = connection.execute(text("SHOW GLOBAL VARIABLES LIKE 'local_infile'")).first()
+    except Exception as e:
+        logger.warning(f"No se pudo consultar local_infile: {e}")
+        return False
+    return row is not None and str(row[1]).upper() in ("ON", "1")
+
+
+def _infile_value(value):
+    """Valor en el formato de texto de LOAD DATA (\\N para nulos, separadores escapados)."""
+    if value is None:
+        return r"\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def _load_infile(engine, table_name, columns, records):
+    """Carga `records` con LOAD DATA LOCAL INFILE. Devuelve (filas insertadas, errores)."""
+    # El cliente debe habilitar el envío de archivos al conectar; se usa un motor aparte sin pool
+    infile_engine = create_engine(engine.url, connect_args={"allow_local_infile": True}, poolclass=NullPool)
+    fd, path = tempfile.mkstemp(prefix=f"{table_name}_", suffix=".tsv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            for record in records:
+                f.write("\t".join(_infile_value(record.get(name)) for name in columns) + "\n")
+        statement = text(
+            f"LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}' INTO TABLE {table_name} "
+            r"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\t' ESCAPED BY '\\' LINES TERMINATED BY '\n' "
+            f"({', '.join(columns)})"
+        )
+        with infile_engine.connect() as connection:
+            inserted = connection.execute(statement).rowcount
+            # LOAD DATA LOCAL convierte los rechazos en advertencias en lugar de fallar
+            warnings = connection.execute(text("SHOW WARNINGS")).fetchall() if inserted < len(records) else []
+            connection.commit()
+        errors = [{"registro": None, "razon": str(warning[2])} for warning in warnings]
+        return inserted, errors
+    finally:
+        infile_engine.dispose()
+        os.remove(path)
+
+
+def _insert_rows(connection, target, batch, offset, errors):
+    """Inserta `batch` fila a fila y anota en `errors` las que falla. Devuelve las insertadas."""
+    inserted = 0
+    for i, record in enumerate(batch):
+        try:
+            connection.execute(target.insert(), record)
+            connection.commit()
+            inserted += 1
+        except Exception as e:
+            connection.rollback()
+            if is_connection_error(e):
+                raise
+            errors.append({"registro": offset + i, "razon": str(getattr(e, "orig", e))})
+    return inserted
+
+
+def _insert_batches(engine, table_name, columns, records, batch_size):
+    """Carga `records` en lotes con executemany. Devuelve (filas insertadas, errores)."""
+    target = table(table_name, *(column(name) for name in columns))
+    inserted = 0
+    errors = []
+    with engine.connect() as connection:
+        for offset in range(0, len(records), batch_size):
+            batch = records[offset:offset + batch_size]
+            try:
+                connection.execute(target.insert(), batch)
+                connection.commit()
+                inserted += len(batch)
+            except Exception as e:
+                connection.rollback()
+                if is_connection_error(e):
+                    raise
+                logger.warning(f"Lote {offset}-{offset + len(batch)} de {table_name} rechazado ({getattr(e, 'orig', e)}); "
+                               "se reintenta fila a fila")
+                inserted += _insert_rows(connection, target, batch, offset, errors)
+            logger.debug(f"{table_name}: {offset + len(batch)} de {len(records)} filas procesadas")
+    return inserted, errors
+
+
+def bulk_insert(engine, table_name, records, columns=None, batch_size=None, method=None):
+    """
+    Inserta `records` (lista de diccionarios columna -> valor) en `table_name`.
+
+    `columns` son las columnas a cargar (por defecto, las claves del primer
+    registro); `batch_size` y `method` sobrescriben IMPORT_BATCH_SIZE e
+    IMPORT_LOAD_METHOD ("auto", "executemany" o "infile").
+
+    Devuelve un diccionario con table, method, rows (filas insertadas), errors
+    (lista de {registro, razon}), seconds, rows_per_second y batch_size.
+    """
+    batch_size = _batch_size(batch_size)
+    method = _load_method(method)
+    columns = list(columns or (records[0].keys() if records else []))
+
+    automatic = method == "auto"
+    if automatic:
+        method = "infile" if records and server_allows_local_infile(engine) else "executemany"
+
+    start = time.perf_counter()
+    inserted, errors = 0, []
+    if records and method == "infile":
+        try:
+            inserted, errors = _load_infile(engine, table_name, columns, records)
+        except Exception as e:
+            if not automatic or is_connection_error(e):
+                raise
+            # Por ejemplo, el cliente no permite LOAD DATA LOCAL: se sigue por lotes
+            logger.warning(f"LOAD DATA LOCAL INFILE no disponible para {table_name} ({e}); se usa executemany")
+            method = "executemany"
+    if records and method == "executemany":
+        inserted, errors = _insert_batches(engine, table_name, columns, records, batch_size)
+    seconds = time.perf_counter() - start
+
+    stats = {
+        "table": table_name,
+        "method": method,
+        "rows": inserted,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(inserted / seconds, 1) if seconds > 0 else 0.0,
+        "batch_size": batch_size,
+    }
+    logger.info(f"Carga de {table_name}: {format_load_stats(stats)}")
+    return stats
+
+
+def format_load_stats(stats):
+    """Resumen de una carga, por ejemplo '12,000 filas en 0.80 s (15,000 filas/s, executemany en lotes de 1000)'."""
+    method = stats["method"]
+    if method == "executemany":
+        method = f"executemany en lotes de {stats['batch_size']}"
+    summary = (f"{stats['rows']:,} filas en {stats['seconds']:.2f} s "
+               f"({stats['rows_per_second']:,.0f} filas/s, {method})")
+    if stats["errors"]:
+        summary += f", {len(stats['errors'])} rechazada(s)"
+    if "swap_seconds" in stats:
+        summary += f", publicada en {stats['swap_seconds'] * 1000:.0f} ms"
+    return summary
+
+
+def _create_staging(engine, table_name, staging):
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        if engine.dialect.name == "mysql":
+            # Misma definición e índices que la tabla publicada
+            connection.execute(text(f"CREATE TABLE {staging} LIKE {table_name}"))
+            _continue_auto_increment(connection, table_name, staging)
+        else:
+            connection.execute(text(f"CREATE TABLE {staging} AS SELECT * FROM {table_name} WHERE 1 = 0"))
+
+
+def _continue_auto_increment(connection, table_name, staging):
+    """
+    CREATE TABLE ... LIKE empieza el AUTO_INCREMENT en 1: la copia continúa la
+    numeración de la tabla publicada para que una recarga nunca reutilice IDs.
+    """
+    column = connection.execute(text(f"SHOW COLUMNS FROM {table_name} WHERE Extra LIKE '%auto_increment%'")).first()
+    if column is None:
+        return
+    next_id = connection.execute(text(f"SELECT COALESCE(MAX({column[0]}), 0) + 1 FROM {table_name}")).scalar()
+    connection.execute(text(f"ALTER TABLE {staging} AUTO_INCREMENT = {int(next_id)}"))
+
+
+def _drop_staging(engine, staging):
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    except Exception as e:
+        logger.warning(f"No se pudo eliminar {staging}: {e}")
+
+
+def _numeric_columns(columns, records):
+    """Columnas con algún valor entero en `records`, cuyas sumas se comprueban antes de publicar."""
+    return [name for name in columns
+            if any(isinstance(record.get(name), int) and not isinstance(record.get(name), bool)
+                   for record in records)]
+
+
+def _check_staging(engine, staging, records, sum_columns, stats):
+    """
+    Compara las filas y sumas de `staging` con las de `records`, sin contar las
+    filas que el servidor rechazó. Las advertencias de LOAD DATA no dicen qué
+    fila afectan: con ellas solo se comprueba el número de filas.
+    """
+    rejected = {error["registro"] for error in stats["errors"]}
+    if None in rejected:
+        sum_columns = []
+    loaded = [record for i, record in enumerate(records) if i not in rejected]
+    sums_sql = "".join(f", COALESCE(SUM({name}), 0)" for name in sum_columns)
+    with engine.connect() as connection:
+        found = list(connection.execute(text(f"SELECT COUNT(*){sums_sql} FROM {staging}")).first())
+    expected = ([stats["rows"] if None in rejected else len(loaded)]
+                + [sum(record.get(name) or 0 for record in loaded) for name in sum_columns])
+    if found != expected:
+        labels = ["filas"] + [f"SUM({name})" for name in sum_columns]
+        differences = ", ".join(f"{label}: {got} en lugar de {want}"
+                                for label, got, want in zip(labels, found, expected) if got != want)
+        raise StagingCheckError(f"{staging} no coincide con el CSV ({differences})")
+
+
+def _publish(engine, table_name, staging, columns):
+    """Sustituye `table_name` por `staging`. Devuelve los segundos que la tabla estuvo bloqueada."""
+    retired = f"{table_name}{RETIRED_SUFFIX}"
+    if engine.dialect.name == "mysql":
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {retired}"))
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            # Un solo RENAME TABLE es atómico: quien consulta ve la tabla anterior o la nueva
+            connection.execute(text(f"RENAME TABLE {table_name} TO {retired}, {staging} TO {table_name}"))
+        seconds = time.perf_counter() - start
+        _drop_staging(engine, retired)
+        return seconds
+
+    # Sin RENAME TABLE múltiple (p. ej. SQLite local): se copia en una sola transacción
+    names = ", ".join(columns)
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {table_name}"))
+        if columns:
+            connection.execute(text(f"INSERT INTO {table_name} ({names}) SELECT {names} FROM {staging}"))
+    seconds = time.perf_counter() - start
+    _drop_staging(engine, staging)
+    return seconds
+
+
+def _after_publish(engine, table_name, source_path, stats):
+    """
+    Pasos comunes a toda tabla recién publicada.
+
+    La versión de datos se incrementa justo después del RENAME, antes de tocar
+    los agregados: si su recálculo falla, los dashboards ya ven la tabla nueva.
+    Si el recálculo cambia los agregados, la versión se incrementa otra vez
+    para que las páginas que leen Resumen_agregados lo vuelvan a consultar.
+    """
+    invalidate_schema()
+    # Avisa a los dashboards (y a su esquema en caché) de la nueva carga
+    bump_data_version(engine, table_name)
+    if refresh_aggregates(engine, table_name):
+        bump_data_version(engine, table_name)
+    record_import(engine, table_name, source_path, stats["rows"], stats["seconds"])
+
+
+def replace_table(engine, table_name, records, source_path, columns=None, sum_columns=None,
+                  batch_size=None, method=None):
+    """
+    Reemplaza todo el contenido de `table_name` por `records` sin dejarla a medio cargar.
+
+    Las filas se cargan con bulk_insert() en <tabla>__staging; si la copia tiene
+    las filas de `records` que el servidor aceptó y las mismas sumas en
+    `sum_columns` (por defecto, las columnas enteras de `records`), se publica
+    con RENAME TABLE. Si no, se descarta y se lanza StagingCheckError.
+
+    Una vez publicada, incrementa la versión de datos de la tabla, recalcula sus
+    agregados y anota la carga de `source_path` (el CSV de origen) en
+    registro_importaciones.
+
+    Devuelve el resumen de bulk_insert() con swap_seconds, el tiempo que la
+    tabla estuvo bloqueada durante la publicación.
+    """
+    columns = list(columns or (records[0].keys() if records else []))
+    sum_columns = _numeric_columns(columns, records) if sum_columns is None else list(sum_columns)
+    staging = f"{table_name}{STAGING_SUFFIX}"
+
+    _create_staging(engine, table_name, staging)
+    try:
+        stats = bulk_insert(engine, staging, records, columns=columns, batch_size=batch_size, method=method)
+        _check_staging(engine, staging, records, sum_columns, stats)
+    except Exception:
+        _drop_staging(engine, staging)
+        raise
+
+    stats["table"] = table_name
+    stats["swap_seconds"] = round(_publish(engine, table_name, staging, columns), 4)
+    logger.info(f"{table_name} publicada desde {staging} en {stats['swap_seconds'] * 1000:.0f} ms")
+    _after_publish(engine, table_name, source_path, stats)
+    return stats
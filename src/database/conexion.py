@@ -1,24 +1,219 @@
+"""
+Registro de motores de SQLAlchemy compartidos por todo el proceso.
+
+Todas las páginas, app.py y los scripts de importación obtienen el motor desde
+aquí, de modo que cada proceso de Streamlit mantiene un único pool de
+conexiones por base de datos en lugar de uno por página.
+"""
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
+from src.config.logger_config import get_logger
+
 # Cargar variables de entorno desde el archivo .env para desarrollo local
 load_dotenv()
 
-def get_engine():
+logger = get_logger(__name__)
+
+DEFAULT_ENGINE = "default"
+
+# Código de error de MySQL para "Table doesn't exist"
+ER_NO_SUCH_TABLE = 1146
+
+# Valores por defecto del pool; se pueden sobrescribir con st.secrets o variables de entorno
+POOL_DEFAULTS = {
+    "DB_POOL_SIZE": 5,
+    "DB_MAX_OVERFLOW": 10,
+    "DB_POOL_RECYCLE": 1800,
+    "DB_POOL_TIMEOUT": 30,
+    "DB_POOL_WARMUP": 1,
+}
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class _PoolStats:
+    """Contadores de uso del pool que sobreviven a dispose()/recreate()."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que cuenta las esperas por conexión cuando el pool está agotado."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = _PoolStats()
+
+    def _do_get(self):
+        exhausted = (
+            self._pool.empty()
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            if exhausted:
+                with self.stats.lock:
+                    self.stats.timeouts += 1
+            raise
+        finally:
+            with self.stats.lock:
+                self.stats.checkouts += 1
+                if exhausted:
+                    self.stats.waits += 1
+                    self.stats.wait_seconds += time.perf_counter() - start
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+
+def get_setting(key, default=None):
     """
-    Crea y devuelve una instancia del motor de SQLAlchemy.
-    Lee las credenciales de las variables de entorno (o de st.secrets en producción).
+    Lee un valor de configuración desde st.secrets (producción) o, si no existe,
+    desde las variables de entorno (desarrollo local y scripts de importación).
     """
-    db_user = os.getenv('DB_USER')
-    db_pass = os.getenv('DB_PASS')
-    db_host = os.getenv('DB_HOST')
-    db_port = os.getenv('DB_PORT')
-    db_name = os.getenv('DB_NAME')
+    try:
+        import streamlit as st
+        if key in st.secrets:
+            return st.secrets[key]
+    except Exception:
+        # Sin Streamlit o sin secrets.toml: se usan las variables de entorno
+        pass
+    return os.getenv(key, default)
+
+
+def _get_int_setting(key):
+    return int(get_setting(key, POOL_DEFAULTS[key]))
+
+
+def is_missing_table(error):
+    """Indica si un error de SQLAlchemy se debe a que la tabla consultada no existe."""
+    return getattr(getattr(error, 'orig', None), 'errno', None) == ER_NO_SUCH_TABLE
+
+
+def is_connection_error(error):
+    """
+    Indica si `error` se debe a que no hay conexión con la base de datos (servidor
+    caído, red, pool agotado) y no a la consulta en sí.
+    """
+    if isinstance(error, (OperationalError, InterfaceError, PoolTimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+def _build_connection_string():
+    db_user = get_setting('DB_USER')
+    db_pass = get_setting('DB_PASS')
+    db_host = get_setting('DB_HOST')
+    db_port = get_setting('DB_PORT')
+    db_name = get_setting('DB_NAME')
+    return f"mysql+mysqlconnector://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+
+
+def _warm_up(engine, connections):
+    """Abre y mantiene a la vez `connections` conexiones para que el primer usuario no pague el handshake."""
+    held = []
+    try:
+        for _ in range(max(connections, 0)):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            held.append(conn)
+    finally:
+        for conn in held:
+            conn.close()
+
+
+def get_engine(name=DEFAULT_ENGINE, connection_string=None):
+    """
+    Devuelve el motor compartido registrado con `name`, creándolo la primera vez.
+
+    El pool se configura con DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE y
+    DB_POOL_TIMEOUT. En el primer uso se precalientan DB_POOL_WARMUP conexiones;
+    si el calentamiento falla se propaga el error y se reintenta en la siguiente llamada.
+    """
+    entry = _registry.get(name)
+    if entry is not None and entry["warmed_up"]:
+        return entry["engine"]
+
+    with _registry_lock:
+        entry = _registry.get(name)
+        if entry is None:
+            engine = create_engine(
+                connection_string or _build_connection_string(),
+                poolclass=InstrumentedQueuePool,
+                pool_size=_get_int_setting("DB_POOL_SIZE"),
+                max_overflow=_get_int_setting("DB_MAX_OVERFLOW"),
+                pool_recycle=_get_int_setting("DB_POOL_RECYCLE"),
+                pool_timeout=_get_int_setting("DB_POOL_TIMEOUT"),
+                pool_pre_ping=True,
+            )
+            entry = {"engine": engine, "warmed_up": False, "created_at": time.time()}
+            _registry[name] = entry
+            logger.info(f"Motor '{name}' creado (pool_size={engine.pool.size()})")
+
+        if not entry["warmed_up"]:
+            warmup = min(_get_int_setting("DB_POOL_WARMUP"), entry["engine"].pool.size())
+            _warm_up(entry["engine"], warmup)
+            entry["warmed_up"] = True
+            logger.info(f"Motor '{name}' precalentado con {warmup} conexión(es)")
+
+    return entry["engine"]
+
+
+def get_pool_stats(name=DEFAULT_ENGINE):
+    """
+    Devuelve un diccionario con el estado del pool del motor `name`:
+    conexiones en uso, en reposo, overflow, esperas y tiempo total esperando.
+    Devuelve None si el motor aún no se ha creado.
+    """
+    entry = _registry.get(name)
+    if entry is None:
+        return None
+    pool = entry["engine"].pool
+    stats = pool.stats
+    with stats.lock:
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "checkouts": stats.checkouts,
+            "waits": stats.waits,
+            "wait_seconds": round(stats.wait_seconds, 4),
+            "timeouts": stats.timeouts,
+            "warmed_up": entry["warmed_up"],
+        }
+
+
+def dispose_engine(name=DEFAULT_ENGINE):
+    """Cierra las conexiones del pool sin eliminar el motor del registro."""
+    entry = _registry.get(name)
+    if entry is not None:
+        entry["engine"].dispose()
 
-    connection_string = f"mysql+mysqlconnector://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
-    engine = create_engine(connection_string)
-    return engine
 
-# Crear instancia global del engine para uso en otros módulos
-engine = get_engine()
+def __getattr__(attr):
+    # Compatibilidad con `from src.database.conexion import engine`: el motor se
+    # crea bajo demanda en lugar de al importar el módulo.
+    if attr == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
@@ -6,6 +6,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from .conexion import engine
 from .models import Base
+from .schema import invalidate_schema
+from .data_version import bump_data_version
 from src.config.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -19,6 +21,9 @@ try:
     logger.info("Iniciando creación de tablas en la base de datos")
     Base.metadata.create_all(engine)
     logger.info("Tablas creadas exitosamente en observatorio_bilinguismo")
+    invalidate_schema()
+    # Las tablas recreadas están vacías: los dashboards deben descartar lo que tengan en caché
+    bump_data_version(engine, *(table.name for table in Base.metadata.sorted_tables if 'ID' in table.columns))
     print("Tablas creadas exitosamente en la base de datos observatorio_bilinguismo")
 except Exception as e:
     logger.error(f"Error al crear las tablas: {e}", exc_info=True)
@@ -0,0 +1,93 @@
+"""
+Validación declarativa de los CSV que cargan los scripts de importación.
+
+Cada script describe su CSV con un esquema, un diccionario columna del CSV ->
+reglas de la columna:
+
+    ESQUEMA = {
+        "Año": {"column": "FECHA", "type": "int"},
+        "Sede Nodal": {"column": "SEDE_NODAL"},
+        "Horas de formación": {"column": "HORAS", "type": "int", "default": 0},
+        "Nivel MCER": {"column": "NIVEL_MCER", "required": False, "null_values": ["SIN INFORMACION"]},
+    }
+
+- column: columna de la tabla de destino.
+- type: "str" (por defecto) o "int" (los decimales se truncan, como int()).
+- required: si es True (por defecto) las filas sin valor se rechazan; si es
+  False se cargan con NULL.
+- default: valor para las celdas vacías; con él la columna nunca rechaza filas
+  por estar vacía.
+- null_values: textos que cuentan como vacío, sin distinguir mayúsculas. Los
+  textos se recortan siempre y el texto vacío también cuenta como vacío.
+
+validate_csv() aplica el esquema columna a columna con operaciones de pandas,
+sin recorrer las filas, y separa las filas válidas de las rechazadas.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMN_TYPES = ("str", "int")
+
+# Fila del CSV correspondiente al índice 0 del DataFrame (la 1 es el encabezado)
+FIRST_DATA_LINE = 2
+
+
+def _clean_text(values, null_values):
+    text = values.astype("string").str.strip()
+    nulls = {str(value).strip().upper() for value in null_values} | {""}
+    return text.mask(text.str.upper().isin(nulls))
+
+
+def _convert(values, rules):
+    """Columna convertida y máscara de celdas con un valor que no se pudo convertir."""
+    kind = rules.get("type", "str")
+    if kind not in COLUMN_TYPES:
+        raise ValueError(f"Tipo de columna no soportado: {kind!r} (use uno de {COLUMN_TYPES})")
+
+    text = _clean_text(values, rules.get("null_values", ()))
+    if kind == "str":
+        return text, pd.Series(False, index=values.index)
+
+    numbers = pd.to_numeric(values if pd.api.types.is_numeric_dtype(values) else text, errors="coerce")
+    invalid = numbers.isna() & text.notna()
+    return pd.Series(np.trunc(numbers), index=values.index).astype("Int64"), invalid
+
+
+def validate_csv(df, schema):
+    """
+    Aplica `schema` a `df` (el CSV leído con pandas).
+
+    Devuelve (validas, rechazadas): `validas` tiene solo las columnas de destino,
+    ya convertidas; `rechazadas` tiene las columnas originales de las filas que no
+    cumplen el esquema más 'fila' (línea del CSV) y 'razon'.
+    Lanza ValueError si falta en el CSV una columna obligatoria sin valor por defecto.
+    """
+    missing = [name for name, rules in schema.items()
+               if name not in df.columns and rules.get("required", True) and "default" not in rules]
+    if missing:
+        raise ValueError(f"Faltan columnas en el CSV: {missing}")
+
+    columns = {}
+    reasons = pd.Series("", index=df.index, dtype="object")
+    for name, rules in schema.items():
+        values = df[name] if name in df.columns else pd.Series(pd.NA, index=df.index, dtype="object")
+        converted, invalid = _convert(values, rules)
+        if "default" in rules:
+            converted = converted.fillna(rules["default"])
+        empty = converted.isna() & ~invalid if rules.get("required", True) else pd.Series(False, index=df.index)
+        reasons = reasons.mask(invalid, reasons + f"{name}: valor no válido; ")
+        reasons = reasons.mask(empty, reasons + f"{name}: vacío; ")
+        columns[rules["column"]] = converted.mask(invalid)
+
+    rejected_mask = reasons != ""
+    valid = pd.DataFrame(columns, index=df.index)[~rejected_mask]
+    rejected = df[rejected_mask].assign(
+        fila=df.index[rejected_mask.to_numpy()] + FIRST_DATA_LINE,
+        razon=reasons[rejected_mask].str.rstrip("; "),
+    )
+    return valid, rejected
+
+
+def to_records(df):
+    """Filas de `df` como diccionarios con tipos de Python y None en las celdas vacías."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
@@ -0,0 +1,92 @@
+"""
+Versiones de datos por tabla para invalidar la caché de los dashboards.
+
+Cada importación incrementa la fila de su tabla en `data_version`. Los cargadores
+de page_renderer incluyen en la clave de st.cache_data la versión de las tablas
+que leen (get_data_version()), así que tras una carga solo se recalculan sus
+entradas y el resto de la caché sigue caliente sin reiniciar la aplicación.
+
+La tabla de versiones se lee con una sola consulta y el resultado se reutiliza
+durante DATA_VERSION_CHECK_SECONDS.
+"""
+import datetime
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from src.config.logger_config import get_logger
+from .conexion import get_setting, is_missing_table
+from .models import Data_version
+
+logger = get_logger(__name__)
+
+VERSION_TABLE = Data_version.__tablename__
+
+_versions = {}
+_versions_lock = threading.Lock()
+# Serializa las cargas en paralelo de ejecutar_todas_las_importaciones.py
+_bump_lock = threading.Lock()
+
+
+def _check_interval():
+    return float(get_setting("DATA_VERSION_CHECK_SECONDS", 30))
+
+
+def get_data_versions(engine):
+    """
+    Devuelve {tabla: (version, actualizado)} para todas las tablas con versión.
+
+    La fecha forma parte de la versión para que una tabla recreada con
+    crear_tablas.py no vuelva a una versión ya vista.
+    """
+    key = str(engine.url)
+    now = time.monotonic()
+    cached = _versions.get(key)
+    if cached is not None and now - cached[0] < _check_interval():
+        return cached[1]
+
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(text(f"SELECT TABLA, VERSION, ACTUALIZADO FROM {VERSION_TABLE}")).fetchall()
+        versions = {row[0]: (row[1], str(row[2])) for row in rows}
+    except ProgrammingError as e:
+        if not is_missing_table(e):
+            raise
+        versions = {}
+
+    with _versions_lock:
+        _versions[key] = (now, versions)
+    return versions
+
+
+def get_data_version(engine, *tables):
+    """Versión conjunta de `tables`; None para las tablas que aún no se han importado."""
+    versions = get_data_versions(engine)
+    return tuple(versions.get(table_name) for table_name in tables)
+
+
+def bump_data_version(engine, *tables):
+    """Incrementa la versión de `tables` (la crea si no existe) tras cargar sus datos."""
+    with _bump_lock:
+        _bump_data_version(engine, tables)
+    with _versions_lock:
+        _versions.clear()
+    logger.info(f"Versión de datos incrementada: {', '.join(tables)}")
+
+
+def _bump_data_version(engine, tables):
+    Data_version.__table__.create(engine, checkfirst=True)
+    updated_at = datetime.datetime.now().replace(microsecond=0)
+    with engine.begin() as connection:
+        for table_name in tables:
+            params = {'tabla': table_name, 'actualizado': updated_at}
+            result = connection.execute(text(
+                f"UPDATE {VERSION_TABLE} SET VERSION = VERSION + 1, ACTUALIZADO = :actualizado WHERE TABLA = :tabla"
+            ), params)
+            if result.rowcount == 0:
+                connection.execute(text(
+                    f"INSERT INTO {VERSION_TABLE} (TABLA, VERSION, ACTUALIZADO) VALUES (:tabla, 1, :actualizado)"
+                ), params)
+
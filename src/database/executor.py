@@ -0,0 +1,154 @@
+"""
+Ejecución concurrente de cargas independientes de los dashboards.
+
+Las páginas entregan aquí las consultas que no dependen unas de otras y esperan
+todos los resultados juntos, de modo que la latencia en frío es la de la consulta
+más lenta y no la suma de todas. El número de hilos se limita al tamaño del pool
+del motor compartido (DB_EXECUTOR_WORKERS, por defecto DB_POOL_SIZE) para que los
+hilos nunca esperen una conexión que no existe.
+
+prefetch() adelanta en un hilo aparte, sin esperar el resultado, las cargas que
+probablemente se pidan a continuación (por ejemplo, los demás años de una página),
+para que queden en caché antes de que el usuario las elija. Se desactiva con
+PREFETCH_ENABLED=0.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+from src.config.logger_config import get_logger
+from .conexion import POOL_DEFAULTS, get_setting
+
+logger = get_logger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+PREFETCH_THREAD_PREFIX = "prefetch"
+# Claves de precarga recordadas, para no repetir en cada rerun las ya programadas
+PREFETCH_MAX_KEYS = 1024
+
+_prefetch_executor = None
+_prefetched = OrderedDict()
+_prefetch_lock = threading.Lock()
+
+
+def _max_workers():
+    return int(get_setting("DB_EXECUTOR_WORKERS", get_setting("DB_POOL_SIZE", POOL_DEFAULTS["DB_POOL_SIZE"])))
+
+
+def get_executor():
+    """Devuelve el ThreadPoolExecutor compartido por el proceso, creándolo la primera vez."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = max(_max_workers(), 1)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-load")
+                logger.info(f"Ejecutor de cargas creado con {workers} hilo(s)")
+    return _executor
+
+
+def _script_run_ctx():
+    """Contexto de la sesión de Streamlit actual, o None fuera de Streamlit."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return None
+
+
+def _run_in_worker(ctx, func, args, kwargs):
+    # El contexto permite usar st.cache_data y st.warning desde el hilo
+    if ctx is not None:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx
+        add_script_run_ctx(threading.current_thread(), ctx)
+    _worker_state.active = True
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _worker_state.active = False
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), None)
+
+
+def submit(func, *args, **kwargs):
+    """Programa `func(*args, **kwargs)` en el ejecutor y devuelve su Future."""
+    return get_executor().submit(_run_in_worker, _script_run_ctx(), func, args, kwargs)
+
+
+def run_all(*calls):
+    """
+    Ejecuta a la vez las funciones sin argumentos de `calls` y devuelve sus
+    resultados en el mismo orden. Si alguna falla se propaga la primera excepción
+    (en el orden de `calls`) después de esperar a las demás.
+
+    Llamado desde un hilo del propio ejecutor, se ejecuta en serie para no
+    bloquear el pool esperando tareas que no tienen hilo libre.
+    """
+    if getattr(_worker_state, 'active', False) or len(calls) < 2:
+        return [call() for call in calls]
+
+    futures = [submit(call) for call in calls]
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
+
+
+class _PrefetchContextFilter(logging.Filter):
+    """Oculta el aviso de Streamlit por usar st.cache_data sin ScriptRunContext desde el hilo de precarga."""
+
+    def filter(self, record):
+        return not threading.current_thread().name.startswith(PREFETCH_THREAD_PREFIX)
+
+
+def _prefetch_enabled():
+    return str(get_setting("PREFETCH_ENABLED", "1")).lower() not in ("0", "false", "no")
+
+
+def _get_prefetch_executor():
+    # Un solo hilo: las precargas nunca ocupan más de una conexión ni compiten entre sí
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _executor_lock:
+            if _prefetch_executor is None:
+                logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+                    _PrefetchContextFilter()
+                )
+                _prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=PREFETCH_THREAD_PREFIX)
+    return _prefetch_executor
+
+
+def _run_prefetch(key, func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        # Se podrá volver a intentar en el siguiente rerun
+        with _prefetch_lock:
+            _prefetched.pop(key, None)
+        logger.warning(f"Precarga fallida ({key!r}): {e}")
+
+
+def prefetch(key, func, *args, **kwargs):
+    """
+    Programa `func(*args, **kwargs)` en el hilo de precarga, sin esperar el
+    resultado, si `key` no se programó ya. `func` debe guardar su resultado en
+    caché (st.cache_data): la precarga solo sirve para que la siguiente llamada
+    sea un acierto. Se ejecuta sin el contexto de la sesión, así que `func` no
+    debe dibujar nada. Devuelve True si se programó.
+    """
+    if not _prefetch_enabled():
+        return False
+    with _prefetch_lock:
+        if key in _prefetched:
+            return False
+        _prefetched[key] = True
+        while len(_prefetched) > PREFETCH_MAX_KEYS:
+            _prefetched.popitem(last=False)
+    _get_prefetch_executor().submit(_run_prefetch, key, func, args, kwargs)
+    return True
@@ -0,0 +1,247 @@
+"""
+Último dato bueno de los dashboards, para seguir sirviendo cuando MySQL no responde.
+
+Cada carga que pasa por load_or_stale() guarda su resultado en disco
+(FALLBACK_CACHE_DIR) cuando cambia su versión de datos. Si después la base de
+datos no responde, la página recibe ese último resultado en lugar de un error y
+muestra un aviso de "datos en caché" (ver stale_since()).
+
+Un cortacircuitos compartido por el proceso evita insistir contra una base de
+datos caída: tras DB_BREAKER_FAILURES errores de conexión seguidos se deja de
+consultar durante DB_BREAKER_SECONDS y todas las cargas salen del disco. Pasado
+ese tiempo se permite un único intento; un hilo en segundo plano revalida las
+cargas servidas desde el disco en cuanto vuelve la conexión, de modo que el
+siguiente rerun ya encuentra los datos frescos en caché.
+
+Se desactiva con FALLBACK_ENABLED=0 (los errores vuelven a llegar a la página).
+"""
+import datetime
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+from src.config.logger_config import get_logger
+from .conexion import get_setting, is_connection_error
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("data", ".cache", "fallback")
+
+REVALIDATE_THREAD_NAME = "revalidate"
+
+
+class DatabaseUnavailable(Exception):
+    """La base de datos no responde y no hay un último dato bueno guardado para la carga."""
+
+
+def _enabled():
+    return str(get_setting("FALLBACK_ENABLED", "1")).lower() not in ("0", "false", "no")
+
+
+def _cache_dir():
+    return get_setting("FALLBACK_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+class CircuitBreaker:
+    """
+    Cortacircuitos de la conexión con la base de datos.
+
+    Cerrado: se consulta normalmente. Abierto: no se consulta hasta que pasa el
+    tiempo de espera. Semiabierto: se permite un único intento; si funciona se
+    cierra y si falla se vuelve a abrir.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.last_error = None
+
+    @staticmethod
+    def _threshold():
+        return max(int(get_setting("DB_BREAKER_FAILURES", 3)), 1)
+
+    @staticmethod
+    def _cooldown():
+        return float(get_setting("DB_BREAKER_SECONDS", 30))
+
+    def seconds_until_retry(self):
+        """Segundos que faltan para el siguiente intento; 0 si el circuito está cerrado."""
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(self.opened_at + self._cooldown() - time.monotonic(), 0.0)
+
+    def allow(self):
+        """Indica si se puede consultar la base de datos ahora."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() < self.opened_at + self._cooldown():
+                return False
+            self.trial = True  # Semiabierto: solo este intento
+            return True
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                logger.info("Conexión con la base de datos recuperada: circuito cerrado")
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+            self.last_error = None
+
+    def record_failure(self, error):
+        with self.lock:
+            self.failures += 1
+            self.last_error = repr(error)
+            if self.trial or self.failures >= self._threshold():
+                if self.opened_at is None:
+                    logger.warning(f"Base de datos no disponible ({error}): circuito abierto")
+                self.opened_at = time.monotonic()
+                self.trial = False
+
+    def status(self):
+        """Estado ("cerrado", "abierto" o "semiabierto"), fallos seguidos y último error."""
+        with self.lock:
+            if self.opened_at is None:
+                state = "cerrado"
+            else:
+                state = "semiabierto" if self.trial else "abierto"
+            return {"state": state, "failures": self.failures, "last_error": self.last_error}
+
+
+breaker = CircuitBreaker()
+
+_saved_versions = {}
+_saved_lock = threading.Lock()
+_stale = threading.local()
+_pending = {}
+_pending_lock = threading.Lock()
+_revalidator = None
+
+
+def _path(key):
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return os.path.join(_cache_dir(), f"{digest}.pkl")
+
+
+def save(key, version, value):
+    """Guarda `value` como último dato bueno de `key` si su versión cambió desde la última vez."""
+    with _saved_lock:
+        if key in _saved_versions and _saved_versions[key] == version:
+            return
+    path = _path(key)
+    entry = {"key": repr(key), "version": version, "saved_at": datetime.datetime.now().replace(microsecond=0),
+             "value": value}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)  # Quien lea nunca ve un archivo a medio escribir
+    except OSError as e:
+        logger.warning(f"No se pudo guardar el último dato bueno de {key!r}: {e}")
+        return
+    with _saved_lock:
+        _saved_versions[key] = version
+
+
+def read(key):
+    """Último dato bueno guardado para `key` ({version, saved_at, value}) o None."""
+    try:
+        with open(_path(key), "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Último dato bueno ilegible para {key!r}: {e}")
+        return None
+
+
+def begin_run():
+    """Olvida los datos en caché servidos en la ejecución anterior de la página en este hilo."""
+    _stale.saved_at = []
+
+
+def stale_since():
+    """Fecha del dato en caché más antiguo servido en esta ejecución, o None si todo es fresco."""
+    saved_at = getattr(_stale, "saved_at", None)
+    return min(saved_at) if saved_at else None
+
+
+def _revalidate_loop():
+    global _revalidator
+    while True:
+        with _pending_lock:
+            if not _pending:
+                _revalidator = None
+                return
+            key, load = next(iter(_pending.items()))
+        wait = breaker.seconds_until_retry()
+        if wait > 0 or not breaker.allow():
+            time.sleep(min(max(wait, 1.0), 5.0))
+            continue
+        try:
+            version, value = load()
+        except Exception as e:
+            if is_connection_error(e):
+                breaker.record_failure(e)
+                continue
+            breaker.record_success()
+            logger.warning(f"Revalidación de {key!r} fallida: {e}")
+        else:
+            breaker.record_success()
+            save(key, version, value)
+        with _pending_lock:
+            _pending.pop(key, None)
+
+
+def _schedule_revalidation(key, load):
+    global _revalidator
+    with _pending_lock:
+        _pending[key] = load
+        if _revalidator is None:
+            _revalidator = threading.Thread(target=_revalidate_loop, name=REVALIDATE_THREAD_NAME, daemon=True)
+            _revalidator.start()
+
+
+def load_or_stale(key, load):
+    """
+    Devuelve el valor de `load()`, que debe devolver (versión, valor), y lo guarda
+    como último dato bueno de `key`. Si la base de datos no responde o el circuito
+    está abierto, devuelve el último valor guardado, lo anota para stale_since() y
+    programa su revalidación en segundo plano. Sin valor guardado lanza
+    DatabaseUnavailable. Los errores que no son de conexión se propagan.
+
+    `key` identifica la carga sin la versión de datos (tabla, filtros, año...).
+    `load` puede volver a llamarse desde el hilo de revalidación.
+    """
+    if not _enabled():
+        return load()[1]
+
+    error = None
+    if breaker.allow():
+        try:
+            version, value = load()
+        except Exception as e:
+            if not is_connection_error(e):
+                breaker.record_success()  # La base de datos respondió, aunque con un error
+                raise
+            breaker.record_failure(e)
+            error = e
+        else:
+            breaker.record_success()
+            save(key, version, value)
+            return value
+
+    entry = read(key)
+    if entry is None:
+        raise DatabaseUnavailable(f"La base de datos no responde y no hay datos guardados para {key!r}") from error
+    if getattr(_stale, "saved_at", None) is not None:
+        _stale.saved_at.append(entry["saved_at"])
+    _schedule_revalidation(key, load)
+    return entry["value"]
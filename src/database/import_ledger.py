@@ -0,0 +1,101 @@
+"""
+Registro de importaciones: qué archivo cargó cada tabla y con qué contenido.
+
+Cada importador anota al terminar (record_import) el hash SHA-256 de su CSV,
+las filas cargadas, la duración y la fecha en registro_importaciones.
+ejecutar_todas_las_importaciones.py consulta reload_reason() antes de cargar
+una tabla y omite las que siguen igual: mismo contenido del CSV y el mismo
+número de filas en la tabla que en la última carga. Así, refrescar los datos
+tras cambiar un solo CSV solo recarga esa tabla (y las que dependen de ella).
+"""
+import datetime
+import hashlib
+import os
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from src.config.logger_config import get_logger
+from .conexion import is_missing_table
+from .models import Registro_importaciones
+from .schema import has_table
+
+logger = get_logger(__name__)
+
+LEDGER_TABLE = Registro_importaciones.__tablename__
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Las importaciones en paralelo anotan su carga a la vez: se serializa la escritura
+_record_lock = threading.Lock()
+
+
+def file_hash(path):
+    """Hash SHA-256 (hexadecimal) del contenido de `path`."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_import(engine, table_name):
+    """Última carga registrada de `table_name` ({archivo, hash, filas, segundos, cargado}) o None."""
+    try:
+        with engine.connect() as connection:
+            row = connection.execute(text(
+                f"SELECT ARCHIVO, HASH, FILAS, SEGUNDOS, CARGADO FROM {LEDGER_TABLE} WHERE TABLA = :tabla"
+            ), {"tabla": table_name}).first()
+    except ProgrammingError as e:
+        if not is_missing_table(e):
+            raise
+        return None
+    if row is None:
+        return None
+    return {"archivo": row[0], "hash": row[1], "filas": row[2], "segundos": row[3], "cargado": row[4]}
+
+
+def reload_reason(engine, table_name, path):
+    """
+    Motivo para volver a cargar `table_name` desde `path`, o None si la última
+    carga registrada corresponde al mismo contenido y la tabla conserva sus filas.
+    """
+    if not os.path.exists(path):
+        return "no se encontró el CSV"  # El importador informará del error
+    entry = get_import(engine, table_name)
+    if entry is None:
+        return "sin carga registrada"
+    if entry["hash"] != file_hash(path):
+        return "el CSV cambió"
+    if not has_table(engine, table_name):
+        return "la tabla no existe"
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+    if rows != entry["filas"]:
+        return f"la tabla tiene {rows} filas y la última carga dejó {entry['filas']}"
+    return None
+
+
+def record_import(engine, table_name, path, rows, seconds):
+    """Anota la carga de `table_name` desde `path` con `rows` filas en `seconds` segundos."""
+    params = {
+        "tabla": table_name,
+        "archivo": os.path.basename(path),
+        "hash": file_hash(path),
+        "filas": rows,
+        "segundos": round(seconds, 3),
+        "cargado": datetime.datetime.now().replace(microsecond=0),
+    }
+    with _record_lock:
+        Registro_importaciones.__table__.create(engine, checkfirst=True)
+        with engine.begin() as connection:
+            result = connection.execute(text(
+                f"UPDATE {LEDGER_TABLE} SET ARCHIVO = :archivo, HASH = :hash, FILAS = :filas, "
+                "SEGUNDOS = :segundos, CARGADO = :cargado WHERE TABLA = :tabla"
+            ), params)
+            if result.rowcount == 0:
+                connection.execute(text(
+                    f"INSERT INTO {LEDGER_TABLE} (TABLA, ARCHIVO, HASH, FILAS, SEGUNDOS, CARGADO) "
+                    "VALUES (:tabla, :archivo, :hash, :filas, :segundos, :cargado)"
+                ), params)
+    logger.info(f"Importación registrada: {table_name} <- {params['archivo']} ({rows} filas)")
@@ -0,0 +1,218 @@
+"""
+Revisión de índices de las consultas de los dashboards.
+
+Ejecuta EXPLAIN sobre cada consulta de dashboard_queries() y marca las
+que recorren una tabla completa (type = ALL) o un índice completo (type = index).
+Las consultas se deducen de la especificación PAGE de cada página de pages/,
+la misma que recibe render_page(), así que siguen a las páginas sin repetirlas.
+
+Uso:
+    python -m src.database.index_advisor                 # solo informe
+    python -m src.database.index_advisor --crear-indices # crea antes los índices declarados que falten
+
+Devuelve código de salida 1 si alguna consulta hace un recorrido completo.
+"""
+import argparse
+import ast
+import glob
+import os
+import sys
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import ProgrammingError
+
+from src.config.logger_config import get_logger
+from src.database.conexion import get_engine, is_missing_table
+from src.database.query_builder import EXCLUDED_VALUES, aggregate_statement, distinct_statement
+from src.database.models import Base
+
+logger = get_logger(__name__)
+
+# Tipos de acceso de EXPLAIN que implican leer la tabla o el índice entero
+FULL_SCAN_TYPES = {
+    'ALL': "recorrido completo de la tabla",
+    'index': "recorrido completo del índice",
+}
+
+PAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'pages'))
+
+
+def page_specs(pages_dir=PAGES_DIR):
+    """
+    Lista (página, data, sede_filter) con las claves de consulta del PAGE de cada
+    página de `pages_dir`. Se leen del código sin ejecutar la página.
+    """
+    specs = []
+    paths = glob.glob(os.path.join(pages_dir, '*.py'))
+    for path in sorted(paths, key=lambda path: int(os.path.basename(path).split('p-')[0])):
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == "PAGE" for t in node.targets):
+                spec = {key.value: value for key, value in zip(node.value.keys, node.value.values)}
+                sede_filter = ast.literal_eval(spec["sede_filter"]) if "sede_filter" in spec else False
+                specs.append((os.path.basename(path).split('-')[0], ast.literal_eval(spec["data"]), sede_filter))
+    return specs
+
+
+def _spec_queries(data, sede_filter):
+    """Consultas (descripción, tabla, sentencia) que render_page() lanza para la clave `data`."""
+    table_name = data["table"]
+    dimensions = tuple(data["dimensions"])
+    queries = [(f"años de {table_name}", table_name, distinct_statement(table_name, "FECHA", descending=True))]
+    if sede_filter:
+        queries.append((f"sedes nodales de {table_name}", table_name,
+                        distinct_statement(table_name, "SEDE_NODAL", filters=("FECHA",))))
+    if "stages" in data:
+        # Con DATA_SOURCE="sql" y sin Resumen_agregados construido, las etapas se agrupan sobre la tabla
+        queries.append((f"etapas de {table_name} por {', '.join(dimensions)}", table_name,
+                        aggregate_statement(table_name, ("ETAPA",) + dimensions, filters=("FECHA",),
+                                            exclude_values=None)))
+        return queries
+
+    filters = ("FECHA", "SEDE_NODAL") if sede_filter else ("FECHA",)
+    measure, how = data.get("measure", "MATRICULADOS"), data.get("how", "sum")
+    totals = () if data.get("total_from_data") else data.get("totals") or ({"measure": measure, "how": how},)
+    for name in filter(None, (data.get("previous_table"), table_name)):
+        if name != table_name:
+            queries.append((f"años de {name}", name, distinct_statement(name, "FECHA", descending=True)))
+        queries.append((f"{name} por {', '.join(dimensions)}", name,
+                        aggregate_statement(name, dimensions, measure, how, filters,
+                                            tuple(data.get("exclude_values", EXCLUDED_VALUES)),
+                                            tuple(data.get("order_by", ())))))
+        for total in totals:
+            total_measure, total_how = total.get("measure", measure), total.get("how", how)
+            queries.append((f"total {total_how}({total_measure}) de {name}", name,
+                            aggregate_statement(name, (), total_measure, total_how, filters, None)))
+    return queries
+
+
+def dashboard_queries():
+    """Lista (nombre, tabla, sentencia) de todas las consultas que lanzan los dashboards, sin repetir."""
+    queries = {}
+    for page, data, sede_filter in page_specs():
+        for description, table_name, statement in _spec_queries(data, sede_filter):
+            key = (table_name, str(statement))
+            queries.setdefault(key, [description, table_name, statement, []])[3].append(page)
+    return [(f"{'/'.join(pages)} {description}", table_name, statement)
+            for description, table_name, statement, pages in queries.values()]
+
+
+def _sample_params(connection, table_name):
+    """Parámetros realistas para EXPLAIN: el último año y la primera sede nodal de la tabla."""
+    year = connection.execute(text(f"SELECT MAX(FECHA) FROM {table_name}")).scalar() or 0
+    params = {'FECHA': year, 'SEDE_NODAL': ''}
+    if 'SEDE_NODAL' in Base.metadata.tables[table_name].columns:
+        sede = connection.execute(
+            text(f"SELECT MIN(SEDE_NODAL) FROM {table_name} WHERE FECHA = :year"), {'year': year}
+        ).scalar()
+        params['SEDE_NODAL'] = sede or ''
+    return params
+
+
+def render_sql(statement, params, dialect):
+    """SQL de `statement` con los parámetros escritos como literales, para EXPLAIN."""
+    names = {bind.key for bind in statement.compile().binds.values()}
+    bound = statement.params(**{name: value for name, value in params.items() if name in names})
+    return str(bound.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def explain_query(connection, statement, params):
+    """
+    Ejecuta EXPLAIN sobre `statement` y devuelve una fila por tabla del plan con las
+    claves 'table', 'type', 'key', 'rows', 'extra' y 'full_scan' (motivo o None).
+    """
+    sql = render_sql(statement, params, connection.dialect)
+    result = connection.exec_driver_sql(f"EXPLAIN {sql}")
+    columns = list(result.keys())
+    plan = []
+    for row in result.fetchall():
+        entry = dict(zip(columns, row))
+        access_type = entry.get('type')
+        plan.append({
+            'table': entry.get('table'),
+            'type': access_type,
+            'key': entry.get('key'),
+            'rows': entry.get('rows'),
+            'extra': entry.get('Extra'),
+            'full_scan': FULL_SCAN_TYPES.get(access_type),
+        })
+    return plan
+
+
+def create_missing_indexes(engine):
+    """Crea en las tablas existentes los índices declarados en models.py que aún no tengan."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+                created.append(index.name)
+                logger.info(f"Índice {index.name} creado en {table.name}")
+    return created
+
+
+def run_advisor(engine):
+    """
+    Revisa todas las consultas de los dashboards e imprime su plan.
+    Devuelve la lista de (nombre, motivo) de las consultas con recorridos completos.
+    """
+    flagged = []
+    with engine.connect() as connection:
+        for name, table_name, statement in dashboard_queries():
+            try:
+                params = _sample_params(connection, table_name)
+                plan = explain_query(connection, statement, params)
+            except ProgrammingError as e:
+                if not is_missing_table(e):
+                    raise
+                print(f"   - {name}: la tabla {table_name} no existe")
+                continue
+
+            reasons = [f"{step['table']}: {step['full_scan']}" for step in plan if step['full_scan']]
+            status = "✗" if reasons else "✓"
+            print(f"   {status} {name}")
+            for step in plan:
+                print(f"      type={step['type']} key={step['key']} rows={step['rows']} extra={step['extra']}")
+            if reasons:
+                flagged.append((name, "; ".join(reasons)))
+    return flagged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN de las consultas de los dashboards")
+    parser.add_argument('--crear-indices', action='store_true',
+                        help="crear antes los índices declarados en models.py que falten")
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    try:
+        if args.crear_indices:
+            created = create_missing_indexes(engine)
+            print(f"\n🔧 Índices creados: {len(created)}")
+            for index_name in created:
+                print(f"   • {index_name}")
+
+        print(f"\n🔍 Planes de ejecución de las consultas de los dashboards:")
+        flagged = run_advisor(engine)
+
+        print("\n" + "=" * 70)
+        if flagged:
+            print(f"⚠️ {len(flagged)} consulta(s) con recorridos completos:")
+            for name, reason in flagged:
+                print(f"   • {name} ({reason})")
+        else:
+            print("✅ Ninguna consulta recorre tablas completas")
+        print("=" * 70)
+        return 1 if flagged else 0
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Cargadores de datos compartidos por los dashboards.
+"""
+import pandas as pd
+
+from .query_builder import EXCLUDED_VALUES, aggregate, data_source
+from . import aggregates
+
+
+def _fetch_stage_groups(engine, table_name, year, dimensions):
+    """
+    Devuelve SUM(MATRICULADOS) agrupado por ETAPA y `dimensions` para un año.
+
+    Sigue la misma regla que el resto de agregaciones: con DATA_SOURCE="snapshot"
+    se agrupa la instantánea en memoria de la tabla; con "sql" responde el
+    servidor, leyendo Resumen_agregados (que cada importación recalcula) si la
+    combinación está registrada y su año ya está construido, y con un GROUP BY
+    sobre la tabla en otro caso.
+    """
+    if data_source() == "sql" and aggregates.is_registered(table_name, dimensions):
+        df = aggregates.load_aggregate_groups(engine, table_name, year, dimensions)
+        if df is not None:
+            return df
+    # Sin excluir nulos ni vacíos: el total de cada etapa es la suma de todos sus grupos
+    return aggregate(engine, table_name, ["ETAPA"] + dimensions, filters={"FECHA": year}, exclude_values=None)
+
+
+def load_stage_breakdown(engine, table_name, year, dimensions, distinct_columns=(),
+                         stages=(1, 2), exclude_values=EXCLUDED_VALUES, sort_by_count=False):
+    """
+    Carga en una sola agregación el desglose por `dimensions` de todas las etapas de un año.
+
+    Se agrupa por ETAPA y por todas las dimensiones sin filtrarlas, de modo que el
+    total de cada etapa es la suma de sus grupos y los conteos distintos salen de
+    los mismos grupos; el filtrado de valores no informados se hace en pandas.
+
+    Devuelve un diccionario {etapa: (df, total_matriculados, conteos_distintos)} con
+    una entrada para cada etapa de `stages`, aunque no tenga datos. `df` tiene las
+    columnas `dimensions` + 'cantidad' y `conteos_distintos` es {columna: n} para
+    cada columna de `distinct_columns` (sin contar nulos ni vacíos).
+    """
+    dimensions = list(dimensions)
+    df_all = _fetch_stage_groups(engine, table_name, year, dimensions)
+
+    valid = pd.Series(True, index=df_all.index)
+    for dim in dimensions:
+        valid &= df_all[dim].notna() & ~df_all[dim].isin(exclude_values)
+
+    sort_columns = ['cantidad'] if sort_by_count else dimensions
+    results = {}
+    for stage in stages:
+        in_stage = (df_all['ETAPA'] == int(stage)).fillna(False)
+        df_stage = df_all[in_stage]
+
+        df = (df_all[in_stage & valid]
+              .drop(columns='ETAPA')
+              .sort_values(sort_columns, ascending=not sort_by_count)
+              .reset_index(drop=True))
+        total = int(df_stage['cantidad'].sum())
+        distinct_counts = {
+            col: int(df_stage.loc[df_stage[col].notna() & (df_stage[col] != ''), col].nunique())
+            for col in distinct_columns
+        }
+        results[stage] = (df, total, distinct_counts)
+    return results
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, Index, DateTime, Float
 from sqlalchemy.ext.declarative import declarative_base
 
 
@@ -6,6 +6,10 @@ Base = declarative_base()
 
 class Docentes(Base):
     __tablename__ = 'Docentes'
+    __table_args__ = (
+        Index('ix_Docentes_fecha_institucion', 'FECHA', 'INSTITUCION_EDUCATIVA'),
+        Index('ix_Docentes_fecha_nivel', 'FECHA', 'NIVEL'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     INSTITUCION_EDUCATIVA = Column(String(255))
@@ -15,6 +19,9 @@ class Docentes(Base):
     
 class Estudiantes_2016_2019(Base):
     __tablename__ = 'Estudiantes_2016_2019'
+    __table_args__ = (
+        Index('ix_Estudiantes_2016_2019_fecha_etapa_sede', 'FECHA', 'ETAPA', 'SEDE_NODAL'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE_NODAL = Column(String(255))
@@ -27,6 +34,9 @@ class Estudiantes_2016_2019(Base):
 
 class Escuela_nueva(Base):
     __tablename__ = 'Escuela_nueva'
+    __table_args__ = (
+        Index('ix_Escuela_nueva_fecha_institucion', 'FECHA', 'INSTITUCION_EDUCATIVA'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE = Column(String(255))
@@ -38,6 +48,10 @@ class Escuela_nueva(Base):
 
 class Estudiantes_Colombo(Base):
     __tablename__ = 'Estudiantes_Colombo'
+    __table_args__ = (
+        Index('ix_Estudiantes_Colombo_fecha_institucion', 'FECHA', 'INSTITUCION_EDUCATIVA'),
+        Index('ix_Estudiantes_Colombo_fecha_nivel', 'FECHA', 'NIVEL'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     INSTITUCION_EDUCATIVA = Column(String(255))
@@ -45,6 +59,9 @@ class Estudiantes_Colombo(Base):
 
 class Estudiantes_2021_2025(Base):
     __tablename__ = 'Estudiantes_2021_2025'
+    __table_args__ = (
+        Index('ix_Estudiantes_2021_2025_fecha_etapa_sede', 'FECHA', 'ETAPA', 'SEDE_NODAL'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE_NODAL = Column(String(255))
@@ -57,6 +74,9 @@ class Estudiantes_2021_2025(Base):
 
 class Instituciones_2021_2025(Base):
     __tablename__ = 'Instituciones_2021_2025'
+    __table_args__ = (
+        Index('ix_Instituciones_2021_2025_fecha_etapa_institucion', 'FECHA', 'ETAPA', 'INSTITUCION_EDUCATIVA'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     ETAPA = Column(Integer)
@@ -65,6 +85,9 @@ class Instituciones_2021_2025(Base):
     
 class Grados_2021_2025(Base):
     __tablename__ = 'Grados_2021_2025'
+    __table_args__ = (
+        Index('ix_Grados_2021_2025_fecha_etapa_grado', 'FECHA', 'ETAPA', 'GRADO'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     ETAPA = Column(Integer)
@@ -73,6 +96,9 @@ class Grados_2021_2025(Base):
 
 class Estudiantes_intensificacion(Base):
     __tablename__ = 'Estudiantes_intensificacion'
+    __table_args__ = (
+        Index('ix_Estudiantes_intensificacion_fecha_etapa_sede', 'FECHA', 'ETAPA', 'SEDE_NODAL'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE_NODAL = Column(String(255))
@@ -85,6 +111,9 @@ class Estudiantes_intensificacion(Base):
   
 class Grados_intensificacion(Base):
     __tablename__ = 'Grados_intensificacion'
+    __table_args__ = (
+        Index('ix_Grados_intensificacion_fecha_sede_grado', 'FECHA', 'SEDE_NODAL', 'GRADO'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE_NODAL = Column(String(255))
@@ -93,6 +122,9 @@ class Grados_intensificacion(Base):
 
 class Frances_intensificacion(Base):
     __tablename__ = 'Frances_intensificacion'
+    __table_args__ = (
+        Index('ix_Frances_intensificacion_fecha_sede', 'FECHA', 'SEDE_NODAL'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE_NODAL = Column(String(255))
@@ -105,6 +137,9 @@ class Frances_intensificacion(Base):
 
 class Grados_intensificacion_Frances(Base):
     __tablename__ = 'Grados_intensificacion_Frances'
+    __table_args__ = (
+        Index('ix_Grados_intensificacion_Frances_fecha_sede_grado', 'FECHA', 'SEDE_NODAL', 'GRADO'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE_NODAL = Column(String(255))
@@ -113,6 +148,9 @@ class Grados_intensificacion_Frances(Base):
 
 class Frances_intensificacion_horas(Base):
     __tablename__ = 'Frances_intensificacion_horas'
+    __table_args__ = (
+        Index('ix_Frances_intensificacion_horas_fecha_sede', 'FECHA', 'SEDE_NODAL'),
+    )
     ID = Column(Integer, primary_key=True, autoincrement=True)
     FECHA = Column(Integer)
     SEDE_NODAL = Column(String(255))
@@ -123,4 +161,43 @@ class Frances_intensificacion_horas(Base):
     HORAS = Column(Integer)
     DIA = Column(String(100))
     JORNADA = Column(String(100))
-    MATRICULADOS = Column(Integer)
\ No newline at end of file
+    MATRICULADOS = Column(Integer)
+
+class Resumen_agregados(Base):
+    """
+    Agregados precalculados por las importaciones: SUM(MATRICULADOS) y COUNT(ID)
+    de cada tabla (PROGRAMA) por año, etapa y combinación de dimensiones.
+    VALOR guarda los valores de las dimensiones como un arreglo JSON.
+    """
+    __tablename__ = 'Resumen_agregados'
+    PROGRAMA = Column(String(64), primary_key=True)
+    DIMENSION = Column(String(100), primary_key=True)
+    FECHA = Column(Integer, primary_key=True, autoincrement=False)
+    ETAPA = Column(Integer, primary_key=True, autoincrement=False)
+    VALOR = Column(String(500), primary_key=True)
+    MATRICULADOS = Column(Integer)
+    REGISTROS = Column(Integer)
+
+class Data_version(Base):
+    """
+    Versión de los datos de cada tabla. Las importaciones la incrementan al
+    terminar y los dashboards la usan como parte de la clave de su caché.
+    """
+    __tablename__ = 'data_version'
+    TABLA = Column(String(64), primary_key=True)
+    VERSION = Column(Integer, nullable=False, default=0)
+    ACTUALIZADO = Column(DateTime)
+
+class Registro_importaciones(Base):
+    """
+    Última carga de cada tabla: archivo de origen, hash SHA-256 de su contenido,
+    filas cargadas, duración y fecha. ejecutar_todas_las_importaciones.py lo
+    consulta para no recargar las tablas cuyo CSV no cambió.
+    """
+    __tablename__ = 'registro_importaciones'
+    TABLA = Column(String(64), primary_key=True)
+    ARCHIVO = Column(String(255))
+    HASH = Column(String(64), nullable=False)
+    FILAS = Column(Integer)
+    SEGUNDOS = Column(Float)
+    CARGADO = Column(DateTime)
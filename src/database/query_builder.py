@@ -0,0 +1,299 @@
+"""
+Constructor declarativo de las consultas de agregación de los dashboards.
+
+Las páginas describen lo que necesitan (tabla, dimensiones, medida y filtros) y
+este módulo genera la consulta parametrizada, la guarda ya construida para las
+siguientes llamadas y la ejecuta sobre el origen configurado en DATA_SOURCE
+(instantánea en memoria o MySQL). Al pasar todas por aquí, cada consulta queda
+medida en get_query_stats() y cualquier optimización se aplica a todos los
+dashboards a la vez.
+
+    aggregate(engine, "Docentes", ["NIVEL"], measure="ID", how="count",
+              filters={"FECHA": 2025}, order_by=("-cantidad",))
+
+equivale a
+
+    SELECT NIVEL, COUNT(ID) AS cantidad FROM Docentes
+    WHERE FECHA = :FECHA AND NIVEL IS NOT NULL AND NIVEL NOT IN ('', 'SIN INFORMACION')
+    GROUP BY NIVEL ORDER BY cantidad DESC
+
+Con top_n=10 el origen devuelve solo los 10 grupos mayores y una fila más con la
+suma del resto (other_label), en lugar de todos los grupos: en MySQL lo calcula
+la propia consulta con ROW_NUMBER(), así que salen como mucho 11 filas.
+"""
+import functools
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import String, bindparam, case, func, literal, literal_column, select
+from sqlalchemy.exc import ProgrammingError
+
+from .conexion import get_setting, is_missing_table
+from .models import Base
+from . import snapshot
+
+# Valores que los dashboards no muestran como categoría
+EXCLUDED_VALUES = ('', 'SIN INFORMACION')
+
+# Medidas admitidas: suma, conteo de no nulos y conteo de valores distintos
+MEASURES = ("sum", "count", "count_distinct")
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def data_source():
+    """
+    Origen de las agregaciones según DATA_SOURCE: "snapshot" (por defecto, instantáneas
+    en memoria) o "sql" (consultas a MySQL). Rige para todas las lecturas; con "sql"
+    los desgloses por etapa usan Resumen_agregados si está construido
+    (ver loaders.load_stage_breakdown()).
+    """
+    return get_setting("DATA_SOURCE", "snapshot")
+
+
+def _is_text(column):
+    return isinstance(column.type, String)
+
+
+def _order_clauses(columns, order_by):
+    """Convierte ("-cantidad", "GRADO") en cláusulas ORDER BY; el prefijo '-' indica descendente."""
+    clauses = []
+    for name in order_by:
+        descending = name.startswith('-')
+        column = columns[name.lstrip('-')]
+        clauses.append(column.desc() if descending else column.asc())
+    return clauses
+
+
+def _top_n_statement(grouped, dimension, measure_sql, top_n, other_label):
+    """
+    Envuelve la agrupación `grouped` para quedarse con sus `top_n` grupos de mayor
+    cantidad y uno más, `other_label`, con la suma de los demás:
+
+        SELECT CASE WHEN MIN(posicion) <= N THEN MIN(dim) ELSE :otros END, SUM(cantidad)
+        FROM (SELECT dim, cantidad, ROW_NUMBER() OVER (ORDER BY cantidad DESC, dim) AS posicion ...)
+        GROUP BY CASE WHEN posicion <= N THEN posicion ELSE N + 1 END
+    """
+    position = func.row_number().over(order_by=(measure_sql.desc(), dimension.asc())).label("posicion")
+    groups = grouped.add_columns(position).subquery("grupos")
+    # Enteros en línea: la misma expresión aparece en SELECT, GROUP BY y ORDER BY
+    limit, rest = literal_column(str(int(top_n))), literal_column(str(int(top_n) + 1))
+    bucket = case((groups.c.posicion <= limit, groups.c.posicion), else_=rest)
+    value = case((func.min(groups.c.posicion) <= limit, func.min(groups.c[dimension.name])),
+                 else_=literal(other_label))
+    return (select(value.label(dimension.name), func.sum(groups.c.cantidad).label("cantidad"))
+            .select_from(groups)
+            .group_by(bucket)
+            .order_by(bucket))
+
+
+@functools.lru_cache(maxsize=256)
+def aggregate_statement(table_name, dimensions=(), measure="MATRICULADOS", how="sum",
+                        filters=(), exclude_values=EXCLUDED_VALUES, order_by=(), top_n=None,
+                        other_label="Otros"):
+    """
+    Construye (una sola vez por combinación de argumentos) la consulta
+    SELECT <dimensions>, <medida> AS cantidad ... GROUP BY <dimensions>.
+
+    `filters` son nombres de columna que se comparan por igualdad con un parámetro
+    del mismo nombre. Las dimensiones de texto excluyen NULL y `exclude_values`;
+    con exclude_values=None se conservan todos los grupos, incluidos los nulos.
+
+    Con `top_n` (una sola dimensión) devuelve los `top_n` grupos mayores y, si hay
+    más, una fila `other_label` con la suma del resto, de mayor a menor; en ese
+    caso se ignora `order_by`.
+    """
+    if how not in MEASURES:
+        raise ValueError(f"Medida no soportada: {how}")
+    table = Base.metadata.tables[table_name]
+    dimension_columns = [table.c[name] for name in dimensions]
+    measure_column = table.c[measure]
+    if how == "sum":
+        measure_sql = func.coalesce(func.sum(measure_column), 0)
+    elif how == "count":
+        measure_sql = func.count(measure_column)
+    else:
+        measure_sql = func.count(measure_column.distinct())
+    cantidad = measure_sql.label("cantidad")
+
+    statement = select(*dimension_columns, cantidad).select_from(table)
+    for name in filters:
+        statement = statement.where(table.c[name] == bindparam(name))
+    for column in dimension_columns:
+        if _is_text(column) and exclude_values is not None:
+            statement = statement.where(column.is_not(None))
+            if exclude_values:
+                statement = statement.where(column.not_in(list(exclude_values)))
+    if dimension_columns:
+        statement = statement.group_by(*dimension_columns)
+
+    if top_n is not None:
+        if len(dimension_columns) != 1:
+            raise ValueError("top_n requiere exactamente una dimensión")
+        return _top_n_statement(statement, dimension_columns[0], measure_sql, top_n, other_label)
+
+    columns = {column.name: column for column in dimension_columns}
+    columns["cantidad"] = cantidad
+    return statement.order_by(*_order_clauses(columns, order_by))
+
+
+@functools.lru_cache(maxsize=128)
+def distinct_statement(table_name, column_name, filters=(), exclude_values=('',), descending=False):
+    """SELECT DISTINCT <column> ... WHERE <column> IS NOT NULL ORDER BY <column>."""
+    table = Base.metadata.tables[table_name]
+    column = table.c[column_name]
+    statement = select(column).distinct().where(column.is_not(None))
+    for name in filters:
+        statement = statement.where(table.c[name] == bindparam(name))
+    if _is_text(column) and exclude_values:
+        statement = statement.where(column.not_in(list(exclude_values)))
+    return statement.order_by(column.desc() if descending else column.asc())
+
+
+def _record(key, source, seconds, rows):
+    with _stats_lock:
+        entry = _stats.setdefault(key, {"calls": 0, "seconds": 0.0, "rows": 0, "sources": set()})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["rows"] += rows
+        entry["sources"].add(source)
+
+
+def get_query_stats():
+    """
+    Devuelve una lista de diccionarios con llamadas, tiempo total y filas devueltas
+    de cada consulta ejecutada por el constructor en este proceso, la más costosa primero.
+    """
+    with _stats_lock:
+        stats = [
+            {"query": key, "calls": entry["calls"], "seconds": round(entry["seconds"], 4),
+             "rows": entry["rows"], "sources": sorted(entry["sources"])}
+            for key, entry in _stats.items()
+        ]
+    return sorted(stats, key=lambda entry: entry["seconds"], reverse=True)
+
+
+def _execute(engine, statement, params):
+    try:
+        with engine.connect() as connection:
+            return connection.execute(statement, params).fetchall()
+    except ProgrammingError as e:
+        if not is_missing_table(e):
+            raise
+        return []
+
+
+def _sort_frame(df, order_by):
+    if not order_by or df.empty:
+        return df.reset_index(drop=True)
+    columns = [name.lstrip('-') for name in order_by]
+    ascending = [not name.startswith('-') for name in order_by]
+    return df.sort_values(columns, ascending=ascending, kind="stable").reset_index(drop=True)
+
+
+def top_n_with_remainder(df, dimension, top_n, other_label="Otros"):
+    """
+    Los `top_n` grupos de mayor 'cantidad' de `df` y, si hay más, una fila
+    `other_label` con la suma del resto; mismo resultado que la consulta con top_n,
+    para el origen en memoria.
+    """
+    ranked = df.sort_values(["cantidad", dimension], ascending=[False, True], kind="stable")
+    if len(ranked) <= top_n:
+        return ranked.reset_index(drop=True)
+    top = ranked.head(top_n)
+    other = pd.DataFrame({dimension: [other_label], "cantidad": [ranked["cantidad"].iloc[top_n:].sum()]})
+    return pd.concat([top[[dimension, "cantidad"]].astype({dimension: object}), other], ignore_index=True)
+
+
+def _aggregate_snapshot(engine, table_name, dimensions, measure, how, filters, exclude_values, order_by):
+    """Misma agregación que aggregate_statement() calculada sobre la instantánea en memoria."""
+    table = Base.metadata.tables[table_name]
+    frame = snapshot.get_table(engine, table_name)
+    if how == "count_distinct":
+        values = frame.loc[snapshot.filter_mask(frame, filters), measure].dropna()
+        return pd.DataFrame({"cantidad": [int(values.nunique())]})
+
+    df = snapshot.aggregate(frame, dimensions, measure=measure, filters=filters, how=how)
+    valid = np.ones(len(df), dtype=bool)
+    for name in dimensions:
+        if _is_text(table.c[name]) and exclude_values is not None:
+            valid &= (df[name].notna() & ~df[name].isin(exclude_values)).to_numpy(dtype=bool)
+    return _sort_frame(df[valid], order_by)
+
+
+def _use_snapshot(table_name, dimensions, how):
+    if data_source() != "snapshot" or table_name not in snapshot.TABLES:
+        return False
+    # El conteo de distintos en memoria solo se implementa sin dimensiones
+    return how != "count_distinct" or not dimensions
+
+
+def aggregate(engine, table_name, dimensions=(), measure="MATRICULADOS", how="sum", filters=None,
+              exclude_values=EXCLUDED_VALUES, order_by=(), top_n=None, other_label="Otros"):
+    """
+    Agrega `measure` de `table_name` por `dimensions` y devuelve un DataFrame con
+    las columnas `dimensions` + 'cantidad'. Sin dimensiones devuelve una sola fila
+    con el total. `filters` es un diccionario {columna: valor} de igualdades.
+    Con `top_n` devuelve como mucho top_n + 1 filas (ver aggregate_statement()).
+    Una tabla inexistente devuelve un DataFrame vacío.
+    """
+    dimensions = tuple(dimensions)
+    filters = dict(filters or {})
+    exclude_values = None if exclude_values is None else tuple(exclude_values)
+    order_by = tuple(order_by)
+
+    if top_n is not None and len(dimensions) != 1:
+        raise ValueError("top_n requiere exactamente una dimensión")
+    key = f"{table_name}: {how}({measure}) por {', '.join(dimensions) or '-'} donde {', '.join(filters) or '-'}"
+    if top_n is not None:
+        key += f" (top {top_n})"
+
+    start = time.perf_counter()
+    if _use_snapshot(table_name, dimensions, how):
+        source = "snapshot"
+        df = _aggregate_snapshot(engine, table_name, dimensions, measure, how, filters, exclude_values, order_by)
+        if top_n is not None:
+            df = top_n_with_remainder(df, dimensions[0], top_n, other_label)
+    else:
+        source = "sql"
+        statement = aggregate_statement(table_name, dimensions, measure, how,
+                                        tuple(sorted(filters)), exclude_values, order_by, top_n, other_label)
+        rows = _execute(engine, statement, filters)
+        df = pd.DataFrame(rows, columns=list(dimensions) + ["cantidad"])
+        df["cantidad"] = pd.to_numeric(df["cantidad"])
+    _record(key, source, time.perf_counter() - start, len(df))
+    return df
+
+
+def aggregate_total(engine, table_name, measure="MATRICULADOS", how="sum", filters=None):
+    """Total de `measure` (un solo número) con los mismos filtros que aggregate()."""
+    df = aggregate(engine, table_name, (), measure=measure, how=how, filters=filters, exclude_values=None)
+    if df.empty or pd.isna(df["cantidad"].iloc[0]):
+        return 0
+    return int(df["cantidad"].iloc[0])
+
+
+def distinct_values(engine, table_name, column_name, filters=None, exclude_values=('',), descending=False):
+    """Lista ordenada de los valores distintos no nulos de `column_name`."""
+    filters = dict(filters or {})
+    exclude_values = tuple(exclude_values)
+    key = f"{table_name}: DISTINCT {column_name} donde {', '.join(filters) or '-'}"
+
+    start = time.perf_counter()
+    if data_source() == "snapshot" and table_name in snapshot.TABLES:
+        source = "snapshot"
+        frame = snapshot.get_table(engine, table_name)
+        series = frame.loc[snapshot.filter_mask(frame, filters), column_name].dropna()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(object)
+        values = [value for value in series.unique().tolist() if value not in exclude_values]
+        values = sorted(values, reverse=descending)
+    else:
+        source = "sql"
+        statement = distinct_statement(table_name, column_name, tuple(sorted(filters)), exclude_values, descending)
+        values = [row[0] for row in _execute(engine, statement, filters)]
+    _record(key, source, time.perf_counter() - start, len(values))
+    return values
@@ -0,0 +1,79 @@
+"""
+Registro en memoria del esquema de la base de datos.
+
+Las tablas existentes y sus columnas se reflejan una sola vez por proceso (una
+consulta a information_schema para todas las tablas) y se reutilizan en cada
+comprobación de existencia, en lugar de llamar a dialect.has_table() en cada carga.
+
+El esquema reflejado se asocia a las versiones de data_version: crear_tablas.py
+y las importaciones las incrementan en la propia base de datos, así que
+cualquier proceso que la use, en este equipo o en otro, vuelve a reflejar el
+esquema en cuanto ve versiones nuevas. La lectura de versiones es la misma que
+ya hacen los dashboards y se reutiliza durante DATA_VERSION_CHECK_SECONDS.
+"""
+import threading
+
+from sqlalchemy import inspect
+
+from src.config.logger_config import get_logger
+from .data_version import get_data_versions
+
+logger = get_logger(__name__)
+
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def _read_stamp(engine):
+    """Marca del esquema: las versiones de datos de todas las tablas."""
+    return tuple(sorted(get_data_versions(engine).items()))
+
+
+def _reflect(engine):
+    """Devuelve {tabla: (columnas, ...)} para todas las tablas de la base de datos."""
+    inspector = inspect(engine)
+    multi_columns = inspector.get_multi_columns()
+    return {
+        table_name: tuple(column['name'] for column in columns)
+        for (_, table_name), columns in multi_columns.items()
+    }
+
+
+def get_schema(engine):
+    """
+    Devuelve el esquema conocido del motor como {tabla: (columnas, ...)}.
+
+    Solo se refleja la primera vez y cuando cambia la versión de datos de alguna tabla.
+    """
+    key = str(engine.url)
+    stamp = _read_stamp(engine)
+    cached = _schemas.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with _schemas_lock:
+        cached = _schemas.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        schema = _reflect(engine)
+        _schemas[key] = (stamp, schema)
+        logger.info(f"Esquema reflejado: {len(schema)} tabla(s)")
+        return schema
+
+
+def has_table(engine, table_name):
+    """Indica si `table_name` existe, sin consultar la base de datos si el esquema ya es conocido."""
+    return table_name in get_schema(engine)
+
+
+def get_table_names(engine):
+    return sorted(get_schema(engine))
+
+
+def invalidate_schema():
+    """
+    Olvida el esquema de este proceso. Los demás procesos lo vuelven a reflejar
+    al ver las versiones que incrementa bump_data_version().
+    """
+    with _schemas_lock:
+        _schemas.clear()
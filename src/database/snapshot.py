@@ -0,0 +1,124 @@
+"""
+Instantáneas en memoria de las tablas del observatorio.
+
+Cada tabla de models.py se lee completa una sola vez por versión de datos y se
+guarda en st.cache_resource como un DataFrame compacto (texto como 'category',
+enteros como Int32). Los dashboards agrupan sobre esa copia en el propio proceso
+y MySQL solo se vuelve a leer cuando cambia la versión de la tabla en
+data_version, que cada importación incrementa al publicar sus datos.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sqlalchemy import Integer, String, text
+from sqlalchemy.exc import ProgrammingError
+
+from .conexion import is_missing_table
+from .data_version import get_data_versions
+from .models import Base
+
+# Tablas de hechos (las de resumen no tienen ID y no se guardan en memoria)
+TABLES = {table.name: table for table in Base.metadata.sorted_tables if 'ID' in table.columns}
+
+
+def _compact(df, table):
+    """Convierte las columnas de texto a 'category' y las enteras a Int32."""
+    for column in table.columns:
+        if column.name not in df.columns:
+            continue
+        if isinstance(column.type, String):
+            df[column.name] = df[column.name].astype('category')
+        elif isinstance(column.type, Integer):
+            df[column.name] = pd.to_numeric(df[column.name]).astype('Int32')
+    return df
+
+
+@st.cache_resource(max_entries=2 * len(TABLES), show_spinner=False)
+def _load_table(_engine, table_name, data_version):
+    table = TABLES[table_name]
+    try:
+        with _engine.connect() as connection:
+            result = connection.execute(text(f"SELECT * FROM {table_name}"))
+            df = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+    except ProgrammingError as e:
+        if not is_missing_table(e):
+            raise
+        df = pd.DataFrame(columns=[c.name for c in table.columns])
+    return _compact(df, table)
+
+
+def get_table(engine, table_name):
+    """
+    Devuelve la instantánea de `table_name` para su versión de datos actual
+    (ver data_version.get_data_versions()).
+
+    El DataFrame es compartido entre sesiones: quien lo use debe filtrar o copiar,
+    nunca modificarlo en el sitio.
+    """
+    return _load_table(engine, table_name, get_data_versions(engine).get(table_name))
+
+
+# Centinela para representar NULL en columnas enteras al agrupar con numpy
+_INT_NULL = np.iinfo(np.int64).min
+
+
+def _key_array(series):
+    """Representa una columna como enteros comparables: códigos de categoría o el propio valor."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int64)
+    return series.to_numpy(dtype=np.int64, na_value=_INT_NULL)
+
+
+def filter_mask(frame, filters):
+    """Máscara booleana de las filas que cumplen las igualdades {columna: valor} de `filters`."""
+    mask = np.ones(len(frame), dtype=bool)
+    for column, value in (filters or {}).items():
+        series = frame[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            code = categories.get_loc(value) if value in categories else -2
+            mask &= series.cat.codes.to_numpy() == code
+        else:
+            mask &= series.to_numpy(dtype=np.int64, na_value=_INT_NULL) == int(value)
+    return mask
+
+
+def _decode(series, keys):
+    """Convierte los códigos agrupados de vuelta a valores; NULL se devuelve como None/NA."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.to_numpy(dtype=object)
+        if not len(categories):
+            return np.full(len(keys), None, dtype=object)
+        return np.where(keys >= 0, categories[np.maximum(keys, 0)], None)
+    nulls = keys == _INT_NULL
+    return pd.arrays.IntegerArray(np.where(nulls, 0, keys).astype(np.int64), nulls)
+
+
+def aggregate(frame, dimensions, measure="MATRICULADOS", filters=None, how="sum"):
+    """
+    Equivalente en memoria de
+    SELECT <dimensions>, COALESCE(SUM(<measure>), 0) AS cantidad ... WHERE <filters> GROUP BY <dimensions>
+    (o COUNT(<measure>) con how="count").
+
+    `filters` es un diccionario {columna: valor} de igualdades. Los grupos con
+    valores nulos se conservan, como en SQL. Se agrupa con numpy sobre los códigos
+    de categoría, que para estas tablas es bastante más rápido que groupby.
+    """
+    dimensions = list(dimensions)
+    mask = filter_mask(frame, filters)
+    values = frame[measure]
+    if how == "count":
+        weights = values.notna().to_numpy(dtype=np.float64)[mask]
+    else:
+        weights = values.to_numpy(dtype=np.float64, na_value=0)[mask]
+
+    if not dimensions:
+        return pd.DataFrame({"cantidad": [int(round(weights.sum()))]})
+
+    keys = np.rec.fromarrays([_key_array(frame[dim])[mask] for dim in dimensions], names=dimensions)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inverse.ravel(), weights=weights, minlength=len(unique_keys))
+
+    result = pd.DataFrame({dim: _decode(frame[dim], unique_keys[dim]) for dim in dimensions})
+    result["cantidad"] = np.rint(totals).astype(np.int64)
+    return result
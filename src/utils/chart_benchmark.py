@@ -0,0 +1,179 @@
+"""
+Comparación del coste en el servidor de cada backend de gráficos.
+
+Dibuja los mismos gráficos de ejemplo con cada backend de charts.BACKENDS y mide
+el tiempo de CPU del proceso por gráfico y el tamaño de lo que se envía al
+navegador: la imagen PNG/SVG en matplotlib y la especificación Vega-Lite (JSON
+con los datos) en altair. La caché de gráficos no interviene, así que se mide
+siempre un render en frío.
+
+Con --barras mide cómo crece el render de barh_chart con el número de barras,
+comparando las etiquetas de valor de label_bars (ax.bar_label) con la anotación
+barra a barra que usaban antes las páginas.
+
+Uso:
+    python -m src.utils.chart_benchmark
+    python -m src.utils.chart_benchmark --repeticiones 20 --formato svg
+    python -m src.utils.chart_benchmark --barras 10 50 100 200 400
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utils.chart_cache import CHART_FORMATS, figure_to_bytes
+from src.utils.charts import BACKENDS
+from src.utils import charts_matplotlib
+
+DAYS = ['LUNES', 'MARTES', 'MIÉRCOLES', 'JUEVES', 'VIERNES', 'SÁBADO', 'DOMINGO']
+
+
+def _sample_charts():
+    """Lista (nombre, función, args, kwargs) con gráficos del tamaño de los dashboards."""
+    rng = np.random.default_rng(0)
+    sedes = pd.DataFrame({
+        'SEDE_NODAL': [f"SEDE NODAL {i}" for i in range(12)],
+        'cantidad': rng.integers(20, 400, 12),
+    }).sort_values('cantidad', ascending=False)
+    instituciones = pd.DataFrame({
+        'institucion': [f"INSTITUCIÓN EDUCATIVA {i}" for i in range(40)],
+        'cantidad': np.sort(rng.integers(5, 300, 40)),
+    })
+    jornadas = pd.DataFrame(
+        rng.integers(0, 150, (len(DAYS), 4)),
+        index=pd.Index(DAYS, name='DIA'),
+        columns=pd.Index(['MAÑANA', 'TARDE', 'NOCHE', 'ÚNICA'], name='JORNADA'),
+    )
+    niveles = pd.DataFrame(
+        rng.integers(0, 60, (11, 5)),
+        index=pd.Index([f"GRADO {i}" for i in range(1, 12)], name='GRADO'),
+        columns=pd.Index(['PRE A1', 'A1', 'A2', 'B1', 'B2'], name='NIVEL_MCER'),
+    )
+    return [
+        ("Barras", "bar_chart", (sedes, 'SEDE_NODAL', 'cantidad', 'Barras', 'Sede Nodal', 'Cantidad'), {}),
+        ("Barras horizontales", "barh_chart", (instituciones, 'institucion', 'cantidad', 'Barras', 'Cantidad'), {}),
+        ("Barras agrupadas", "grouped_bar_chart", (jornadas, 'Agrupadas', 'Día', 'Cantidad', 'Jornada'), {}),
+        ("Barras apiladas", "stacked_bar_chart", (niveles, 'Apiladas', 'Grado', 'Cantidad', 'Nivel MCER'), {}),
+        ("Torta", "pie_chart", (sedes, 'SEDE_NODAL', 'cantidad', 'Torta'), {}),
+        ("Dona", "pie_chart", (sedes.head(6), 'SEDE_NODAL', 'cantidad', 'Dona'), {'donut': True}),
+    ]
+
+
+def _render(backend, name, args, kwargs, fmt):
+    """Lo que hace el servidor con cada backend: la imagen o la especificación serializada."""
+    result = getattr(BACKENDS[backend], name)(*args, **kwargs)
+    if backend == "altair":
+        return result.to_json().encode('utf-8')
+    return figure_to_bytes(result, fmt)
+
+
+def benchmark(repetitions=10, fmt="png"):
+    """
+    Devuelve una lista de diccionarios con backend, gráfico, milisegundos de CPU
+    por render (mediana) y bytes enviados al navegador.
+    """
+    results = []
+    for label, name, args, kwargs in _sample_charts():
+        for backend in BACKENDS:
+            _render(backend, name, args, kwargs, fmt)  # Calentamiento (importaciones, fuentes)
+            timings = []
+            for _ in range(repetitions):
+                start = time.process_time()
+                payload = _render(backend, name, args, kwargs, fmt)
+                timings.append(time.process_time() - start)
+            results.append({
+                "backend": backend,
+                "chart": label,
+                "cpu_ms": float(np.median(timings)) * 1000,
+                "bytes": len(payload),
+            })
+    return results
+
+
+def _annotate_bars_loop(ax, bars, **text_kwargs):
+    """Anotación barra a barra (un ax.text por barra), como referencia para label_bars."""
+    offset = max(bars.datavalues.max(), 1) * 0.01 if len(bars) else 0
+    for bar in bars:
+        bar_width = bar.get_width()
+        ax.text(bar_width + offset, bar.get_y() + bar.get_height() / 2,
+                f'{int(bar_width):,}', ha='left', va='center', **text_kwargs)
+
+
+def _time_render(draw, args, fmt, repetitions):
+    """Mediana de CPU en milisegundos de dibujar y serializar draw(*args)."""
+    figure_to_bytes(draw(*args), fmt)  # Calentamiento
+    timings = []
+    for _ in range(repetitions):
+        start = time.process_time()
+        figure_to_bytes(draw(*args), fmt)
+        timings.append(time.process_time() - start)
+    return float(np.median(timings)) * 1000
+
+
+def bar_count_benchmark(sizes=(10, 50, 100, 200, 400), repetitions=5, fmt="png"):
+    """
+    Devuelve una lista de diccionarios con el número de barras y la CPU en
+    milisegundos de barh_chart con label_bars y con la anotación barra a barra.
+    """
+    rng = np.random.default_rng(0)
+    results = []
+    for n in sizes:
+        df = pd.DataFrame({
+            'institucion': [f"INSTITUCIÓN EDUCATIVA {i}" for i in range(n)],
+            'cantidad': np.sort(rng.integers(5, 300, n)),
+        })
+        args = (df, 'institucion', 'cantidad', 'Barras', 'Cantidad')
+        bar_label_ms = _time_render(charts_matplotlib.barh_chart, args, fmt, repetitions)
+
+        label_bars = charts_matplotlib.label_bars
+        charts_matplotlib.label_bars = _annotate_bars_loop
+        try:
+            loop_ms = _time_render(charts_matplotlib.barh_chart, args, fmt, repetitions)
+        finally:
+            charts_matplotlib.label_bars = label_bars
+
+        results.append({"bars": n, "bar_label_ms": bar_label_ms, "loop_ms": loop_ms})
+    return results
+
+
+def _print_bar_count(results, repetitions):
+    print(f"\n⏱️ CPU de barh_chart según el número de barras (mediana de {repetitions} renders):\n")
+    print(f"   {'Barras':>8}{'bar_label (ms)':>17}{'Barra a barra (ms)':>21}{'ms/barra':>11}")
+    for row in results:
+        per_bar = row['bar_label_ms'] / row['bars']
+        print(f"   {row['bars']:>8}{row['bar_label_ms']:>17.1f}{row['loop_ms']:>21.1f}{per_bar:>11.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CPU del servidor por gráfico con cada backend")
+    parser.add_argument('--repeticiones', type=int, default=10, help="renders por gráfico y backend")
+    parser.add_argument('--formato', choices=CHART_FORMATS, default="png", help="formato de imagen de matplotlib")
+    parser.add_argument('--barras', type=int, nargs='*', metavar='N',
+                        help="mide barh_chart con N barras (por defecto 10 50 100 200 400)")
+    args = parser.parse_args(argv)
+
+    if args.barras is not None:
+        sizes = args.barras or (10, 50, 100, 200, 400)
+        _print_bar_count(bar_count_benchmark(sizes, args.repeticiones, args.formato), args.repeticiones)
+        return 0
+
+    results = benchmark(args.repeticiones, args.formato)
+
+    print(f"\n⏱️ CPU del servidor por gráfico (mediana de {args.repeticiones} renders):\n")
+    print(f"   {'Gráfico':<22}{'Backend':<12}{'CPU (ms)':>10}{'Enviado (KB)':>15}")
+    for row in results:
+        print(f"   {row['chart']:<22}{row['backend']:<12}{row['cpu_ms']:>10.1f}{row['bytes'] / 1024:>15.1f}")
+
+    print("\n" + "=" * 70)
+    for backend in BACKENDS:
+        rows = [row for row in results if row['backend'] == backend]
+        total = sum(row['cpu_ms'] for row in rows)
+        print(f"   {backend:<12} {total:>8.1f} ms de CPU para los {len(rows)} gráficos")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Caché de gráficos ya renderizados.
+
+Las páginas separan el dibujo de cada gráfico en una función que recibe los
+datos y devuelve la figura de matplotlib, y lo muestran con show_chart(). La
+imagen resultante (PNG o SVG según CHART_FORMAT) se guarda con una clave que
+combina la función de dibujo y la huella de sus argumentos; en los reruns que no
+cambian los datos (un clic en la barra lateral, cambiar de página y volver) se
+envían los bytes guardados sin ejecutar matplotlib.
+
+La caché es del proceso, compartida entre sesiones, y descarta los gráficos
+usados hace más tiempo al superar CHART_CACHE_MAX_ENTRIES o CHART_CACHE_MAX_MB.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from src.database.conexion import get_setting
+from src.utils.figures import close_figure
+from src.utils.fingerprint import data_fingerprint, function_id
+
+CHART_FORMATS = ("png", "svg")
+
+# Mismos parámetros que usa st.pyplot, para que la imagen no cambie
+SAVEFIG_KWARGS = {"bbox_inches": "tight", "dpi": 200}
+
+_charts = OrderedDict()
+_charts_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def chart_format():
+    """Formato de imagen de los gráficos según CHART_FORMAT: "png" (por defecto) o "svg"."""
+    fmt = str(get_setting("CHART_FORMAT", "png")).lower()
+    return fmt if fmt in CHART_FORMATS else "png"
+
+
+def _limits():
+    max_entries = int(get_setting("CHART_CACHE_MAX_ENTRIES", 256))
+    max_bytes = int(float(get_setting("CHART_CACHE_MAX_MB", 64)) * 1024 * 1024)
+    return max_entries, max_bytes
+
+
+def _store(key, image):
+    max_entries, max_bytes = _limits()
+    with _charts_lock:
+        if key in _charts:
+            return
+        _charts[key] = image
+        _stats["bytes"] += len(image)
+        while _charts and (len(_charts) > max_entries or _stats["bytes"] > max_bytes):
+            _, evicted = _charts.popitem(last=False)
+            _stats["bytes"] -= len(evicted)
+            _stats["evictions"] += 1
+
+
+def _lookup(key):
+    with _charts_lock:
+        image = _charts.get(key)
+        if image is None:
+            _stats["misses"] += 1
+            return None
+        _charts.move_to_end(key)
+        _stats["hits"] += 1
+        return image
+
+
+def figure_to_bytes(fig, fmt="png"):
+    """Serializa `fig` en `fmt` y cierra la figura."""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, **SAVEFIG_KWARGS)
+    finally:
+        close_figure(fig)
+    return buffer.getvalue()
+
+
+def render_chart(draw, *args, **kwargs):
+    """
+    Devuelve (bytes, formato) del gráfico que dibuja `draw(*args, **kwargs)`.
+    `draw` solo se ejecuta si el mismo gráfico no está ya en la caché.
+    """
+    fmt = chart_format()
+    key = (function_id(draw), data_fingerprint(args, kwargs), fmt)
+    image = _lookup(key)
+    if image is None:
+        image = figure_to_bytes(draw(*args, **kwargs), fmt)
+        _store(key, image)
+    return image, fmt
+
+
+def show_chart(draw, *args, **kwargs):
+    """Muestra en la página el gráfico de `draw(*args, **kwargs)`, desde la caché si es posible."""
+    image, fmt = render_chart(draw, *args, **kwargs)
+    if fmt == "svg":
+        image = image.decode('utf-8')
+    st.image(image, width='stretch')
+
+
+def get_chart_cache_stats():
+    """Aciertos, fallos, descartes, gráficos guardados y bytes ocupados por la caché."""
+    with _charts_lock:
+        return dict(_stats, entries=len(_charts))
@@ -0,0 +1,66 @@
+"""
+Gráficos compartidos por los dashboards.
+
+Las páginas llaman a estas funciones con los DataFrame ya agregados y el
+backend configurado en CHART_BACKEND decide cómo se dibujan:
+
+- "matplotlib" (por defecto): figura renderizada en el servidor y enviada como
+  imagen a través de la caché de gráficos (chart_cache).
+- "altair": especificación Vega-Lite que el navegador renderiza; el servidor
+  solo serializa los datos agregados.
+
+Ambos backends exponen las mismas funciones con los mismos argumentos
+(charts_matplotlib y charts_altair).
+"""
+import streamlit as st
+
+from src.database.conexion import get_setting
+from src.utils import charts_altair, charts_matplotlib
+from src.utils.chart_cache import show_chart
+
+BACKENDS = {
+    "matplotlib": charts_matplotlib,
+    "altair": charts_altair,
+}
+
+
+def chart_backend():
+    """Nombre del backend de gráficos según CHART_BACKEND ("matplotlib" si no es válido)."""
+    backend = str(get_setting("CHART_BACKEND", "matplotlib")).lower()
+    return backend if backend in BACKENDS else "matplotlib"
+
+
+def _show(name, *args, **kwargs):
+    backend = chart_backend()
+    draw = getattr(BACKENDS[backend], name)
+    if backend == "altair":
+        st.altair_chart(draw(*args, **kwargs), width='stretch')
+    else:
+        show_chart(draw, *args, **kwargs)
+
+
+def bar_chart(df, category, value, title, xlabel, ylabel, figsize=(10, 6), text_size="normal"):
+    """Barras verticales de `value` por `category`, en el orden de `df`."""
+    _show("bar_chart", df, category, value, title, xlabel, ylabel, figsize=figsize, text_size=text_size)
+
+
+def barh_chart(df, category, value, title, xlabel, ylabel=None, width=12, row_height=0.3):
+    """Barras horizontales de `value` por `category`; el alto crece con el número de filas."""
+    _show("barh_chart", df, category, value, title, xlabel, ylabel, width=width, row_height=row_height)
+
+
+def grouped_bar_chart(df_pivot, title, xlabel, ylabel, legend_title, figsize=(14, 8),
+                      cmap_range=(0.3, 0.9), text_size="normal", legend_outside=True):
+    """Barras agrupadas de una tabla pivote: grupos por índice y una barra por columna."""
+    _show("grouped_bar_chart", df_pivot, title, xlabel, ylabel, legend_title, figsize=figsize,
+          cmap_range=cmap_range, text_size=text_size, legend_outside=legend_outside)
+
+
+def stacked_bar_chart(df_pivot, title, xlabel, ylabel, legend_title, figsize=(14, 8), text_size="large"):
+    """Barras apiladas de una tabla pivote: una barra por índice y un segmento por columna."""
+    _show("stacked_bar_chart", df_pivot, title, xlabel, ylabel, legend_title, figsize=figsize, text_size=text_size)
+
+
+def pie_chart(df, category, value, title, figsize=(8, 6), cmap_range=(0, 1), donut=False):
+    """Torta o dona de `value` por `category`."""
+    _show("pie_chart", df, category, value, title, figsize=figsize, cmap_range=cmap_range, donut=donut)
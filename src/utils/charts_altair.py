@@ -0,0 +1,139 @@
+"""
+Gráficos de los dashboards con Altair (especificación Vega-Lite renderizada en el navegador).
+
+Mismas funciones y argumentos que charts_matplotlib; en lugar de una figura
+devuelven un alt.Chart. El servidor solo serializa la especificación con los
+datos agregados, sin rasterizar nada.
+"""
+import altair as alt
+import pandas as pd
+
+# Píxeles de alto por pulgada de las figuras de matplotlib, para conservar proporciones
+PIXELS_PER_INCH = 50
+
+
+def _height(figsize):
+    return int(figsize[1] * PIXELS_PER_INCH)
+
+
+def _colors(cmap_range):
+    """Escala viridis limitada al mismo tramo que usa matplotlib."""
+    return alt.Scale(scheme=alt.SchemeParams(name='viridis', extent=list(cmap_range)))
+
+
+def _long_format(df_pivot):
+    """Pasa una tabla pivote a formato largo (categoría, serie, cantidad)."""
+    category = df_pivot.index.name or 'categoria'
+    series = df_pivot.columns.name or 'serie'
+    data = df_pivot.reset_index().melt(id_vars=category, var_name=series, value_name='cantidad')
+    return data, category, series
+
+
+def bar_chart(df, category, value, title, xlabel, ylabel, figsize=(10, 6), text_size="normal"):
+    """Barras verticales, una por fila de `df`, con el valor encima de cada barra."""
+    order = list(df[category])
+    base = alt.Chart(df[[category, value]]).encode(
+        x=alt.X(field=category, type='nominal', sort=order, title=xlabel, axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y(field=value, type='quantitative', title=ylabel),
+    )
+    bars = base.mark_bar(stroke='black', strokeWidth=1).encode(
+        color=alt.Color(field=category, type='nominal', sort=order, legend=None, scale=_colors((0.3, 0.9))),
+        tooltip=[alt.Tooltip(field=category, type='nominal'), alt.Tooltip(field=value, type='quantitative', format=',d')],
+    )
+    labels = base.mark_text(dy=-6, fontWeight='bold').encode(text=alt.Text(field=value, type='quantitative', format=',d'))
+    return (bars + labels).properties(title=title, height=_height(figsize))
+
+
+def barh_chart(df, category, value, title, xlabel, ylabel=None, width=12, row_height=0.3):
+    """Barras horizontales en el orden de `df`, con el valor a la derecha de cada barra."""
+    # matplotlib dibuja la primera fila abajo; Vega-Lite la dibujaría arriba
+    order = list(df[category])[::-1]
+    base = alt.Chart(df[[category, value]]).encode(
+        y=alt.Y(field=category, type='nominal', sort=order, title=ylabel),
+        x=alt.X(field=value, type='quantitative', title=xlabel),
+    )
+    bars = base.mark_bar(stroke='black', strokeWidth=1).encode(
+        color=alt.Color(field=category, type='nominal', sort=order, legend=None, scale=_colors((0.3, 0.9))),
+        tooltip=[alt.Tooltip(field=category, type='nominal'), alt.Tooltip(field=value, type='quantitative', format=',d')],
+    )
+    labels = base.mark_text(align='left', dx=4).encode(text=alt.Text(field=value, type='quantitative', format=',d'))
+    height = _height((width, max(6, len(df) * row_height)))
+    return (bars + labels).properties(title=title, height=height)
+
+
+def grouped_bar_chart(df_pivot, title, xlabel, ylabel, legend_title, figsize=(14, 8),
+                      cmap_range=(0.3, 0.9), text_size="normal", legend_outside=True):
+    """
+    Barras agrupadas: un grupo por fila de `df_pivot` (índice) y una barra por
+    columna (serie), con el valor encima de cada barra.
+    """
+    data, category, series = _long_format(df_pivot)
+    order = list(df_pivot.index)
+    base = alt.Chart(data).encode(
+        x=alt.X(field=category, type='nominal', sort=order, title=xlabel, axis=alt.Axis(labelAngle=-45)),
+        xOffset=alt.XOffset(field=series, type='nominal', sort=list(df_pivot.columns)),
+        y=alt.Y(field='cantidad', type='quantitative', title=ylabel),
+    )
+    bars = base.mark_bar(stroke='black', strokeWidth=0.5).encode(
+        color=alt.Color(field=series, type='nominal', sort=list(df_pivot.columns), title=legend_title,
+                        scale=_colors(cmap_range)),
+        tooltip=[alt.Tooltip(field=category, type='nominal'), alt.Tooltip(field=series, type='nominal'),
+                 alt.Tooltip(field='cantidad', type='quantitative', format=',d')],
+    )
+    labels = base.transform_filter(alt.datum.cantidad > 0).mark_text(dy=-6, fontSize=9, fontWeight='bold').encode(
+        text=alt.Text(field='cantidad', type='quantitative', format=',d'),
+    )
+    return (bars + labels).properties(title=title, height=_height(figsize))
+
+
+def stacked_bar_chart(df_pivot, title, xlabel, ylabel, legend_title, figsize=(14, 8), text_size="large"):
+    """Barras apiladas: una barra por fila de `df_pivot` y un segmento por columna."""
+    data, category, series = _long_format(df_pivot)
+    order = list(df_pivot.index)
+    series_order = {name: i for i, name in enumerate(df_pivot.columns)}
+    data['orden'] = data[series].map(series_order)
+    base = alt.Chart(data).transform_stack(
+        stack='cantidad', as_=['inicio', 'fin'], groupby=[category], sort=[alt.SortField('orden')],
+    ).transform_calculate(
+        centro='(datum.inicio + datum.fin) / 2',
+    ).encode(
+        x=alt.X(field=category, type='nominal', sort=order, title=xlabel, axis=alt.Axis(labelAngle=-45)),
+    )
+    bars = base.mark_bar(stroke='black', strokeWidth=0.5, size=40).encode(
+        y=alt.Y(field='inicio', type='quantitative', title=ylabel),
+        y2=alt.Y2(field='fin'),
+        color=alt.Color(field=series, type='nominal', sort=list(df_pivot.columns), title=legend_title,
+                        scale=_colors((0.3, 0.9))),
+        tooltip=[alt.Tooltip(field=category, type='nominal'), alt.Tooltip(field=series, type='nominal'),
+                 alt.Tooltip(field='cantidad', type='quantitative', format=',d')],
+    )
+    labels = base.transform_filter(alt.datum.cantidad > 0).mark_text(color='white', fontWeight='bold').encode(
+        y=alt.Y(field='centro', type='quantitative'),
+        text=alt.Text(field='cantidad', type='quantitative', format=',d'),
+    )
+    return (bars + labels).properties(title=title, height=_height(figsize))
+
+
+def pie_chart(df, category, value, title, figsize=(8, 6), cmap_range=(0, 1), donut=False):
+    """Torta (o dona con donut=True) con el porcentaje de cada categoría."""
+    order = list(df[category])
+    data = df[[category, value]].copy()
+    data['orden'] = range(len(data))
+    total = float(pd.to_numeric(data[value]).sum()) or 1.0
+    data['porcentaje'] = pd.to_numeric(data[value]) / total
+    radius = _height(figsize) // 2 - 20
+
+    base = alt.Chart(data).encode(
+        theta=alt.Theta(field=value, type='quantitative', stack=True),
+        order=alt.Order(field='orden', type='quantitative'),
+    )
+    arcs = base.mark_arc(outerRadius=radius, innerRadius=int(radius * 0.6) if donut else 0,
+                         stroke='white').encode(
+        color=alt.Color(field=category, type='nominal', sort=order, title=None, scale=_colors(cmap_range)),
+        tooltip=[alt.Tooltip(field=category, type='nominal'), alt.Tooltip(field=value, type='quantitative', format=',d'),
+                 alt.Tooltip(field='porcentaje', type='quantitative', format='.1%')],
+    )
+    labels = base.mark_text(radius=int(radius * 0.8), color='white', fontWeight='bold').encode(
+        text=alt.Text(field='porcentaje', type='quantitative', format='.1%'),
+    )
+    return (arcs + labels).properties(title=title, height=_height(figsize))
@@ -0,0 +1,176 @@
+"""
+Gráficos de los dashboards con matplotlib (renderizados en el servidor).
+
+Cada función recibe los datos ya agregados y devuelve la figura; charts.py la
+muestra a través de la caché de gráficos, que la serializa y la cierra.
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.patches import Circle
+
+from src.utils.figures import new_figure
+
+# Tamaños de letra de ejes y título
+TEXT_SIZES = {
+    "normal": {"label": 12, "title": 14, "ticks": None},
+    "large": {"label": 13, "title": 16, "ticks": 11},
+}
+
+
+def _colors(n, cmap_range):
+    return plt.cm.viridis(np.linspace(cmap_range[0], cmap_range[1], n))
+
+
+def value_labels(values):
+    """Etiquetas con separador de miles para `values`; vacías para los valores nulos o cero."""
+    values = np.nan_to_num(np.asarray(values, dtype=float))
+    return [f'{int(value):,}' if value > 0 else '' for value in values]
+
+
+def label_bars(ax, bars, label_type='edge', padding=3, **text_kwargs):
+    """
+    Escribe el valor de cada barra de `bars` (resultado de ax.bar/ax.barh) con una
+    sola llamada a ax.bar_label, en lugar de un ax.annotate por barra.
+    label_type='center' las centra dentro de cada segmento (barras apiladas).
+    """
+    return ax.bar_label(bars, labels=value_labels(bars.datavalues), label_type=label_type,
+                        padding=padding if label_type == 'edge' else 0, **text_kwargs)
+
+
+def _set_labels(ax, title, xlabel, ylabel, text_size):
+    sizes = TEXT_SIZES[text_size]
+    ax.set_xlabel(xlabel, fontsize=sizes["label"], fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=sizes["label"], fontweight='bold')
+    ax.set_title(title, fontsize=sizes["title"], fontweight='bold', pad=20)
+
+
+def bar_chart(df, category, value, title, xlabel, ylabel, figsize=(10, 6), text_size="normal"):
+    """Barras verticales, una por fila de `df`, con el valor encima de cada barra."""
+    fig, ax = new_figure(figsize=figsize)
+    colors = _colors(len(df), (0.3, 0.9))
+    bars = ax.bar(df[category], df[value], color=colors, edgecolor='black', linewidth=1.2)
+    label_bars(ax, bars, fontsize=10 if text_size == "large" else 9, fontweight='bold')
+
+    _set_labels(ax, title, xlabel, ylabel, text_size)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+    max_val = df[value].max() if not df.empty else 1
+    ax.set_ylim(0, float(max_val) * 1.2)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    fig.tight_layout()
+    return fig
+
+
+def barh_chart(df, category, value, title, xlabel, ylabel=None, width=12, row_height=0.3):
+    """Barras horizontales en el orden de `df`, con el valor a la derecha de cada barra."""
+    fig, ax = new_figure(figsize=(width, max(6, len(df) * row_height)))
+    y_pos = np.arange(len(df))
+    colors = _colors(len(df), (0.3, 0.9))
+    bars = ax.barh(y_pos, df[value], color=colors, edgecolor='black', linewidth=1.2)
+
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(df[category])
+    ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    ax.set_title(title)
+
+    label_bars(ax, bars, fontsize=9)
+
+    # Espacio a la derecha para las etiquetas de valor
+    ax.set_xlim(0, float(df[value].max()) * 1.15)
+    ax.grid(axis='x', linestyle='--', alpha=0.6)
+    fig.tight_layout()
+    return fig
+
+
+def grouped_bar_chart(df_pivot, title, xlabel, ylabel, legend_title, figsize=(14, 8),
+                      cmap_range=(0.3, 0.9), text_size="normal", legend_outside=True):
+    """
+    Barras agrupadas: un grupo por fila de `df_pivot` (índice) y una barra por
+    columna (serie), con el valor encima de cada barra.
+    """
+    fig, ax = new_figure(figsize=figsize)
+    categories = df_pivot.index
+    series = df_pivot.columns
+    x = np.arange(len(categories))  # Posiciones de los grupos de barras
+    width = 0.8 / len(series)  # Ancho de cada barra
+    colors = _colors(len(series), cmap_range)
+
+    for i, name in enumerate(series):
+        offset = width * (i - (len(series) - 1) / 2)
+        bars = ax.bar(x + offset, df_pivot[name], width, label=name, color=colors[i], edgecolor='black', linewidth=1)
+        label_bars(ax, bars, fontsize=9 if text_size == "large" else 8, fontweight='bold')
+
+    _set_labels(ax, title, xlabel, ylabel, text_size)
+    ax.set_xticks(x)
+    ax.set_xticklabels(categories, rotation=45, ha='right', fontsize=TEXT_SIZES[text_size]["ticks"])
+    if legend_outside:
+        ax.legend(title=legend_title, bbox_to_anchor=(1.05, 1), loc='upper left')
+    else:
+        ax.legend(title=legend_title, fontsize=10)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    max_val = df_pivot.sum(axis=1).max() if not df_pivot.empty else 1
+    ax.set_ylim(0, float(max_val) * 1.2)
+    fig.tight_layout()
+    return fig
+
+
+def stacked_bar_chart(df_pivot, title, xlabel, ylabel, legend_title, figsize=(14, 8), text_size="large"):
+    """Barras apiladas: una barra por fila de `df_pivot` y un segmento por columna."""
+    fig, ax = new_figure(figsize=figsize)
+    categories = df_pivot.index
+    series = df_pivot.columns
+    x = np.arange(len(categories))
+    colors = _colors(len(series), (0.3, 0.9))
+    bottom = np.zeros(len(categories))
+
+    for i, name in enumerate(series):
+        values = df_pivot[name]
+        bars = ax.bar(x, values, 0.7, label=name, color=colors[i], bottom=bottom, edgecolor='black', linewidth=0.5)
+        # Etiquetas en el centro de cada segmento
+        label_bars(ax, bars, label_type='center', fontsize=9, color='white', fontweight='bold')
+        bottom += values.values
+
+    _set_labels(ax, title, xlabel, ylabel, text_size)
+    ax.set_xticks(x)
+    ax.set_xticklabels(categories, rotation=45, ha='right', fontsize=TEXT_SIZES[text_size]["ticks"])
+    ax.legend(title=legend_title, bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    max_val = df_pivot.sum(axis=1).max() if not df_pivot.empty else 1
+    ax.set_ylim(0, float(max_val) * 1.2)
+    fig.tight_layout()
+    return fig
+
+
+def pie_chart(df, category, value, title, figsize=(8, 6), cmap_range=(0, 1), donut=False):
+    """Torta (o dona con donut=True) con el porcentaje de cada categoría."""
+    fig, ax = new_figure(figsize=figsize)
+    colors = _colors(len(df), cmap_range)
+
+    if donut:
+        wedges, texts, autotexts = ax.pie(df[value], labels=df[category], autopct='%1.1f%%', startangle=90,
+                                          colors=colors, pctdistance=0.85,
+                                          wedgeprops=dict(width=0.4, edgecolor='w'))
+        plt.setp(autotexts, size=10, weight="bold", color="white")
+        ax.set_title(title, pad=20)
+        # Círculo central para hacer la dona
+        ax.add_artist(Circle((0, 0), 0.60, fc='white'))
+    else:
+        explode = [0.05 if i == 0 else 0 for i in range(len(df))]
+        wedges, texts, autotexts = ax.pie(
+            df[value],
+            labels=df[category],
+            autopct='%1.1f%%',
+            colors=colors,
+            startangle=90,
+            explode=explode,
+            textprops={'fontsize': 9, 'fontweight': 'bold'},
+            shadow=True
+        )
+        for autotext in autotexts:
+            autotext.set_color('white')
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+
+    ax.axis('equal')  # Asegura que el gráfico sea un círculo
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,73 @@
+"""
+Ciclo de vida de las figuras de matplotlib de los dashboards.
+
+Las figuras se crean con la API orientada a objetos (matplotlib.figure.Figure),
+sin pasar por el registro global de pyplot, así que no se acumulan entre reruns
+ni sesiones aunque una página olvide cerrarlas. close_figure() libera sus
+artistas en cuanto la imagen se ha serializado.
+
+get_figure_stats() informa de las figuras vivas y de la memoria aproximada que
+ocupan; si las vivas superan FIGURE_LEAK_WARNING se registra un aviso.
+"""
+import threading
+import weakref
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from src.config.logger_config import get_logger
+from src.database.conexion import get_setting
+
+logger = get_logger(__name__)
+
+_live = weakref.WeakSet()
+_lock = threading.Lock()
+_counters = {"created": 0, "closed": 0}
+
+
+def _figure_bytes(fig):
+    """Memoria aproximada del lienzo RGBA de `fig` al DPI con que se renderiza."""
+    width, height = fig.get_size_inches()
+    return int(width * height * fig.dpi * fig.dpi * 4)
+
+
+def new_figure(figsize=None, nrows=1, ncols=1, **subplot_kwargs):
+    """
+    Crea una figura fuera de pyplot y devuelve (fig, ax) como plt.subplots().
+    La figura debe cerrarse con close_figure() cuando ya no se necesite.
+    """
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots(nrows, ncols, **subplot_kwargs)
+    with _lock:
+        _live.add(fig)
+        _counters["created"] += 1
+        live = len(_live)
+    threshold = int(get_setting("FIGURE_LEAK_WARNING", 20))
+    if live > threshold:
+        logger.warning(f"{live} figuras de matplotlib abiertas (aviso a partir de {threshold})")
+    return fig, ax
+
+
+def close_figure(fig):
+    """Libera los artistas de `fig` y la quita del registro (también si la creó pyplot)."""
+    with _lock:
+        if fig in _live:
+            _live.discard(fig)
+            _counters["closed"] += 1
+    # Sin efecto para las figuras creadas con new_figure(), que pyplot no conoce
+    plt.close(fig)
+    fig.clear()
+
+
+def get_figure_stats():
+    """
+    Figuras creadas, cerradas y vivas, memoria aproximada de las vivas y figuras
+    que siguen abiertas en el registro global de pyplot.
+    """
+    with _lock:
+        live = list(_live)
+        stats = dict(_counters)
+    stats["live"] = len(live)
+    stats["bytes"] = sum(_figure_bytes(fig) for fig in live)
+    stats["pyplot_open"] = len(plt.get_fignums())
+    return stats
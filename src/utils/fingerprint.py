@@ -0,0 +1,54 @@
+"""
+Huellas estables de funciones y datos para construir claves de caché.
+"""
+import hashlib
+import inspect
+
+import numpy as np
+import pandas as pd
+
+
+def function_id(func):
+    """Identificador estable de `func`: archivo, nombre y huella de su código fuente."""
+    try:
+        source = inspect.getsource(func).encode('utf-8')
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    digest = hashlib.md5(source).hexdigest()[:12]
+    return f"{func.__code__.co_filename}:{func.__qualname__}:{digest}"
+
+
+def _update(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(dtype) for dtype in value.dtypes])).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr((value.name, str(value.dtype))).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}[{len(value)}]".encode('utf-8'))
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict[{len(value)}]".encode('utf-8'))
+        for key in sorted(value, key=repr):
+            _update(digest, key)
+            _update(digest, value[key])
+    else:
+        digest.update(repr(value).encode('utf-8'))
+    digest.update(b'|')
+
+
+def data_fingerprint(*values):
+    """
+    Huella del contenido de `values`. Los DataFrame y Series se resumen por
+    columnas, tipos, índice y valores, de modo que dos tablas iguales dan la
+    misma huella aunque sean objetos distintos.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _update(digest, value)
+    return digest.hexdigest()
@@ -0,0 +1,483 @@
+"""
+Páginas de dashboard construidas a partir de una especificación.
+
+Todas las páginas de pages/ comparten el mismo esqueleto: estilos, navegación,
+conexión, años disponibles, botones de año, métricas de la barra lateral, logo
+y enlaces de interés. Solo cambian la tabla, las dimensiones, la división por
+etapas y el tipo de gráfico, así que cada página es un diccionario PAGE y una
+llamada a render_page(PAGE).
+
+Claves de la especificación:
+
+- page_title, title: título de la pestaña del navegador y de la página.
+- population: población del menú si la sesión aún no tiene una (COMFENALCO_LABEL por defecto).
+- data: qué se consulta, ver load_sections():
+    - table, dimensions: tabla y columnas del desglose.
+    - measure, how: medida de aggregate() ("MATRICULADOS" y "sum" por defecto).
+    - exclude_values, order_by: como en aggregate().
+    - stages, sort_by_count: una sección por ETAPA, con load_stage_breakdown().
+    - totals: medidas de aggregate_total() para las métricas; por defecto, la del desglose.
+    - total_from_data: el total es la suma del desglose (tras excluir valores).
+    - previous_table: añade una sección con el último año de esa tabla, para comparar.
+- year_selector: "row" (botones sobre los gráficos, por defecto), "side" (columna a la
+  derecha) o None (siempre el último año).
+- sede_filter: True para elegir la sede nodal en la barra lateral.
+- metrics: plantillas de las métricas de la barra lateral; la i-ésima muestra el
+  i-ésimo total de cada sección.
+- header, empty_message: encabezado de cada sección y aviso cuando no tiene datos.
+- positive_only: descarta los grupos con cantidad 0 antes de dibujar.
+- chart: kind ("bar", "barh", "pie", "grouped" o "stacked"), title, xlabel, ylabel,
+  legend, subheader y options (argumentos adicionales de la función de charts.py).
+  "pie" admite top_n y other_label (los top_n grupos mayores y el resto, calculados por
+  el origen de datos con load_share()); "grouped" y "stacked" pivotan `index` x `columns`
+  (por defecto, la primera y la segunda dimensión).
+- table: kind "ranking" (labels, decimals, sort, subheader) o "pivot" (total_column,
+  total_row, transpose); position "after" (por defecto), "before" o "left"; con
+  lazy=True, o siempre en "pivot", la tabla va en un expansor diferido (label).
+
+Los textos admiten los campos {year}, {stage}, {sede} y {label} de cada sección.
+
+Las cargas pasan por fallback.load_or_stale(): si MySQL no responde, la página
+se dibuja con el último dato bueno guardado en disco y un aviso de datos en caché.
+"""
+import os
+import traceback
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from dashboard_config import COMFENALCO_LABEL, create_nav_buttons
+from src.database.conexion import get_engine
+from src.database.data_version import get_data_version
+from src.database.executor import prefetch, run_all
+from src.database.fallback import DatabaseUnavailable, begin_run, load_or_stale, stale_since
+from src.database.loaders import load_stage_breakdown
+from src.database.query_builder import EXCLUDED_VALUES, aggregate, aggregate_total, distinct_values
+from src.database.schema import has_table
+from src.utils.charts import bar_chart, barh_chart, grouped_bar_chart, pie_chart, stacked_bar_chart
+from src.utils.panels import detail_panel, lazy_tabs
+from src.utils.prerender import publish_view_options
+from src.utils.tables import pivot_table, ranking_table, style_table
+
+MAX_ENTRIES = 256
+
+LOGO_PATH = "assets/Logo_rionegro.png"
+
+PAGE_LINK_CSS = """
+<style>
+    /* Style for page links with flexible height and text wrapping */
+    a[data-testid="stPageLink"] {
+        border: 1px solid #ddd;
+        border-radius: 5px;
+        padding: 15px 10px;
+        text-align: center;
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: center;
+        text-decoration: none;
+        min-height: 5.5em;
+        line-height: 1.4;
+        word-wrap: break-word;
+        white-space: normal;
+        font-size: 0.85em;
+        overflow-wrap: break-word;
+        word-break: break-word;
+    }
+</style>
+"""
+
+INTEREST_LINKS = """
+- [Agencia pública de empleo – Comfenalco Antioquia](https://www.comfenalcoantioquia.com.co/personas/sedes/oficina-de-empleo-oriente)
+- [Agencia Pública de Empleo Municipio de Rionegro](https://www.comfenalcoantioquia.com.co/personas/servicios/agencia-de-empleo/ofertas)
+- [Agencia Pública de Empleo SENA](https://ape.sena.edu.co/Paginas/Inicio.aspx)
+"""
+
+
+# --- Carga de datos ---
+
+def _tables(data):
+    return tuple(name for name in (data["table"], data.get("previous_table")) if name)
+
+
+def _load_or_stale(tables, cached_func, *args):
+    """
+    cached_func(versión de `tables`, motor, *args) con el último dato bueno de
+    respaldo: si la base de datos no responde se devuelve el guardado en disco.
+    """
+    def load():
+        engine = get_engine()
+        version = get_data_version(engine, *tables)
+        return version, cached_func(version, engine, *args)
+    return load_or_stale((cached_func.__name__, repr(args)), load)
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, show_spinner=False)
+def _available_years(data_version, _engine, table_name):
+    if not has_table(_engine, table_name):
+        return []
+    return distinct_values(_engine, table_name, "FECHA", descending=True)
+
+
+def get_available_years(table_name):
+    """Años de `table_name` (columna FECHA), del más reciente al más antiguo."""
+    return _load_or_stale((table_name,), _available_years, table_name)
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, show_spinner=False)
+def _available_sedes(data_version, _engine, table_name, year):
+    if not has_table(_engine, table_name):
+        return []
+    return distinct_values(_engine, table_name, "SEDE_NODAL", filters={"FECHA": year})
+
+
+def get_available_sedes(table_name, year):
+    """Sedes nodales de `table_name` en `year`, en orden alfabético."""
+    return _load_or_stale((table_name,), _available_sedes, table_name, year)
+
+
+def _section(df, totals, year, label, stage=None, key=""):
+    return {"df": df, "totals": totals, "year": year, "label": label, "stage": stage, "key": key}
+
+
+def _load_single(engine, data, table_name, year, sede, key=""):
+    """Sección con el desglose de `table_name` en `year` (y `sede`) y sus totales."""
+    dimensions = list(data["dimensions"])
+    measure, how = data.get("measure", "MATRICULADOS"), data.get("how", "sum")
+    totals = data.get("totals") or ({"measure": measure, "how": how},)
+    if not has_table(engine, table_name):
+        return _section(pd.DataFrame(columns=dimensions + ["cantidad"]), [0] * len(totals), year, f"Año {year}", key=key)
+
+    filters = {"FECHA": year}
+    if sede is not None:
+        filters["SEDE_NODAL"] = sede
+    calls = [lambda: aggregate(engine, table_name, dimensions, measure=measure, how=how, filters=filters,
+                               exclude_values=data.get("exclude_values", EXCLUDED_VALUES),
+                               order_by=tuple(data.get("order_by", ())))]
+    if not data.get("total_from_data"):
+        calls += [
+            lambda total=total: aggregate_total(engine, table_name, measure=total.get("measure", measure),
+                                                how=total.get("how", how), filters=filters)
+            for total in totals
+        ]
+    # El desglose y los totales son independientes: se consultan a la vez
+    df, *values = run_all(*calls)
+    if data.get("total_from_data"):
+        # Total de los grupos válidos, para que cuadre con el gráfico
+        values = [int(df["cantidad"].sum())]
+    return _section(df, values, year, f"Año {year}", key=key)
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, show_spinner=False)
+def _load_sections(data_version, _engine, data, year, sede):
+    if "stages" in data:
+        # Una sola consulta trae el desglose y el total de todas las etapas
+        stages = load_stage_breakdown(_engine, data["table"], year, list(data["dimensions"]),
+                                      stages=tuple(data["stages"]),
+                                      exclude_values=data.get("exclude_values", EXCLUDED_VALUES),
+                                      sort_by_count=data.get("sort_by_count", False))
+        return [
+            _section(df, [total], year, f"Etapa {stage}", stage=stage, key=f"etapa{stage}")
+            for stage, (df, total, _) in stages.items()
+        ]
+
+    previous_table = data.get("previous_table")
+    if not previous_table:
+        return [_load_single(_engine, data, data["table"], year, sede)]
+
+    def load_previous():
+        previous_years = _available_years(get_data_version(_engine, previous_table), _engine, previous_table)
+        previous_year = int(previous_years[0]) if previous_years else year - 1
+        return _load_single(_engine, data, previous_table, previous_year, sede, key="anterior")
+
+    # El año seleccionado no depende del anterior: ambas cargas se hacen a la vez
+    return run_all(load_previous, lambda: _load_single(_engine, data, data["table"], year, sede, key="actual"))
+
+
+def load_sections(data, year, sede=None):
+    """
+    Secciones de la página para `year` (y `sede`) según la clave `data` de la
+    especificación: una por etapa, una por año comparado o una sola. Cada sección
+    es un diccionario con df (dimensiones + 'cantidad'), totals, year, label,
+    stage y key. Se guarda en caché hasta que cambie la versión de datos de sus tablas.
+    """
+    return _load_or_stale(_tables(data), _load_sections, data, year, sede)
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, show_spinner=False)
+def _share_groups(data_version, _engine, table_name, dimension, filters, exclude_values, top_n, other_label):
+    return aggregate(_engine, table_name, [dimension], filters=dict(filters), exclude_values=exclude_values,
+                     top_n=top_n, other_label=other_label)
+
+
+def load_share(data, section, sede, top_n, other_label="Otros"):
+    """
+    Los `top_n` grupos mayores de la primera dimensión de `section` y una fila
+    `other_label` con la suma del resto. Se piden al origen de datos con
+    aggregate(top_n=...), así que de MySQL salen como mucho top_n + 1 filas.
+    """
+    table_name = data["previous_table"] if section["key"] == "anterior" else data["table"]
+    filters = {"FECHA": section["year"]}
+    if section["stage"] is not None:
+        filters["ETAPA"] = int(section["stage"])
+    if sede is not None:
+        filters["SEDE_NODAL"] = sede
+    return _load_or_stale((table_name,), _share_groups, table_name, data["dimensions"][0],
+                          tuple(sorted(filters.items())), tuple(data.get("exclude_values", EXCLUDED_VALUES)),
+                          top_n, other_label)
+
+
+def prefetch_other_years(data, available_years, selected_year, sede=None):
+    """
+    Programa en segundo plano load_sections() para los demás años de
+    `available_years`, empezando por los vecinos de `selected_year`: el usuario
+    suele recorrer los botones de año en orden y el siguiente clic sale de la
+    caché. Todas las etapas de un año salen de la misma carga.
+    """
+    if get_script_run_ctx() is None or stale_since() is not None:
+        return  # Sin sesión (precalentamiento) ya se recorren todos los años; sin base de datos no hay qué adelantar
+    engine = get_engine()
+    version = get_data_version(engine, *_tables(data))
+    position = available_years.index(selected_year)
+    for offset, year in sorted((abs(i - position), year) for i, year in enumerate(available_years)):
+        if offset:
+            prefetch((str(engine.url), version, repr(data), year, sede), load_sections, data, year, sede)
+
+
+# --- Visualización ---
+
+def _set_year(year):
+    st.session_state.selected_year = year
+
+
+def _year_buttons(available_years, selected_year, layout):
+    """Un botón por año; el del año seleccionado resaltado."""
+    def button(year):
+        button_type = "primary" if year == selected_year else "secondary"
+        st.button(str(year), key=f"year_{year}", width='stretch', type=button_type, on_click=_set_year, args=(year,))
+
+    if layout == "side":
+        st.write("📅 **Seleccionar Año**")
+        for year in available_years:
+            button(year)
+        return
+
+    st.write("📅 **Seleccionar Año para Visualizar**")
+    for column, year in zip(st.columns(len(available_years)), available_years):
+        with column:
+            button(year)
+
+
+def _select_sede(table_name, year):
+    available_sedes = get_available_sedes(table_name, year)
+    publish_view_options(available_sedes=available_sedes)
+    if not available_sedes:
+        st.warning(f"⚠️ No se encontraron sedes para el año {year}.")
+        st.stop()
+
+    if 'selected_sede' not in st.session_state or st.session_state.selected_sede not in available_sedes:
+        st.session_state.selected_sede = available_sedes[0]
+    selected_sede = st.sidebar.selectbox("📍 Seleccionar Sede Nodal", available_sedes,
+                                         index=available_sedes.index(st.session_state.selected_sede),
+                                         key="sede_selector")
+    st.session_state.selected_sede = selected_sede
+    return selected_sede
+
+
+def _fields(section, sede):
+    return {"year": section["year"], "stage": section["stage"], "sede": sede, "label": section["label"]}
+
+
+def _render_metrics(spec, sections, sede):
+    st.sidebar.header("📈 Estadísticas Generales")
+    for section in sections:
+        for template, value in zip(spec["metrics"], section["totals"]):
+            st.sidebar.metric(template.format(**_fields(section, sede)), f"{int(value):,}")
+    st.sidebar.divider()
+    # Añadir el logo al final del sidebar
+    if os.path.exists(LOGO_PATH):
+        st.sidebar.image(LOGO_PATH)
+
+
+def _render_chart(chart, df, df_pivot, category, fields):
+    if chart.get("subheader"):
+        st.subheader(chart["subheader"])
+    kind = chart["kind"]
+    title = chart["title"].format(**fields)
+    options = chart.get("options", {})
+
+    if kind == "bar":
+        bar_chart(df, category, 'cantidad', title, chart["xlabel"], chart["ylabel"], **options)
+    elif kind == "barh":
+        barh_chart(df.sort_values('cantidad', ascending=True), category, 'cantidad', title,
+                   chart["xlabel"], chart.get("ylabel"), **options)
+    elif kind == "pie":
+        pie_chart(df, category, 'cantidad', title, **options)
+    elif kind == "grouped":
+        grouped_bar_chart(df_pivot, title, chart["xlabel"], chart["ylabel"], chart["legend"], **options)
+    elif kind == "stacked":
+        stacked_bar_chart(df_pivot, title, chart["xlabel"], chart["ylabel"], chart["legend"], **options)
+    else:
+        raise ValueError(f"Tipo de gráfico no soportado: {kind}")
+
+
+def _show_table(table, df, df_pivot, category, total):
+    if table["kind"] == "ranking":
+        decimals = table.get("decimals", 1)
+        df_display = ranking_table(df, category, 'cantidad', total, tuple(table["labels"]),
+                                   decimals=decimals, sort=table.get("sort", False))
+        st.dataframe(style_table(df_display, decimals), width='stretch', hide_index=True)
+    elif table["kind"] == "pivot":
+        data = df_pivot.T if table.get("transpose") else df_pivot
+        df_display = pivot_table(data, total_column=table.get("total_column"), total_row=table.get("total_row"))
+        st.dataframe(style_table(df_display), width='stretch')
+    else:
+        raise ValueError(f"Tipo de tabla no soportado: {table['kind']}")
+
+
+def _render_table(table, df, df_pivot, category, total, detail_key):
+    if table["kind"] == "pivot" or table.get("lazy"):
+        # Tabla detallada: solo se arma y se envía si el usuario la abre
+        detail = detail_panel(detail_key, label=table.get("label", "📋 Tabla Detallada"))
+        if detail:
+            with detail:
+                _show_table(table, df, df_pivot, category, total)
+        return
+    st.subheader(table.get("subheader", "📋 Resumen"))
+    _show_table(table, df, df_pivot, category, total)
+
+
+def _render_section(spec, section, sede, detail_key):
+    fields = _fields(section, sede)
+    st.header(spec["header"].format(**fields))
+
+    df = section["df"]
+    if spec.get("positive_only") and not df.empty:
+        df = df[pd.to_numeric(df['cantidad']) > 0]
+    if df.empty:
+        st.warning(spec.get("empty_message", "No hay datos para esta sección.").format(**fields))
+        return
+
+    dimensions = list(spec["data"]["dimensions"])
+    chart, table = spec["chart"], spec.get("table")
+    df_pivot = None
+    if chart["kind"] in ("grouped", "stacked"):
+        df_pivot = df.pivot(index=chart.get("index", dimensions[0]), columns=chart.get("columns", dimensions[-1]),
+                            values='cantidad').fillna(0)
+    position = table.get("position", "after") if table else None
+    args = (df, df_pivot, dimensions[0])
+    chart_args = args
+    if chart["kind"] == "pie" and chart.get("top_n"):
+        # La tabla lista todos los grupos; el gráfico solo los mayores y el resto
+        share = load_share(spec["data"], section, sede, chart["top_n"], chart.get("other_label", "Otros"))
+        chart_args = (share, df_pivot, dimensions[0])
+
+    if position == "left":
+        col_table, col_chart = st.columns([1, 2])
+        with col_table:
+            _render_table(table, *args, section["totals"][0], detail_key)
+        with col_chart:
+            _render_chart(chart, *chart_args, fields)
+        return
+
+    if position == "before":
+        _render_table(table, *args, section["totals"][0], detail_key)
+    _render_chart(chart, *chart_args, fields)
+    if position == "after":
+        _render_table(table, *args, section["totals"][0], detail_key)
+
+
+def _render_sections(spec, sections, sede):
+    if len(sections) == 1:
+        _render_section(spec, sections[0], sede, detail_key="detalle")
+        return
+
+    # Una pestaña por sección: solo se dibuja la que está abierta
+    tabs_key = "stage_tabs" if "stages" in spec["data"] else "year_tabs"
+    tabs = lazy_tabs([section["label"] for section in sections], key=tabs_key)
+    for tab, section in zip(tabs, sections):
+        if tab:
+            with tab:
+                _render_section(spec, section, sede, detail_key=f"detalle_{section['key']}")
+
+
+def _render_body(spec):
+    data = spec["data"]
+    table_name = data["table"]
+    year_selector = spec.get("year_selector", "row")
+
+    available_years = get_available_years(table_name)
+    publish_view_options(available_years=available_years if year_selector else [])
+    if not available_years:
+        st.warning(f"⚠️ No se encontraron datos en la tabla '{table_name}'.")
+        st.stop()
+
+    # Si el año guardado en la sesión no es válido para los datos de esta página,
+    # se reinicia al año más reciente disponible
+    if 'selected_year' not in st.session_state or st.session_state.selected_year not in available_years:
+        st.session_state.selected_year = available_years[0]
+    selected_year = st.session_state.selected_year if year_selector else available_years[0]
+
+    st.sidebar.info(f"**Población:** {st.session_state.population_filter}")
+    st.sidebar.info(f"**Año:** {selected_year}")
+    selected_sede = _select_sede(table_name, selected_year) if spec.get("sede_filter") else None
+    st.sidebar.divider()
+
+    sections = load_sections(data, selected_year, selected_sede)
+    if year_selector:
+        prefetch_other_years(data, available_years, selected_year, selected_sede)
+    _render_metrics(spec, sections, selected_sede)
+
+    if year_selector == "side":
+        # Gráfico y tabla a la izquierda, filtro de año a la derecha
+        col_main, col_years = st.columns([3, 1])
+        with col_main:
+            _render_sections(spec, sections, selected_sede)
+        with col_years:
+            _year_buttons(available_years, selected_year, year_selector)
+        return
+
+    if year_selector:
+        _year_buttons(available_years, selected_year, year_selector)
+    st.markdown('<hr class="compact">', unsafe_allow_html=True)
+    _render_sections(spec, sections, selected_sede)
+
+
+def add_interest_links():
+    st.markdown("---")
+    st.markdown("### 🔗 Oportunidades laborales")
+    st.markdown(INTEREST_LINKS)
+
+
+def render_page(spec):
+    """Dibuja la página de dashboard descrita por `spec` (ver el docstring del módulo)."""
+    st.set_page_config(layout="wide", page_title=spec["page_title"])
+    st.title(spec["title"])
+
+    if 'population_filter' not in st.session_state:
+        st.session_state.population_filter = spec.get("population", COMFENALCO_LABEL)
+    create_nav_buttons(st.session_state.population_filter)
+    st.markdown('<hr class="compact">', unsafe_allow_html=True)
+    st.markdown(PAGE_LINK_CSS, unsafe_allow_html=True)
+    banner = st.empty()
+
+    begin_run()
+    try:
+        _render_body(spec)
+    except DatabaseUnavailable as e:
+        st.error("❌ No se pudo conectar a la base de datos")
+        st.exception(e)
+        st.stop()
+    except Exception as e:
+        st.error("❌ Error al cargar los datos")
+        st.exception(e)
+        with st.expander("Ver detalles técnicos del error"):
+            st.code(traceback.format_exc())
+
+    saved_at = stale_since()
+    if saved_at is not None:
+        banner.warning(f"💾 Datos en caché del {saved_at:%Y-%m-%d %H:%M}: la base de datos no responde. "
+                       "La página se actualizará cuando vuelva la conexión.")
+
+    add_interest_links()
@@ -0,0 +1,36 @@
+"""
+Paneles de ejecución diferida para las páginas de dashboard.
+
+Las pestañas de etapa y las tablas detalladas se crean con on_change="rerun":
+Streamlit solo ejecuta el contenido del panel abierto y vuelve a ejecutar la
+página cuando el usuario cambia de pestaña o abre el expansor. Así la primera
+carga de una página dibuja solo la Etapa 1, sin la tabla detallada.
+
+Sin sesión de navegador (el precalentamiento de prerender.py) todos los paneles
+cuentan como abiertos, para que se llenen las cachés de todos ellos.
+"""
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+def _is_open(panel):
+    return bool(panel.open) or get_script_run_ctx() is None
+
+
+def lazy_tabs(labels, key):
+    """
+    Pestañas con ejecución diferida. Devuelve, por cada pestaña, su contenedor
+    si está abierta o None si no lo está (su contenido no debe ejecutarse).
+    """
+    tabs = st.tabs(labels, key=key, on_change="rerun")
+    return [tab if _is_open(tab) else None for tab in tabs]
+
+
+def lazy_expander(label, key, expanded=False):
+    """Expansor con ejecución diferida: el contenedor si está abierto o None si está cerrado."""
+    expander = st.expander(label, expanded=expanded, key=key, on_change="rerun")
+    return expander if _is_open(expander) else None
+
+
+def detail_panel(key, label="📋 Tabla Detallada"):
+    """Expansor cerrado por defecto para la tabla detallada de un gráfico."""
+    return lazy_expander(label, key=key)
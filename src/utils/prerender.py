@@ -0,0 +1,181 @@
+"""
+Precalentamiento de los dashboards.
+
+Al arrancar la aplicación un hilo en segundo plano recorre las páginas de
+dashboard_config.DASHBOARD_CATEGORIES y ejecuta cada una, sin sesión de
+navegador, para todos los años (y sedes nodales, en las páginas que las
+filtran). Así se llenan las cachés del proceso que comparten todas las
+sesiones: las consultas de st.cache_data, las instantáneas en memoria y los
+gráficos de la caché de gráficos con los dos paneles de etapa. El primer
+visitante tras un despliegue obtiene la misma latencia que el centésimo.
+
+El hilo vigila después la tabla data_version y repite el recorrido cuando una
+importación cambia los datos. Se desactiva con PRERENDER_ENABLED=0.
+"""
+import logging
+import os
+import runpy
+import threading
+import time
+
+import streamlit as st
+
+from src.config.logger_config import get_logger
+from src.database.conexion import get_engine, get_setting
+from src.database.data_version import get_data_versions
+
+logger = get_logger(__name__)
+
+PAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'pages'))
+
+THREAD_NAME = "prerender"
+
+# (clave de st.session_state que elige la vista, variable de la página con sus valores posibles)
+VIEW_KEYS = (
+    ("selected_year", "available_years"),
+    ("selected_sede", "available_sedes"),
+)
+
+_thread = None
+_thread_lock = threading.Lock()
+_published = threading.local()
+_status = {"runs": 0, "pages": 0, "views": 0, "seconds": 0.0, "finished_at": None, "running": False}
+
+
+class _PrerenderContextFilter(logging.Filter):
+    """Oculta el aviso de Streamlit por ejecutar páginas sin ScriptRunContext desde este hilo."""
+
+    def filter(self, record):
+        return threading.current_thread().name != THREAD_NAME
+
+
+def _enabled():
+    return str(get_setting("PRERENDER_ENABLED", "1")).lower() not in ("0", "false", "no")
+
+
+def dashboard_pages():
+    """Rutas absolutas de las páginas registradas en DASHBOARD_CATEGORIES, sin repetir."""
+    from dashboard_config import DASHBOARD_CATEGORIES
+
+    pages = []
+    for config in DASHBOARD_CATEGORIES.values():
+        for sub_pages in config.get("subcategories", {}).values():
+            for page_file, _, _ in sub_pages:
+                path = os.path.join(PAGES_DIR, page_file)
+                if path not in pages:
+                    pages.append(path)
+    return pages
+
+
+def publish_view_options(**options):
+    """
+    Registra los valores posibles de las vistas de la página en ejecución
+    (available_years, available_sedes...). Las páginas construidas con
+    page_renderer no los tienen como variables globales y los publican así;
+    fuera de _run_page() no hace nada.
+    """
+    published = getattr(_published, 'options', None)
+    if published is not None:
+        published.update(options)
+
+
+def _run_page(path, state):
+    """
+    Ejecuta la página con `state` como session_state y devuelve sus variables
+    globales (más las publicadas con publish_view_options) y los valores de
+    VIEW_KEYS que eligió. Sin ScriptRunContext, Streamlit no dibuja nada y usa
+    un session_state simulado que solo usa este hilo.
+    """
+    st.session_state.clear()
+    for key, value in state.items():
+        st.session_state[key] = value
+    _published.options = {}
+    try:
+        page_globals = runpy.run_path(path, run_name="__main__")
+    except BaseException as e:  # st.stop() y los errores de la página no detienen el recorrido
+        if isinstance(e, (KeyboardInterrupt, SystemExit)):
+            raise
+        logger.debug(f"Precalentamiento de {os.path.basename(path)} {state} interrumpido: {e!r}")
+        page_globals = {}
+    finally:
+        published, _published.options = _published.options, None
+    page_globals = dict(page_globals, **published)
+    selected = {key: st.session_state.get(key) for key, _ in VIEW_KEYS}
+    return page_globals, selected
+
+
+def _walk(path, state, keys, rendered=None):
+    """
+    Ejecuta la página para cada combinación de valores de `keys` y devuelve el
+    número de vistas ejecutadas. `rendered` es el resultado de _run_page() si la
+    vista de `state` ya se ejecutó.
+    """
+    views = 0
+    if rendered is None:
+        rendered = _run_page(path, state)
+        views += 1
+    if not keys:
+        return views
+
+    page_globals, selected = rendered
+    key, options_name = keys[0]
+    for option in page_globals.get(options_name) or []:
+        next_state = dict(state, **{key: option})
+        # La vista que la página eligió por defecto ya se ejecutó: solo se recorren sus siguientes niveles
+        views += _walk(path, next_state, keys[1:], rendered if option == selected[key] else None)
+    return views
+
+
+def prerender_all():
+    """Recorre todas las páginas y vistas; devuelve (páginas, vistas, segundos)."""
+    start = time.perf_counter()
+    pages = dashboard_pages()
+    views = 0
+    for path in pages:
+        views += _walk(path, {}, VIEW_KEYS)
+    st.session_state.clear()
+    return len(pages), views, time.perf_counter() - start
+
+
+def _prerender_loop():
+    last_versions = None
+    while True:
+        try:
+            versions = get_data_versions(get_engine())
+        except Exception as e:
+            # Base de datos caída: las páginas salen del último dato bueno; se reintenta en la siguiente vuelta
+            logger.warning(f"Precalentamiento en espera, no se pudo consultar la versión de datos: {e}")
+            versions = last_versions
+        if versions != last_versions:
+            _status["running"] = True
+            try:
+                pages, views, seconds = prerender_all()
+                _status.update(runs=_status["runs"] + 1, pages=pages, views=views,
+                               seconds=round(seconds, 2), finished_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+                logger.info(f"Precalentamiento: {views} vista(s) de {pages} página(s) en {seconds:.1f} s")
+            except Exception as e:
+                logger.error(f"Error en el precalentamiento de los dashboards: {e}")
+            finally:
+                _status["running"] = False
+            last_versions = versions
+        time.sleep(float(get_setting("DATA_VERSION_CHECK_SECONDS", 30)))
+
+
+def start_prerender():
+    """Arranca (una vez por proceso) el hilo de precalentamiento."""
+    global _thread
+    if _thread is not None or not _enabled():
+        return
+    with _thread_lock:
+        if _thread is not None:
+            return
+        logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+            _PrerenderContextFilter()
+        )
+        _thread = threading.Thread(target=_prerender_loop, name=THREAD_NAME, daemon=True)
+        _thread.start()
+
+
+def get_prerender_status():
+    """Número de recorridos, páginas y vistas del último, duración y si hay uno en curso."""
+    return dict(_status)
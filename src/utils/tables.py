@@ -0,0 +1,91 @@
+"""
+Tablas de resumen de los dashboards.
+
+Las páginas muestran dos tipos de tabla a partir de los datos ya agregados:
+
+- ranking_table(): posición (#), categoría, cantidad con separador de miles y
+  porcentaje del total.
+- pivot_table(): tabla pivote (por ejemplo, días x jornadas) con separador de
+  miles y, opcionalmente, una columna de total por fila y una fila de totales.
+
+Las funciones cacheadas con st.cache_data devuelven los valores numéricos ya
+redondeados (mitades hacia arriba, con np.floor(x + 0.5)), de modo que los
+reruns de la página reutilizan la tabla mientras el agregado no cambie.
+style_table() les da el formato de presentación con Styler.format(): separador
+de miles, porcentajes con sus decimales y celdas vacías para los nulos, sin
+convertir cada celda a texto en Python. Al seguir siendo números, las columnas
+se ordenan por valor en st.dataframe.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+MAX_ENTRIES = 256
+
+
+PERCENT_COLUMN = 'Porcentaje'
+
+
+def round_half_up(values, decimals=0):
+    """`values` redondeados a `decimals` decimales, con las mitades hacia arriba (2.5 -> 3)."""
+    scale = 10.0 ** decimals
+    return np.floor(np.asarray(values, dtype=float) * scale + 0.5) / scale
+
+
+def _counts(values):
+    """Enteros redondeados de `values`, con los nulos como pd.NA."""
+    return pd.array(round_half_up(values), dtype="Int64")
+
+
+def style_table(df, decimals=1):
+    """
+    Styler de `df` para st.dataframe: separador de miles en las cantidades,
+    `decimals` decimales y '%' en la columna 'Porcentaje' y nulos vacíos.
+    """
+    styler = df.style.format(thousands=",", precision=0, na_rep="")
+    if PERCENT_COLUMN in df.columns:
+        styler = styler.format(f"{{:.{decimals}f}}%", subset=[PERCENT_COLUMN], na_rep="")
+    return styler
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, show_spinner=False)
+def ranking_table(df, category, value, total, labels, decimals=1, sort=False):
+    """
+    Tabla '#', categoría, cantidad y 'Porcentaje' de `total` para cada fila de `df`,
+    con la cantidad redondeada a entero y el porcentaje a `decimals` decimales.
+
+    `labels` son los encabezados de la categoría y de la cantidad, por ejemplo
+    ('Sede Nodal', 'Matriculados'). Con sort=True las filas se ordenan de mayor
+    a menor cantidad; si no, se respeta el orden de `df`.
+    """
+    data = df.sort_values(value, ascending=False) if sort else df
+    values = pd.to_numeric(data[value]).to_numpy(dtype=float)
+    percentages = values / float(total) * 100 if total > 0 else np.zeros(len(values))
+    category_label, value_label = labels
+    return pd.DataFrame({
+        '#': np.arange(1, len(data) + 1),
+        category_label: data[category].to_numpy(),
+        value_label: _counts(values),
+        PERCENT_COLUMN: round_half_up(percentages, decimals),
+    })
+
+
+@st.cache_data(max_entries=MAX_ENTRIES, show_spinner=False)
+def pivot_table(df_pivot, total_column=None, total_row=None):
+    """
+    `df_pivot` con sus celdas redondeadas a entero y, si se indican,
+    una columna final `total_column` con la suma de cada fila y una fila final
+    `total_row` con la suma de cada columna.
+    """
+    values = df_pivot.to_numpy(dtype=float)
+    index, columns = list(df_pivot.index), list(df_pivot.columns)
+    if total_column:
+        values = np.column_stack([values, values.sum(axis=1)])
+        columns.append(total_column)
+    if total_row:
+        values = np.vstack([values, values.sum(axis=0)])
+        index.append(total_row)
+    table = pd.DataFrame({i: _counts(column) for i, column in enumerate(values.T)})
+    table.index = pd.Index(index, name=df_pivot.index.name)
+    table.columns = pd.Index(columns, name=df_pivot.columns.name)
+    return table
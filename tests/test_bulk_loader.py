@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.database import bulk_loader
+from src.database.models import Base
+
+RECORDS = [
+    {'FECHA': 2024, 'SEDE_NODAL': 'Norte', 'POBLACION': 'Urbana', 'NIVEL': 'A1',
+     'DIA': 'Lunes', 'JORNADA': 'Mañana', 'MATRICULADOS': 10, 'ETAPA': 1},
+    {'FECHA': 2024, 'SEDE_NODAL': 'Sur', 'POBLACION': 'Rural', 'NIVEL': 'A2',
+     'DIA': 'Martes', 'JORNADA': 'Tarde', 'MATRICULADOS': 5, 'ETAPA': 2},
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'obs.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def source_path(tmp_path):
+    source = tmp_path / 'estudiantes.csv'
+    source.write_text('FECHA\n2024\n')
+    return str(source)
+
+
+def _version(engine, table_name):
+    with engine.connect() as connection:
+        return connection.execute(
+            text("SELECT VERSION FROM data_version WHERE TABLA = :tabla"), {'tabla': table_name}
+        ).scalar()
+
+
+def test_replace_table_bumps_version_before_and_after_aggregates(engine, source_path):
+    bulk_loader.replace_table(engine, 'Estudiantes_2016_2019', RECORDS, source_path)
+    assert _version(engine, 'Estudiantes_2016_2019') == 2
+
+
+def test_version_changes_even_if_aggregates_fail(engine, source_path, monkeypatch):
+    def failing_refresh(engine, table_name):
+        raise RuntimeError("sin agregados")
+
+    monkeypatch.setattr(bulk_loader, 'refresh_aggregates', failing_refresh)
+    with pytest.raises(RuntimeError):
+        bulk_loader.replace_table(engine, 'Estudiantes_2016_2019', RECORDS, source_path)
+    assert _version(engine, 'Estudiantes_2016_2019') == 1
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM Estudiantes_2016_2019")).scalar() == 2
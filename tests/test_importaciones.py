@@ -0,0 +1,81 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data.imports import ejecutar_todas_las_importaciones as orq
+
+
+def _importador(tabla, depende_de=(), falla=False, llamadas=None):
+    def importar(engine):
+        if llamadas is not None:
+            llamadas.append(tabla)
+        if falla:
+            raise RuntimeError(f"CSV de {tabla} ilegible")
+        return {"table": tabla, "rows": 1, "rejected": 0, "load": {"rows_per_second": 1.0}}
+
+    return SimpleNamespace(TABLA=tabla, DEPENDE_DE=tuple(depende_de), importar=importar,
+                           ruta_archivo=f"{tabla}.csv", __name__=f"data.imports.insertar_{tabla.lower()}")
+
+
+@pytest.fixture
+def importadores(monkeypatch):
+    """Sustituye los importadores reales y la base de datos por los del test."""
+    registrados = {}
+    cambiados = set()
+    monkeypatch.setattr(orq, "descubrir_importadores", lambda: dict(registrados))
+    monkeypatch.setattr(orq, "get_engine", lambda: None)
+    monkeypatch.setattr(orq, "dispose_engine", lambda: None)
+    monkeypatch.setattr(orq, "reload_reason",
+                        lambda engine, tabla, ruta: "CSV modificado" if tabla in cambiados else None)
+
+    def registrar(*modulos, cambiadas=()):
+        registrados.update({modulo.TABLA: modulo for modulo in modulos})
+        cambiados.update(cambiadas)
+        return registrados
+
+    return registrar
+
+
+def _estados(resultados):
+    return {r["table"]: r["estado"] for r in resultados}
+
+
+def test_dependencias_circulares(importadores):
+    importadores(_importador("A", ["C"]), _importador("B", ["A"]), _importador("C", ["B"]), _importador("D"))
+    with pytest.raises(ValueError, match="A, B, C"):
+        orq.ejecutar_importaciones(forzar=True)
+
+
+def test_dependencias_se_cargan_antes(importadores):
+    llamadas = []
+    importadores(_importador("C", ["B"], llamadas=llamadas), _importador("B", ["A"], llamadas=llamadas),
+                 _importador("A", llamadas=llamadas))
+    resultados = orq.ejecutar_importaciones(forzar=True)
+    assert _estados(resultados) == {"A": "ok", "B": "ok", "C": "ok"}
+    assert llamadas == ["A", "B", "C"]
+
+
+def test_fallo_de_dependencia_omite_las_dependientes(importadores):
+    llamadas = []
+    importadores(_importador("A", falla=True, llamadas=llamadas), _importador("B", ["A"], llamadas=llamadas),
+                 _importador("C", ["B"], llamadas=llamadas), _importador("D", llamadas=llamadas))
+    resultados = {r["table"]: r for r in orq.ejecutar_importaciones(forzar=True)}
+    assert _estados(resultados.values()) == {"A": "error", "B": "omitida", "C": "omitida", "D": "ok"}
+    assert resultados["B"]["error"] == "falló A"
+    assert sorted(llamadas) == ["A", "D"]
+
+
+def test_recarga_en_cascada(importadores):
+    llamadas = []
+    registrados = importadores(_importador("A", llamadas=llamadas), _importador("B", ["A"], llamadas=llamadas),
+                               _importador("C", ["B"], llamadas=llamadas), _importador("D", llamadas=llamadas),
+                               cambiadas={"A"})
+    assert orq._motivos_de_recarga(registrados, None, forzar=False) == {
+        "A": "CSV modificado", "B": "depende de A", "C": "depende de B",
+    }
+    resultados = orq.ejecutar_importaciones()
+    assert _estados(resultados) == {"A": "ok", "B": "ok", "C": "ok", "D": "sin cambios"}
+    assert llamadas == ["A", "B", "C"]
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.tables import pivot_table, ranking_table, round_half_up, style_table
+
+
+def _rows(df, decimals=1):
+    return style_table(df, decimals).hide(axis='index').to_string(delimiter='|').splitlines()
+
+
+def test_round_half_up():
+    assert round_half_up([2.5, 3.5, -2.5, 1234567.4]).tolist() == [3, 4, -2, 1234567]
+    assert round_half_up([12.25, 0.05], decimals=1).tolist() == [12.3, 0.1]
+
+
+def test_ranking_table_formats_thousands_and_percent():
+    df = pd.DataFrame({'SEDE_NODAL': ['Norte', 'Sur', 'Centro'], 'cantidad': [1234567.4, 2.5, np.nan]})
+    table = ranking_table(df, 'SEDE_NODAL', 'cantidad', 2000000, ('Sede Nodal', 'Matriculados'))
+    assert _rows(table) == [
+        '#|Sede Nodal|Matriculados|Porcentaje',
+        '1|Norte|1,234,567|61.7%',
+        '2|Sur|3|0.0%',
+        '3|Centro||',
+    ]
+
+
+def test_pivot_table_totals_and_nan_is_empty():
+    df_pivot = pd.DataFrame({'Mañana': [1500.5, np.nan], 'Tarde': [2e6, 10]}, index=['Lunes', 'Martes'])
+    table = pivot_table(df_pivot, total_column='Total')
+    assert table['Total'].tolist()[0] == 2001501
+    assert _rows(table)[1:] == ['1,501|2,000,000|2,001,501', '|10|']